@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Dependencies of cached attributes. Cached attributes always depend on graph connectivity. Additional dependencies
+declared by `cache_depends` decorator:
+
+* 'atoms' - elements, charges, radicals, hybridizations and implicit hydrogens of atoms
+* 'bonds' - orders of bonds
+* 'stereo' - stereo marks
+* 'coordinates' - atoms coordinates
+
+Attributes without declaration depend on everything.
+"""
+from CachedMethods import cached_property
+from inspect import isfunction
+from typing import Dict, FrozenSet
+
+
+changes_kinds = frozenset(('atoms', 'bonds', 'stereo', 'coordinates'))
+dependencies = {}
+
+
+def cache_depends(*changes: str):
+    """
+    Declare kinds of data cached attribute depends on in addition to connectivity.
+    Should be applied over cached_property, cached_method or cached_args_method.
+    """
+    if not changes_kinds.issuperset(changes):
+        raise ValueError(f'invalid changes kinds. allowed: {", ".join(sorted(changes_kinds))}')
+
+    def decorator(attribute):
+        attribute.depends = frozenset(changes)
+        return attribute
+    return decorator
+
+
+def cache_dependencies(cls) -> Dict[str, FrozenSet[str]]:
+    """
+    Declared dependencies of cached attributes of class by names of attributes in instance `__dict__`
+    """
+    try:
+        return dependencies[cls]
+    except KeyError:
+        pass
+
+    depends = {}
+    for klass in reversed(cls.__mro__):
+        for attribute in vars(klass).values():
+            if isinstance(attribute, cached_property):
+                names = (attribute.name,)
+            elif isfunction(attribute):  # cached methods wrappers. overridden methods reset declarations
+                names = (f'__cached_method_{attribute.__name__}', f'__cached_args_method_{attribute.__name__}')
+            else:
+                continue
+            changes = getattr(attribute, 'depends', None)
+            for name in names:
+                if changes is None:
+                    depends.pop(name, None)
+                else:
+                    depends[name] = changes
+    dependencies[cls] = depends
+    return depends
+
+
+__all__ = ['cache_depends', 'cache_dependencies']
@@ -77,7 +77,7 @@ class Aromatize:
         for n in seen:
             sh[n] = 4
 
-        self.flush_cache()
+        self.flush_cache('atoms', 'bonds')
         return True
 
     def kekule(self) -> bool:
@@ -90,7 +90,7 @@ class Aromatize:
         kekule = next(self.__kekule_full(), None)
         if kekule:
             self._kekule_patch(kekule)
-            self.flush_cache()
+            self.flush_cache('atoms', 'bonds')
             return True
         return False
 
@@ -17,11 +17,16 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from importlib.util import find_spec
-from itertools import combinations
+from itertools import combinations, islice
+from json import dump, load
 from math import sqrt, pi, atan2, cos, sin
-from random import uniform
+from pathlib import Path
+from random import Random
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 if find_spec('numpy') and find_spec('numba'):  # try to load numba jit
     from numpy import array, zeros, uint16, zeros_like, empty
@@ -238,15 +243,123 @@ def rotate(xyz, atoms_count, shift_x, angle):
     return xy
 
 
+# rings systems skeletons canonical hash: list of skeletons and their normalized 2d coordinates
+layout_templates = {}
+builtin_templates = False  # regular polygons of rings and bundled fused rings systems added into library
+builtin_templates_file = Path(__file__).parent / 'layout_templates.json'  # common fused rings systems
+
+
+def rings_skeleton(bonds, system):
+    """
+    Rings system graph of carbon atoms and single bonds. Skeletons of systems with same topology are isomorphic.
+    None returned for systems with atoms having more than 4 bonds.
+    """
+    from ..containers.molecule import MoleculeContainer  # cyclic import
+
+    skeleton = MoleculeContainer()
+    for n in system:
+        skeleton.add_atom(6, n)
+    for n in system:
+        env = [m for m in bonds[n] if m in skeleton._atoms]
+        if len(env) > 4:
+            return
+        for m in env:
+            if m < n:
+                skeleton.add_bond(n, m, 1)
+    return skeleton
+
+
+def add_builtin_templates():
+    """
+    Add regular polygons of rings of 3-8 atoms and bundled fused rings systems into library on first call
+    """
+    global builtin_templates
+    if builtin_templates:
+        return
+    builtin_templates = True
+    for size in range(3, 9):
+        radius = .825 / 2 / sin(pi / size)
+        ring = {n: (radius * cos(2 * pi * n / size), radius * sin(2 * pi * n / size)) for n in range(1, size + 1)}
+        bonds = {n: {n % size + 1, (n - 2) % size + 1} for n in ring}
+        add_template(rings_skeleton(bonds, ring), ring)
+    Calculate2D.load_layout_templates(str(builtin_templates_file))
+
+
+def dump_templates() -> List[dict]:
+    """
+    JSON serializable templates library
+    """
+    add_builtin_templates()
+    return [{'bonds': [[n, m] for n, m, _ in skeleton.bonds()], 'xy': [[n, x, y] for n, (x, y) in xy.items()]}
+            for templates in layout_templates.values() for skeleton, xy in templates]
+
+
+def load_templates(data: List[dict]) -> int:
+    """
+    Add templates from JSON serializable data into library
+
+    :return: number of added templates
+    """
+    added = 0
+    for template in data:
+        xy = {n: (x, y) for n, x, y in template['xy']}
+        bonds = {n: set() for n in xy}
+        for n, m in template['bonds']:
+            bonds[n].add(m)
+            bonds[m].add(n)
+        skeleton = rings_skeleton(bonds, xy)
+        if skeleton is not None and add_template(skeleton, xy):
+            added += 1
+    return added
+
+
+def find_template(skeleton) -> Optional[Dict[int, Tuple[float, float]]]:
+    """
+    Coordinates of skeleton atoms from library template.
+    Symmetric skeletons have many mappings. The smallest one taken, thus result is independent from atoms and bonds
+    order of template, e.g. in loaded from JSON library.
+    """
+    add_builtin_templates()
+    for template, xy in layout_templates.get(skeleton.canonical_hash, ()):
+        mapping = min((sorted(x.items()) for x in template.get_mapping(skeleton, automorphism_filter=False)),
+                      default=None)
+        if mapping is not None:
+            mapping = dict(mapping)
+            return {mapping[n]: c for n, c in xy.items()}
+
+
+def add_template(skeleton, xy: Dict[int, Tuple[float, float]]) -> bool:
+    """
+    Add skeleton with coordinates into library. Coordinates centered and scaled to bonds length of clean2d.
+    Skeletons already in library skipped.
+    """
+    add_builtin_templates()
+    h = skeleton.canonical_hash
+    if any(True for t, _ in layout_templates.get(h, ()) for _ in t.get_mapping(skeleton)):
+        return False
+    length = [sqrt((xy[n][0] - xy[m][0]) ** 2 + (xy[n][1] - xy[m][1]) ** 2) for n, m, _ in skeleton.bonds()]
+    length = sum(length) / len(length)
+    if length < 1e-3:  # coordinates not set
+        return False
+    scale = .825 / length
+    cx = sum(x for x, _ in xy.values()) / len(xy)
+    cy = sum(y for _, y in xy.values()) / len(xy)
+    layout_templates.setdefault(h, []).append((skeleton, {n: ((x - cx) * scale, (y - cy) * scale)
+                                                          for n, (x, y) in xy.items()}))
+    return True
+
+
 class Calculate2D:
     __slots__ = ()
+    clean2d_seed: Optional[int] = 0  # seed of random initial coordinates. None for different layouts on each call
 
-    def __prepare(self, component):
+    def __prepare(self, component, random, templates):
         atoms = self._atoms
         bonds = self._bonds
 
         mapping = {}
         springs = []
+        seen = set()  # fast lookup of springs
         straights = []
         xyz_matrix = []
         springs_distances = []
@@ -255,11 +368,21 @@ class Calculate2D:
         # for cycles of 4 atoms
         ac = set(a for c in self.sssr if len(c) == 4 for a in c)
 
-        # create matrix of coordinates
+        # create matrix of coordinates. rings systems placed by templates
         cube = len(component)
+        seeds = {}
+        for xy in templates:
+            if not xy.keys().isdisjoint(component):
+                dx, dy = random.uniform(-cube, cube), random.uniform(-cube, cube)
+                for n, (x, y) in xy.items():
+                    seeds[n] = [x + dx, y + dy, 0.]
         for i, n in enumerate(component):
             mapping[n] = i
-            xyz_matrix.append([uniform(-cube, cube), uniform(-cube, cube), uniform(-cube, cube)])
+            if n in seeds:
+                xyz_matrix.append(seeds[n])
+            else:
+                xyz_matrix.append([random.uniform(-cube, cube), random.uniform(-cube, cube),
+                                   random.uniform(-cube, cube)])
 
         # create matrix of connecting, springs and springs distances
         for n, m_bond in sorted(bonds.items(), reverse=True, key=lambda x: len(x[1])):
@@ -284,8 +407,9 @@ class Calculate2D:
             i = mapping[n]
             for m, dist in m_bond.items():
                 j = mapping[m]
-                if (j, i) not in springs:
+                if (j, i) not in seen:
                     springs.append((i, j))
+                    seen.add((i, j))
                     springs_distances.append(1.32 if dist else .825)
 
         bonds_count = len(springs_distances)
@@ -301,8 +425,10 @@ class Calculate2D:
                     if self._is_angle(bond1, bond2):
                         mapping[-n] = end
                         dd[n][-n] = dd[-n][n] = False
-                        xyz_matrix.append([uniform(-cube, cube), uniform(-cube, cube), uniform(-cube, cube)])
+                        xyz_matrix.append([random.uniform(-cube, cube), random.uniform(-cube, cube),
+                                           random.uniform(-cube, cube)])
                         springs.append((mapping[n], end))
+                        seen.add((mapping[n], end))
                         springs_distances.append(.825)
                         end += 1
 
@@ -312,8 +438,9 @@ class Calculate2D:
                 for m1, m2 in combinations(m_bond, 2):
                     if m2 not in dd[m1]:
                         i, j = mapping[m1], mapping[m2]
-                        if (j, i) not in springs or (i, j) not in springs:
+                        if (j, i) not in seen or (i, j) not in seen:
                             springs.append((i, j))
+                            seen.add((i, j))
                             long1, long2 = m_bond[m1], m_bond[m2]
                             if m1 in ac and m2 in ac:
                                 springs_distances.append(1.17)
@@ -363,8 +490,21 @@ class Calculate2D:
         Frączek, T. (2016). Simulation-Based Algorithm for Two-Dimensional Chemical Structure Diagram Generation of
         Complex Molecules and Ligand–Protein Interactions. Journal of Chemical Information and Modeling, 56(12),
         2320–2335. doi:10.1021/acs.jcim.6b00391 (https://doi.org/10.1021/acs.jcim.6b00391)
+
+        Initial coordinates of rings systems taken from templates library. Library contains regular polygons,
+        bundled common fused rings systems and templates added by `add_layout_templates` or `load_layout_templates`.
+        Components consisting of single rings system with template not simulated. Other atoms placed randomly
+        with `clean2d_seed`, thus layouts are reproducible.
         """
         plane = self._plane
+        random = Random(self.clean2d_seed)
+        templates = []
+        for system in self.connected_rings:
+            skeleton = rings_skeleton(self._bonds, system)
+            if skeleton is not None:
+                xy = find_template(skeleton)
+                if xy is not None:
+                    templates.append(xy)
 
         shift_x = .0
         for component in self.connected_components:
@@ -376,13 +516,121 @@ class Calculate2D:
                 plane[component[1]] = (shift_x, .825)
                 shift_x += .825
             else:
-                xyz, springs, straights, springs_distances, atoms_count, bonds_count = self.__prepare(component)
-                xyz = steps(xyz, springs, straights, springs_distances)
+                xyz, springs, straights, springs_distances, atoms_count, bonds_count = \
+                    self.__prepare(component, random, templates)
+                if not any(len(xy) == len(component) and not xy.keys().isdisjoint(component) for xy in templates):
+                    xyz = steps(xyz, springs, straights, springs_distances)
                 xy, shift_x = self.__finish_xyz(xyz, springs, atoms_count, bonds_count, shift_x)
                 for i, n in enumerate(component):
                     plane[n] = tuple(xy[i])
         self.__dict__.pop('__cached_method__repr_svg_', None)
 
+    @staticmethod
+    def add_layout_templates(structures: Iterable['Calculate2D']) -> int:
+        """
+        Add rings systems with their 2d coordinates into templates library of `clean2d`.
+        Structures should have good depiction, e.g. from curated SDF or drawn by chemist.
+        Already known rings systems skipped.
+
+        :return: number of added templates
+        """
+        added = 0
+        for structure in structures:
+            plane = structure._plane
+            for system in structure.connected_rings:
+                skeleton = rings_skeleton(structure._bonds, system)
+                if skeleton is not None and add_template(skeleton, {n: plane[n] for n in system}):
+                    added += 1
+        return added
+
+    @staticmethod
+    def save_layout_templates(file):
+        """
+        Save templates library of `clean2d` into JSON file.
+
+        :param file: path string or text file object
+        """
+        data = dump_templates()
+        if isinstance(file, str):
+            with open(file, 'w') as f:
+                dump(data, f)
+        else:
+            dump(data, file)
+
+    @staticmethod
+    def load_layout_templates(file) -> int:
+        """
+        Load templates of `clean2d` from JSON file created by `save_layout_templates` into library.
+
+        :param file: path string or text file object
+        :return: number of added templates
+        """
+        if isinstance(file, str):
+            with open(file) as f:
+                data = load(f)
+        else:
+            data = load(file)
+        return load_templates(data)
+
+    @staticmethod
+    def clean2d_many(structures: Iterable['Calculate2D'], workers: int = 1,
+                     chunksize: int = 100) -> Iterator[Tuple['Calculate2D', float]]:
+        """
+        Calculate 2d layouts of stream of structures in place. Structures returned in order with layout time
+        in seconds for spotting of slow layouts.
+
+        JIT-compiled force field kernels are loaded once per process and reused for all structures.
+
+        :param structures: molecules or CGRs iterable. E.g. SMILESRead object.
+        :param workers: number of processes. Structures split into chunks which layouts calculated in parallel.
+            Only two chunks per worker are kept in memory.
+        :param chunksize: number of structures in chunk
+        """
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError('workers should be positive integer')
+        if not isinstance(chunksize, int) or chunksize < 1:
+            raise ValueError('chunksize should be positive integer')
+
+        if workers == 1:
+            for structure in structures:
+                start = perf_counter()
+                structure.clean2d()
+                yield structure, perf_counter() - start
+            return
+
+        def collect(chunk, future):
+            for structure, (plane, time) in zip(chunk, future.result()):
+                structure._plane.update(plane)
+                structure.__dict__.pop('__cached_method__repr_svg_', None)
+                yield structure, time
+
+        structures = iter(structures)
+        pending = deque()
+        templates = dump_templates()  # library of main process invisible in spawned workers
+        with ProcessPoolExecutor(workers) as executor:
+            # structures transferred to workers packed. cheaper than pickling
+            for chunk in iter(lambda: list(islice(structures, chunksize)), []):
+                pending.append((chunk, executor.submit(clean2d_chunk, [(type(x), x.pack()) for x in chunk],
+                                                       templates)))
+                if len(pending) >= workers * 2:
+                    yield from collect(*pending.popleft())
+            while pending:
+                yield from collect(*pending.popleft())
+
+
+def clean2d_chunk(structures, templates):
+    """
+    calculate layouts of packed structures in worker process with templates library of main process
+    """
+    load_templates(templates)
+    layouts = []
+    for cls, structure in structures:
+        structure = cls.unpack(structure)
+        start = perf_counter()
+        structure.clean2d()
+        layouts.append((structure._plane, perf_counter() - start))
+    return layouts
+
 
 class Calculate2DMolecule(Calculate2D):
     __slots__ = ()
@@ -428,13 +676,21 @@ else:  # disable clean2d support
         __slots__ = ()
 
         def clean2d(self):
-            raise NotImplemented('numpy required for clean2d')
+            raise NotImplementedError('numpy required for clean2d')
+
+        @staticmethod
+        def clean2d_many(*args, **kwargs):
+            raise NotImplementedError('numpy required for clean2d')
 
     class Calculate2DCGR:
         __slots__ = ()
 
         def clean2d(self):
-            raise NotImplemented('numpy required for clean2d')
+            raise NotImplementedError('numpy required for clean2d')
+
+        @staticmethod
+        def clean2d_many(*args, **kwargs):
+            raise NotImplementedError('numpy required for clean2d')
 
 
 __all__ = ['Calculate2DMolecule', 'Calculate2DCGR']
@@ -21,11 +21,13 @@ from collections import defaultdict
 from itertools import chain
 from typing import Tuple, Dict, Set, Any, Union
 from ..exceptions import ValenceError
+from ._cache import cache_depends
 
 
 class GraphComponents:
     __slots__ = ()
 
+    @cache_depends()
     @cached_property
     def connected_components(self) -> Tuple[Tuple[int, ...], ...]:
         """
@@ -60,6 +62,7 @@ class GraphComponents:
                 queue.append(i)
                 seen.add(i)
 
+    @cache_depends()
     @cached_property
     def skin_atoms(self) -> Tuple[int, ...]:
         """
@@ -67,6 +70,7 @@ class GraphComponents:
         """
         return tuple(self._skin_graph(self._bonds))
 
+    @cache_depends()
     @cached_property
     def skin_graph(self):
         """
@@ -89,6 +93,7 @@ class GraphComponents:
                 bonds[m].discard(n)
         return bonds
 
+    @cache_depends()
     @cached_property
     def connected_rings(self) -> Tuple[Tuple[int, ...], ...]:
         """
@@ -110,6 +115,7 @@ class GraphComponents:
                 out.append(tuple(r))
         return tuple(out)
 
+    @cache_depends()
     @cached_property
     def ring_atoms(self):
         """
@@ -121,6 +127,7 @@ class GraphComponents:
 class StructureComponents:
     __slots__ = ()
 
+    @cache_depends('bonds')
     @cached_property
     def aromatic_rings(self) -> Tuple[Tuple[int, ...], ...]:
         """
@@ -130,6 +137,7 @@ class StructureComponents:
         return tuple(ring for ring in self.sssr if bonds[ring[0]][ring[-1]].order == 4
                      and all(bonds[n][m].order == 4 for n, m in zip(ring, ring[1:])))
 
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def cumulenes(self) -> Tuple[Tuple[int, ...], ...]:
         """
@@ -137,6 +145,7 @@ class StructureComponents:
         """
         return self._cumulenes()
 
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def tetrahedrons(self) -> Tuple[int, ...]:
         """
@@ -17,10 +17,14 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
-from CachedMethods import cached_method
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
+from hashlib import blake2b
+from itertools import islice
 from math import atan2, sin, cos, hypot
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping, MutableMapping, Optional
 from uuid import uuid4
 from ..periodictable.cpk import cpk
 
@@ -38,16 +42,23 @@ def rotate_vector(x1, y1, x2, y2):
 class Depict:
     __slots__ = ()
 
-    def depict(self, *, embedding=False):
+    def depict(self, *, embedding=False, settings: Optional[Mapping] = None):
+        """
+        SVG of structure.
+
+        :param settings: depict settings created by `depict_settings`. By default settings set by last call of
+            `depict_settings` used. Settings are immutable, thus concurrent depictions with different settings
+            are safe.
+        """
         values = self._plane.values()
         min_x = min(x for x, _ in values)
         max_x = max(x for x, _ in values)
         min_y = min(y for _, y in values)
         max_y = max(y for _, y in values)
 
-        config = self._render_config
-        bonds = self._render_bonds()
-        atoms, masks = self._render_atoms()
+        config = Depict._render_config if settings is None else settings
+        bonds = self._render_bonds(config)
+        atoms, masks = self._render_atoms(config)
         if embedding:
             return atoms, bonds, masks, min_x, min_y, max_x, max_y
 
@@ -88,13 +99,14 @@ class Depict:
         svg.append('</svg>')
         return '\n'.join(svg)
 
-    @classmethod
-    def depict_settings(cls, *, carbon=False, bond_color='black', font=.25, mapping=True, mapping_color='#788CFF',
+    @staticmethod
+    def depict_settings(*, carbon=False, bond_color='black', font=.25, mapping=True, mapping_color='#788CFF',
                         bond_width=.03, query_color='#5D8AA8', atoms_colors=cpk, dashes=(.2, .1), aromatic_space=.08,
                         triple_space=.07, double_space=.04, broken_color='red', formed_color='green',
-                        cgr_aromatic_space=.14, aromatic_dashes=(.05, .05), atom_radius=-.2):
+                        cgr_aromatic_space=.14, aromatic_dashes=(.05, .05), atom_radius=-.2,
+                        set_default: bool = True) -> Mapping:
         """
-        Settings for depict of chemical structures
+        Settings for depict of chemical structures. Returned settings are immutable and can be passed to `depict`.
 
         carbon: bool: if True depict atom C
         bond_color: str: color of bonds
@@ -114,9 +126,11 @@ class Depict:
         aromatic_dashes: tuple: for aromatic bonds two values: one is long of visible line, other is
                                                                long of invisible line
         atom_radius: float: radius of atoms spheres in depict3d. if negative is multiplier to covalent radii
-        """
+        set_default: bool: use settings for depict calls without settings. Depictions in progress not affected
 
-        config = cls._render_config
+        Default settings stored in `Depict._render_config` are read-only, thus should be changed only by this method.
+        """
+        config = {}
         config['font'] = font
         config['carbon'] = carbon
         config['dashes'] = dashes
@@ -134,25 +148,239 @@ class Depict:
         config['cgr_aromatic_space'] = cgr_aromatic_space
         config['aromatic_dashes'] = aromatic_dashes
         config['atom_radius'] = atom_radius
+        config = MappingProxyType(config)
+        if set_default:
+            Depict._render_config = config  # replaced, not changed. renders in progress keep old settings
+        return config
+
+    @staticmethod
+    def depict_many(structures: Iterable, *, workers: int = 1, chunksize: int = 100,
+                    cache: Optional[MutableMapping] = None, settings: Optional[Mapping] = None) -> Iterator[str]:
+        """
+        Depict stream of structures or reactions. SVGs returned in order of structures.
+
+        :param workers: number of processes. Structures split into chunks which rendered in parallel.
+            Only two chunks per worker are kept in memory.
+        :param chunksize: number of structures in chunk
+        :param cache: content-addressed render cache, e.g. dict or LRU cache. Keys are hashes of depicted data
+            (atoms, bonds, their attributes and coordinates, atoms numbers if mapping shown) and depict settings,
+            thus equal depictions rendered once. Metadata and names ignored.
+        :param settings: depict settings. see `depict`
+        """
+        return render(structures, False, workers, chunksize, cache, settings)
+
+    @staticmethod
+    def depict_grid(structures: Iterable['Depict'], *, columns: int = 4, workers: int = 1, chunksize: int = 100,
+                    cache: Optional[MutableMapping] = None, settings: Optional[Mapping] = None) -> str:
+        """
+        Depict structures into single SVG grid. Structures placed in rows of `columns` cells.
+        Styles of bonds and atoms labels shared by all cells.
+
+        :param columns: number of cells in row
+        :param workers: number of processes. see `depict_many`
+        :param chunksize: number of structures in chunk
+        :param cache: render cache. see `depict_many`
+        :param settings: depict settings. see `depict`
+        """
+        if not isinstance(columns, int) or columns < 1:
+            raise ValueError('columns should be positive integer')
+        structures = list(structures)
+        if not all(isinstance(x, Depict) for x in structures):
+            raise TypeError('molecules, CGRs or queries expected')
+
+        config = Depict._render_config if settings is None else settings
+        font = config['font']
+        font125 = 1.25 * font
+        cells = list(render(structures, True, workers, chunksize, cache, config))
+        sizes = [(max_x - min_x + 3.0 * font, max_y - min_y + 2.5 * font) for *_, min_x, min_y, max_x, max_y in cells]
+        width = max((w for w, _ in sizes), default=0.)
+        heights = [max(h for _, h in sizes[i: i + columns]) for i in range(0, len(sizes), columns)]
+        total_width = width * min(columns, len(cells))
+        total_height = sum(heights)
+
+        uid = str(uuid4())
+        masked = []
+        bonded = []
+        labeled = []
+        y = 0.
+        for i, ((atoms, bonds, masks, min_x, min_y, max_x, max_y), (w, h)) in enumerate(zip(cells, sizes)):
+            row, column = divmod(i, columns)
+            if not column and row:
+                y += heights[row - 1]
+            # move left top corner of structure box to center of cell
+            shift = f'translate({column * width + (width - w) / 2 - min_x + font125:.2f} ' \
+                    f'{y + (heights[row] - h) / 2 + max_y + font125:.2f})'
+            if bonds:
+                if masks:
+                    masked.append(f'    <mask id="mask-{uid}-{i}">\n'
+                                  f'      <rect x="{min_x - font125:.2f}" y="{-max_y - font125:.2f}" '
+                                  f'width="{w:.2f}" height="{h:.2f}" fill="white"/>\n      <g fill="black">')
+                    masked.extend(masks)
+                    masked.append('      </g>\n    </mask>')
+                    bonded.append(f'    <g transform="{shift}">\n    <g mask="url(#mask-{uid}-{i})">')
+                    if len(bonds) == 1:  # SVG BUG adhoc
+                        bonded.append(f'    <line x1="{min_x - font125:.2f}" y1="{-max_y - font125:.2f}" '
+                                      f'x2="{min_x - font125 + w:.2f}" y2="{-max_y - font125:.2f}" stroke="none"/>')
+                    bonded.extend(bonds)
+                    bonded.append('    </g>\n    </g>')
+                else:
+                    bonded.append(f'    <g transform="{shift}">')
+                    bonded.extend(bonds)
+                    bonded.append('    </g>')
+            if atoms:
+                labeled.append(f'    <g transform="{shift}">')
+                labeled.extend(atoms)
+                labeled.append('    </g>')
+
+        svg = [f'<svg width="{total_width:.2f}cm" height="{total_height:.2f}cm" '
+               f'viewBox="0 0 {total_width:.2f} {total_height:.2f}" xmlns="http://www.w3.org/2000/svg" version="1.1">']
+        if masked:
+            svg.append('  <defs>')
+            svg.extend(masked)
+            svg.append('  </defs>')
+        if bonded:
+            svg.append(f'  <g fill="none" stroke="{config["bond_color"]}" '
+                       f'stroke-width="{config["bond_width"]:.2f}">')
+            svg.extend(bonded)
+            svg.append('  </g>')
+        if labeled:
+            svg.append('  <g font-family="monospace">')
+            svg.extend(labeled)
+            svg.append('  </g>')
+        svg.append('</svg>')
+        return '\n'.join(svg)
 
-    @cached_method
     def _repr_svg_(self):
-        return self.depict()
+        return _repr_svg(self)
+
+    _render_config = MappingProxyType({'carbon': False, 'atoms_colors': cpk, 'bond_color': 'black', 'font': .25,
+                                       'dashes': (.2, .1), 'aromatic_space': .08, 'triple_space': .07,
+                                       'double_space': .04, 'mapping': True, 'mapping_color': '#788CFF',
+                                       'bond_width': .03, 'query_color': '#5D8AA8', 'broken_color': 'red',
+                                       'formed_color': 'green', 'cgr_aromatic_space': .14,
+                                       'aromatic_dashes': (.05, .05), 'atom_radius': -.2})
+
 
-    _render_config = {'carbon': False, 'atoms_colors': cpk, 'bond_color': 'black', 'font': .25, 'dashes': (.2, .1),
-                      'aromatic_space': .08, 'triple_space': .07, 'double_space': .04, 'mapping': True,
-                      'mapping_color': '#788CFF', 'bond_width': .03, 'query_color': '#5D8AA8', 'broken_color': 'red',
-                      'formed_color': 'green', 'cgr_aromatic_space': .14, 'aromatic_dashes': (.05, .05),
-                      'atom_radius': -.2}
+def _repr_svg(structure):
+    """
+    SVG cached with default settings used. Settings replaced by `depict_settings` trigger new depiction.
+    """
+    config = Depict._render_config
+    cached = structure.__dict__.get('__cached_method__repr_svg_')
+    if cached is None or cached[0] is not config:
+        cached = structure.__dict__['__cached_method__repr_svg_'] = (config, structure.depict(settings=config))
+    return cached[1]
+
+
+def render(structures, embedding, workers, chunksize, cache, config):
+    """
+    Depict stream of structures with cache lookup. Missed structures rendered in chunks, in parallel if workers > 1.
+    """
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError('workers should be positive integer')
+    if not isinstance(chunksize, int) or chunksize < 1:
+        raise ValueError('chunksize should be positive integer')
+
+    config = dict(Depict._render_config if config is None else config)  # picklable
+    settings = repr((embedding, sorted(config.items()))).encode()
+    mapping = config['mapping']
+
+    def lookup(chunk):
+        """
+        cache keys, found in cache depictions and indices of structures for rendering.
+        equal missed structures rendered once.
+        """
+        if cache is None:
+            return None, {}, list(range(len(chunk)))
+        keys = [blake2b(depicted_data(x, mapping) + settings, digest_size=16).digest() for x in chunk]
+        found = {}
+        missed = {}
+        for i, k in enumerate(keys):
+            if k in missed:
+                continue
+            try:
+                found[i] = cache[k]  # values taken immediately. LRU caches can drop them on rendered storing
+            except KeyError:
+                missed[k] = i
+        return keys, found, list(missed.values())
+
+    def collect(keys, found, missed, rendered):
+        if cache is None:
+            return rendered
+        new = {}
+        for i, x in zip(missed, rendered):
+            new[keys[i]] = cache[keys[i]] = x
+        return [found[i] if i in found else new[k] for i, k in enumerate(keys)]
+
+    structures = iter(structures)
+    chunks = iter(lambda: list(islice(structures, chunksize)), [])
+    if workers == 1:
+        for chunk in chunks:
+            keys, found, missed = lookup(chunk)
+            yield from collect(keys, found, missed, [chunk[i].depict(embedding=True, settings=config) if embedding
+                                                     else chunk[i].depict(settings=config) for i in missed])
+        return
+
+    pending = deque()
+    with ProcessPoolExecutor(workers) as executor:
+        # structures transferred to workers packed. cheaper than pickling
+        for chunk in chunks:
+            keys, found, missed = lookup(chunk)
+            pending.append((keys, found, missed, executor.submit(depict_chunk, config,
+                                                                 [(type(chunk[i]), chunk[i].pack()) for i in missed],
+                                                                 embedding)))
+            if len(pending) >= workers * 2:
+                keys, found, missed, future = pending.popleft()
+                yield from collect(keys, found, missed, future.result())
+        while pending:
+            keys, found, missed, future = pending.popleft()
+            yield from collect(keys, found, missed, future.result())
+
+
+def depicted_data(structure, mapping):
+    """
+    Serialized data used in depiction of structure or reaction: atoms, bonds, their attributes and coordinates.
+    Atoms replaced by their positions if mapping not shown.
+    """
+    if isinstance(structure, Depict):
+        plane = structure._plane
+        if mapping:
+            position = {n: n for n in structure._atoms}
+        else:
+            position = {n: i for i, n in enumerate(structure._atoms)}
+        attributes = [x for x in (getattr(structure, name, None) for name in _depicted_attributes) if x is not None]
+        atoms = [(position[n], atom.__class__.__name__, atom.atomic_symbol, atom.isotope, plane[n],
+                  *(x[n] for x in attributes)) for n, atom in structure._atoms.items()]
+        bonds = [(position[n], position[m], bond.order, getattr(bond, 'p_order', None))
+                 for n, m, bond in structure.bonds()]
+        return repr((structure.__class__.__name__, atoms, bonds)).encode()
+    # reaction
+    return repr((structure.__class__.__name__, structure._arrow, structure._signs)).encode() + \
+        b''.join(depicted_data(x, mapping) for x in structure.molecules())
+
+
+_depicted_attributes = ('_charges', '_radicals', '_hydrogens', '_p_charges', '_p_radicals', '_neighbors',
+                        '_hybridizations', '_p_neighbors', '_p_hybridizations')
+
+
+def depict_chunk(config, structures, embedding):
+    """
+    depict packed structures in worker process with settings of main process
+    """
+    out = []
+    for cls, structure in structures:
+        structure = cls.unpack(structure)
+        out.append(structure.depict(embedding=True, settings=config) if embedding else
+                   structure.depict(settings=config))
+    return out
 
 
 class DepictMolecule(Depict):
     __slots__ = ()
 
-    def _render_bonds(self):
+    def _render_bonds(self, config):
         svg = []
         plane = self._plane
-        config = self._render_config
 
         double_space = config['double_space']
         triple_space = config['triple_space']
@@ -184,20 +412,18 @@ class DepictMolecule(Depict):
             for n, m in zip(ring, ring[1:]):
                 nx, ny = plane[n]
                 mx, my = plane[m]
-                aromatic = self.__render_aromatic_bond(nx, ny, mx, my, cx, cy)
+                aromatic = self.__render_aromatic_bond(nx, ny, mx, my, cx, cy, config)
                 if aromatic:
                     svg.append(aromatic)
 
             nx, ny = plane[ring[-1]]
             mx, my = plane[ring[0]]
-            aromatic = self.__render_aromatic_bond(nx, ny, mx, my, cx, cy)
+            aromatic = self.__render_aromatic_bond(nx, ny, mx, my, cx, cy, config)
             if aromatic:
                 svg.append(aromatic)
         return svg
 
-    def __render_aromatic_bond(self, n_x, n_y, m_x, m_y, c_x, c_y):
-        config = self._render_config
-
+    def __render_aromatic_bond(self, n_x, n_y, m_x, m_y, c_x, c_y, config):
         aromatic_space = config['aromatic_space']
         dash3, dash4 = config['aromatic_dashes']
         # n aligned xy
@@ -226,13 +452,12 @@ class DepictMolecule(Depict):
             return f'    <line x1="{a_x:.2f}" y1="{-a_y:.2f}" x2="{b_x:.2f}" y2="{-b_y:.2f}" ' \
                    f'stroke-dasharray="{dash3:.2f} {dash4:.2f}"/>'
 
-    def _render_atoms(self):
+    def _render_atoms(self, config):
         bonds = self._bonds
         plane = self._plane
         hydrogens = self._hydrogens
         charges = self._charges
         radicals = self._radicals
-        config = self._render_config
 
         mapping = config['mapping']
         carbon = config['carbon']
@@ -294,9 +519,16 @@ class DepictMolecule(Depict):
 class DepictReaction:
     __slots__ = ()
 
-    def depict(self):
+    def depict(self, *, settings: Optional[Mapping] = None):
+        """
+        SVG of reaction.
+
+        :param settings: depict settings created by `depict_settings`. By default settings set by last call of
+            `depict_settings` used.
+        """
         if not self._arrow:
             self.fix_positions()
+        config = Depict._render_config if settings is None else settings
 
         r_atoms = []
         r_bonds = []
@@ -304,7 +536,7 @@ class DepictReaction:
 
         r_max_x = r_max_y = r_min_y = 0
         for m in self.molecules():
-            atoms, bonds, masks, min_x, min_y, max_x, max_y = m.depict(embedding=True)
+            atoms, bonds, masks, min_x, min_y, max_x, max_y = m.depict(embedding=True, settings=config)
             r_atoms.extend(atoms)
             r_bonds.extend(bonds)
             r_masks.extend(masks)
@@ -315,7 +547,6 @@ class DepictReaction:
             if min_y < r_min_y:
                 r_min_y = min_y
 
-        config = Depict._render_config
         font = config['font']
         font125 = 1.25 * font
         width = r_max_x + 3.0 * font
@@ -368,16 +599,14 @@ class DepictReaction:
         svg.append('</svg>')
         return '\n'.join(svg)
 
-    @cached_method
     def _repr_svg_(self):
-        return self.depict()
+        return _repr_svg(self)
 
 
 class DepictCGR(Depict):
-    def _render_bonds(self):
+    def _render_bonds(self, config):
         svg = []
         plane = self._plane
-        config = self._render_config
 
         double_space = config['double_space']
         triple_space = config['triple_space']
@@ -602,21 +831,19 @@ class DepictCGR(Depict):
             for n, m in zip(ring, ring[1:]):
                 nx, ny = plane[n]
                 mx, my = plane[m]
-                aromatic = self.__render_aromatic_bond(nx, ny, mx, my, cx, cy, ar_bond_colors[n].get(m))
+                aromatic = self.__render_aromatic_bond(nx, ny, mx, my, cx, cy, ar_bond_colors[n].get(m), config)
                 if aromatic:
                     svg.append(aromatic)
 
             n, m = ring[-1], ring[0]
             nx, ny = plane[n]
             mx, my = plane[m]
-            aromatic = self.__render_aromatic_bond(nx, ny, mx, my, cx, cy, ar_bond_colors[n].get(m))
+            aromatic = self.__render_aromatic_bond(nx, ny, mx, my, cx, cy, ar_bond_colors[n].get(m), config)
             if aromatic:
                 svg.append(aromatic)
         return svg
 
-    def __render_aromatic_bond(self, n_x, n_y, m_x, m_y, c_x, c_y, color):
-        config = self._render_config
-
+    def __render_aromatic_bond(self, n_x, n_y, m_x, m_y, c_x, c_y, color, config):
         aromatic_space = config['cgr_aromatic_space']
         dash1, dash2 = config['dashes']
         dash3, dash4 = config['aromatic_dashes']
@@ -648,14 +875,13 @@ class DepictCGR(Depict):
             return f'    <line x1="{an_x + n_x:.2f}" y1="{-an_y - n_y:.2f}"' \
                    f' x2="{bn_x + n_x:.2f}" y2="{-bn_y - n_y:.2f}" stroke-dasharray="{dash3:.2f} {dash4:.2f}"/>'
 
-    def _render_atoms(self):
+    def _render_atoms(self, config):
         bonds = self._bonds
         plane = self._plane
         charges = self._charges
         p_charges = self._p_charges
         radicals = self._radicals
         p_radicals = self._p_radicals
-        config = self._render_config
 
         carbon = config['carbon']
         atoms_colors = config['atoms_colors']
@@ -704,10 +930,9 @@ class DepictCGR(Depict):
 class DepictQuery(Depict):
     __slots__ = ()
 
-    def _render_bonds(self):
+    def _render_bonds(self, config):
         svg = []
         plane = self._plane
-        config = self._render_config
 
         double_space = config['double_space']
         triple_space = config['triple_space']
@@ -739,9 +964,8 @@ class DepictQuery(Depict):
                            f'stroke-dasharray="{dash1:.2f} {dash2:.2f}"/>')
         return svg
 
-    def _render_atoms(self):
+    def _render_atoms(self, config):
         plane = self._plane
-        config = self._render_config
 
         mapping = config['mapping']
         carbon = config['carbon']
@@ -820,10 +1044,9 @@ class DepictQuery(Depict):
 
 
 class DepictQueryCGR(Depict):
-    def _render_bonds(self):
+    def _render_bonds(self, config):
         svg = []
         plane = self._plane
-        config = self._render_config
 
         double_space = config['double_space']
         triple_space = config['triple_space']
@@ -1075,9 +1298,8 @@ class DepictQueryCGR(Depict):
                                f'stroke-dasharray="{dash1:.2f} {dash2:.2f}" stroke="{broken}"/>')
         return svg
 
-    def _render_atoms(self):
+    def _render_atoms(self, config):
         plane = self._plane
-        config = self._render_config
 
         carbon = config['carbon']
         atoms_colors = config['atoms_colors']
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from CachedMethods import cached_property
+from typing import Dict, Optional
+from ._cache import cache_depends
+
+
+modulo = (1 << 61) - 1  # mersenne prime. stable between python versions unlike tuple hash
+base = 1000003
+ring_tag = 1 << 30  # out of atoms and bonds labels range
+
+
+class Fingerprints:
+    """
+    Structural screening fingerprint. Bits are set by atoms labels, linear paths of atoms and bonds and
+    number of SSSR rings. For any substructure mapping query bits are subset of target bits.
+    """
+    __slots__ = ()
+    fingerprint_length = 2048
+    fingerprint_depth = 4
+
+    @cache_depends('atoms', 'bonds')
+    @cached_property
+    def fingerprint(self) -> int:
+        """
+        Bit-packed screening fingerprint of graph. Integer of `fingerprint_length` bits.
+        """
+        return self._fingerprint(self.fingerprint_length, self.fingerprint_depth)
+
+    def is_fingerprint_subset(self, other) -> bool:
+        """
+        Test self fingerprint is subset of other. False means self is not substructure of other.
+        """
+        fingerprint = self.fingerprint
+        return fingerprint & other.fingerprint == fingerprint
+
+    def _fingerprint(self, length: int, depth: int) -> int:
+        """
+        Calculate fingerprint with given number of bits and maximal number of bonds in paths.
+        """
+        labels = self.__atoms_labels()
+        bonds = self._bonds
+
+        fingerprint = 0
+        for n, label in labels.items():
+            if label is None:  # any atom. paths with it can't be used for screening
+                continue
+            label += 1
+            fingerprint |= 1 << label % modulo % length
+
+            # forward and backward hashes of path. path hash is minimal of its.
+            stack = [(n, label, label, base, 0, {n})]
+            while stack:
+                current, forward, backward, power, size, seen = stack.pop()
+                size += 1
+                for m, bond in bonds[current].items():
+                    if m in seen:
+                        continue
+                    atom = labels[m]
+                    if atom is None:
+                        continue
+                    bond = int(bond) + 1
+                    atom += 1
+                    f = ((forward * base + bond) * base + atom) % modulo
+                    b = (backward + bond * power + atom * power * base) % modulo
+                    fingerprint |= 1 << min(f, b) % length
+                    if size < depth:
+                        stack.append((m, f, b, power * base * base % modulo, size, seen | {m}))
+
+        for k in range(1, len(self.sssr) + 1):  # number of rings is monotone for substructures
+            fingerprint |= 1 << (ring_tag + k) * base % modulo % length
+        return fingerprint
+
+    def __atoms_labels(self) -> Dict[int, Optional[int]]:
+        """
+        Atoms attributes which should be equal in query and target: isotope, element, charge and radical state.
+        """
+        charges = self._charges
+        radicals = self._radicals
+        return {n: (a.isotope or 0) << 12 | a.atomic_number << 5 | charges[n] + 4 << 1 | radicals[n]
+                if a.atomic_number else None for n, a in self._atoms.items()}
+
+
+__all__ = ['Fingerprints']
@@ -20,7 +20,8 @@ from abc import abstractmethod
 from CachedMethods import cached_property
 from collections import defaultdict
 from itertools import permutations, product
-from typing import Dict, Iterator, Any
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from ._cache import cache_depends
 
 
 class Isomorphism:
@@ -69,6 +70,9 @@ class Isomorphism:
         """
         Get self to other substructure mapping generator
         """
+        if not self.is_fingerprint_subset(other):  # fast screening
+            return
+
         seen = set()
         components, closures = self.__compiled_query
         o_atoms = other._atoms
@@ -132,10 +136,19 @@ class Isomorphism:
                             and all(bond == o_bonds[mapping[m]].get(o_n) for m, bond in query_closures[s_n]):
                         stack.append((o_n, lp))
 
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def __compiled_query(self):
         return self.__compile_query(self._atoms, self._bonds, self.atoms_order)
 
+    @property
+    def _matching_order(self) -> Tuple[Tuple[Tuple[int, Optional[int]], ...], ...]:
+        """
+        Atoms numbers with numbers of preceding atoms in order of substructure matching of connected components.
+        Queries with equal structure and order generate equal sequences of mappings.
+        """
+        return tuple(((c[0][0], None), *((n, back) for n, back, *_ in c[1:])) for c in self.__compiled_query[0])
+
     @staticmethod
     def __compile_query(atoms, bonds, atoms_order):
         closures = defaultdict(list)
@@ -162,6 +175,93 @@ class Isomorphism:
                     seen.add(front)
         return components, closures
 
+    @staticmethod
+    def _compile_queries(queries: Sequence['Isomorphism']):
+        """
+        Merge linearized connected queries into prefix tree. Queries with equal atoms, bonds and closures in
+        beginning of linear order share nodes.
+
+        Node is list of query atom, bond to fork, fork depth, closures as (depth, bond) pairs, children nodes,
+        indices of queries ended in node and indices of all queries below node.
+        """
+        roots = {}
+        orders = {}
+        for i, query in enumerate(queries):
+            components, closures = query.__compiled_query
+            if len(components) != 1:
+                continue
+            order = components[0]
+            order_depth = {v[0]: k for k, v in enumerate(order)}
+            orders[i] = [x[0] for x in order]
+
+            level = roots
+            for depth, (n, *back_bond) in enumerate(order):
+                atom = query._atoms[n]
+                if depth:
+                    back, _, bond = back_bond
+                    back = order_depth[back]
+                    closure = tuple(sorted((order_depth[m], b) for m, b in closures[n]))
+                    key = (back, int(bond), closure, *Isomorphism.__atom_key(atom))
+                else:
+                    bond = back = None
+                    closure = ()
+                    key = Isomorphism.__atom_key(atom)
+                try:
+                    node = level[key]
+                except KeyError:
+                    node = level[key] = [atom, bond, back, closure, {}, [], set()]
+                node[6].add(i)
+                level = node[4]
+            node[5].append(i)
+
+        def freeze(level):
+            return [(atom, bond, back, closure, freeze(children), terminals, patterns)
+                    for atom, bond, back, closure, children, terminals, patterns in level.values()]
+        return freeze(roots), orders
+
+    @staticmethod
+    def __atom_key(atom):
+        return (atom.__class__, atom.isotope, atom.charge, atom.is_radical,
+                getattr(atom, 'neighbors', None), getattr(atom, 'hybridization', None),
+                getattr(atom, 'p_charge', None), getattr(atom, 'p_is_radical', None),
+                getattr(atom, 'p_neighbors', None), getattr(atom, 'p_hybridization', None))
+
+    def _get_queries_mapping(self, roots, orders, active, automorphism_filter) -> Iterator[Tuple[int, Dict[int, int]]]:
+        """
+        Single traversal of self by prefix tree of queries. Yield query index and mapping.
+        Only queries with indices in active set checked.
+        """
+        o_atoms = self._atoms
+        o_bonds = self._bonds
+        seen = defaultdict(set)
+
+        stack = [(node, n, 0) for n, o_atom in o_atoms.items() for node in roots
+                 if not active.isdisjoint(node[6]) and node[0] == o_atom]
+        path = []
+        while stack:
+            node, o_atom, depth = stack.pop()
+            del path[depth:]
+            path.append(o_atom)
+
+            for i in node[5]:
+                if i in active:
+                    if automorphism_filter:
+                        atoms = frozenset(path)
+                        if atoms in seen[i]:
+                            continue
+                        seen[i].add(atoms)
+                    yield i, dict(zip(orders[i], path))
+
+            depth += 1
+            for child in node[4]:
+                if active.isdisjoint(child[6]):
+                    continue
+                s_atom, s_bond, back, closures, *_ = child
+                for o_n, o_bond in o_bonds[path[back]].items():
+                    if o_n not in path and s_bond == o_bond and s_atom == o_atoms[o_n] and \
+                            all(bond == o_bonds[path[m]].get(o_n) for m, bond in closures):
+                        stack.append((child, o_n, depth))
+
     def is_automorphic(self):
         """
         Test for automorphism symmetry of graph.
@@ -195,4 +295,57 @@ class Isomorphism:
                 yield mapping
 
 
-__all__ = ['Isomorphism']
+class QueryMatcher:
+    """
+    Matcher of many queries against one structure in single traversal.
+
+    Connected queries compiled into prefix tree of linearized queries and matched together.
+    Disconnected queries matched separately.
+    """
+    __slots__ = ('_queries', '_roots', '_orders')
+
+    def __init__(self, queries: Sequence[Isomorphism]):
+        """
+        :param queries: list of queries. Queries should not be changed after matcher creation.
+        """
+        self._queries: List[Isomorphism] = list(queries)
+        self._roots, self._orders = Isomorphism._compile_queries(self._queries)
+
+    def __len__(self):
+        return len(self._queries)
+
+    def get_mapping(self, other: Isomorphism, *, automorphism_filter: bool = True) -> \
+            Iterator[Tuple[int, Dict[int, int]]]:
+        """
+        Get queries to other substructure mappings generator. Yield index of query and mapping.
+        """
+        active = {i for i, q in enumerate(self._queries) if q.is_fingerprint_subset(other)}
+        if not active:
+            return
+        orders = self._orders
+        yield from other._get_queries_mapping(self._roots, orders, active, automorphism_filter)
+        for i in sorted(active.difference(orders)):
+            for mapping in self._queries[i].get_mapping(other, automorphism_filter=automorphism_filter):
+                yield i, mapping
+
+    def get_matched(self, other: Isomorphism) -> List[int]:
+        """
+        Sorted indices of queries which are substructures of other.
+        """
+        active = {i for i, q in enumerate(self._queries) if q.is_fingerprint_subset(other)}
+        if not active:
+            return []
+        orders = self._orders
+        found = []
+        for i in sorted(active.difference(orders)):
+            if self._queries[i].is_substructure(other):
+                found.append(i)
+        active.intersection_update(orders)
+        for i, _ in other._get_queries_mapping(self._roots, orders, active, False):
+            active.discard(i)  # prune tree by already matched queries
+            found.append(i)
+        found.sort()
+        return found
+
+
+__all__ = ['Isomorphism', 'QueryMatcher']
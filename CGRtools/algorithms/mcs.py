@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-#  Copyright 2018, 2019 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  Copyright 2018-2020 Ramil Nugmanov <nougmanoff@protonmail.com>
 #  This file is part of CGRtools.
 #
 #  CGRtools is free software; you can redistribute it and/or modify
@@ -19,7 +19,12 @@
 from abc import abstractmethod
 from collections import defaultdict
 from itertools import product, combinations, islice
-from typing import Dict, Set, Iterator, Tuple
+from time import perf_counter
+from typing import Dict, List, Optional, Set, Iterator, Tuple
+
+
+class MCSTimeout(Exception):
+    pass
 
 
 class MCS:
@@ -90,6 +95,155 @@ class MCS:
                 hits2.append(mapping)
         yield from (dict(x) for x in hits2)
 
+    @abstractmethod
+    def get_mcs_clique_mapping(self, other, *, timeout: Optional[float] = None, connected: bool = True) -> \
+            Tuple[Dict[int, int], bool]:
+        """
+        Find maximum common induced substructure as maximum clique in modular product graph.
+        Branch and bound search with greedy coloring bounds over bitset adjacency (MCQ/BBMC algorithms family).
+
+        :param timeout: wall-clock limit of search in seconds. Best found mapping returned on timeout.
+        :param connected: search only connected common substructures.
+        :return: mapping of self atoms to other atoms and flag of complete search.
+            Mapping of complete search has maximal number of atoms.
+        """
+        deadline = None if timeout is None else perf_counter() + timeout
+        nodes, adjacency, core = self.__get_bitset_product(other)
+        if not nodes:
+            return {}, True
+
+        try:
+            clique, complete = self.__max_clique(adjacency, core, connected, deadline), True
+        except MCSTimeout as e:
+            clique, complete = e.args[0], False
+        return dict(nodes[x] for x in clique), complete
+
+    @staticmethod
+    def __max_clique(adjacency: List[int], core: List[int], connected: bool, deadline: Optional[float]) -> List[int]:
+        """
+        Maximum clique search. Bits of vertices ordered by degree descending for better coloring.
+        """
+        def coloring(candidates):
+            vertices = []
+            colors = []
+            color = 0
+            while candidates:
+                color += 1
+                queue = candidates
+                while queue:
+                    bit = queue & -queue
+                    v = bit.bit_length() - 1
+                    candidates ^= bit
+                    queue &= ~(adjacency[v] | bit)
+                    vertices.append(v)
+                    colors.append(color)
+            return vertices, colors
+
+        best = []
+        clique = []
+        candidates = (1 << len(adjacency)) - 1
+        vertices, colors = coloring(candidates)
+        # candidates, colored candidates, position, color of first skipped vertex, core neighbors of clique
+        frames = [[candidates, vertices, colors, len(vertices), 0, -1]]
+        while frames:
+            frame = frames[-1]
+            candidates, vertices, colors, i, skipped, reachable = frame
+            size = len(clique)
+            descended = False
+            while i:
+                i -= 1
+                c = colors[i]
+                if size + max(c, skipped) <= len(best):  # colors bound
+                    break
+                v = vertices[i]
+                bit = 1 << v
+                if not bit & reachable:  # disconnected from clique. stays in candidates
+                    if not skipped:
+                        skipped = c
+                    continue
+
+                if deadline is not None and perf_counter() > deadline:
+                    raise MCSTimeout(best)
+
+                candidates ^= bit
+                clique.append(v)
+                if len(clique) > len(best):
+                    best = clique.copy()
+                new_candidates = candidates & adjacency[v]
+                if connected:
+                    new_reachable = reachable | core[v] if size else core[v]
+                    # only connected by core paths to clique candidates can extend it
+                    front = found = new_candidates & new_reachable
+                    while front:
+                        bits = 0
+                        while front:
+                            bit = front & -front
+                            bits |= core[bit.bit_length() - 1]
+                            front ^= bit
+                        front = bits & new_candidates & ~found
+                        found |= front
+                    new_candidates = found
+                else:
+                    new_reachable = -1
+                if new_candidates:
+                    frame[0], frame[3], frame[4] = candidates, i, skipped
+                    new_vertices, new_colors = coloring(new_candidates)
+                    frames.append([new_candidates, new_vertices, new_colors, len(new_vertices), 0, new_reachable])
+                    descended = True
+                    break
+                clique.pop()
+            if not descended:  # exhausted or pruned
+                frames.pop()
+                if frames:
+                    clique.pop()
+        return best
+
+    def __get_bitset_product(self, other) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+        """
+        Modular product graph. Nodes are pairs of equal atoms. Nodes connected if atoms pairs are bonded by equal
+        bonds (core edges) or not bonded in both structures.
+
+        :return: nodes in degree descending order, bitsets of neighbors and bitsets of core neighbors of nodes.
+        """
+        o_atoms = other._atoms
+        nodes = [(n, m) for n, atom in self._atoms.items() for m, o_atom in o_atoms.items() if atom == o_atom]
+        if not nodes:
+            return nodes, [], []
+        adjacency, core = self.__get_bitset_adjacency(other, nodes)
+        order = sorted(range(len(nodes)), key=lambda x: bin(adjacency[x]).count('1'), reverse=True)
+        nodes = [nodes[x] for x in order]
+        return (nodes, *self.__get_bitset_adjacency(other, nodes))
+
+    def __get_bitset_adjacency(self, other, nodes):
+        bonds = self._bonds
+        o_bonds = other._bonds
+        index = {nm: i for i, nm in enumerate(nodes)}
+
+        s_bits = defaultdict(int)
+        o_bits = defaultdict(int)
+        for i, (n, m) in enumerate(nodes):
+            s_bits[n] |= 1 << i
+            o_bits[m] |= 1 << i
+
+        full = (1 << len(nodes)) - 1
+        adjacency = []
+        core = []
+        for n, m in nodes:
+            s_bonded = o_bonded = core_bits = 0
+            for x in bonds[n]:
+                s_bonded |= s_bits[x]
+            for y in o_bonds[m]:
+                o_bonded |= o_bits[y]
+            for x, b in bonds[n].items():
+                for y, o_b in o_bonds[m].items():
+                    if b == o_b:
+                        j = index.get((x, y))
+                        if j is not None:
+                            core_bits |= 1 << j
+            core.append(core_bits)
+            adjacency.append(full & ~(s_bits[n] | o_bits[m] | s_bonded | o_bonded) | core_bits)
+        return adjacency, core
+
     @staticmethod
     def __clique(graph) -> Iterator[Set[Tuple[int, int]]]:
         """
@@ -18,15 +18,80 @@
 #
 from CachedMethods import cached_property
 from collections import Counter
+from importlib.util import find_spec
 from itertools import groupby
 from logging import warning
 from operator import itemgetter
 from typing import Dict
+from ._cache import cache_depends
+
+
+if find_spec('numpy'):
+    from numpy import arange, array, full, int64, lexsort, repeat, uint64, unique, where
+
+    # CPython 3.8+ 64-bit integers and tuples hashing reimplemented on arrays of unsigned integers.
+    # array-backed refinement gives exactly the same weights as hash based.
+    modulo = uint64((1 << 61) - 1)
+    prime1 = uint64(11400714785074694791)
+    prime2 = uint64(14029467366897019727)
+    prime5 = uint64(2870177450012600261)
+    suffix = uint64(2870177450012600261 ^ 3527539)
+    minus1 = uint64((1 << 64) - 1)
+    minus2 = uint64((1 << 64) - 2)
+
+    def _int_hash(values):
+        """
+        hash of signed 64-bit integers as unsigned integers
+        """
+        values = values.view(uint64)
+        negative = values >> uint64(63) == 1
+        result = where(negative, ~values + uint64(1), values) % modulo
+        result = where(negative, ~result + uint64(1), result)
+        result[result == minus1] = minus2  # -1 is reserved for errors
+        return result
+
+    def _tuple_hash(head, items, masks):
+        """
+        hash of tuples of head item and masked items. items are hashes of integers.
+        """
+        accumulator = _tuple_round(full(len(head), prime5, dtype=uint64), head)
+        length = uint64(1)
+        for column, mask in zip(items, masks):
+            accumulator = where(mask, _tuple_round(accumulator, column), accumulator)
+            length = length + mask
+        accumulator += length ^ suffix
+        accumulator[accumulator == minus1] = uint64(1546275796)
+        return accumulator.view(int64)
+
+    def _tuple_round(accumulator, lane):
+        accumulator = accumulator + lane * prime2
+        return (accumulator << uint64(31) | accumulator >> uint64(33)) * prime1
+
+    def _check():
+        sample = [0, 1, -1, -2, 2, (1 << 61) - 1, 1 << 61, -(1 << 61), (1 << 63) - 1, -(1 << 63),
+                  -8072377521066432474, 5924186938134522437]
+        lanes = _int_hash(array(sample, dtype=int64))
+        if lanes.view(int64).tolist() != [hash(x) for x in sample]:
+            return False
+        size = len(sample) - 2
+        items = [lanes[1:size + 1], lanes[2:]]
+        for width in range(3):
+            masks = [full(size, x < width) for x in range(2)]
+            if _tuple_hash(lanes[:size], items, masks).tolist() != \
+                    [hash(tuple(sample[i:i + width + 1])) for i in range(size)]:
+                return False
+        return True
+
+    morgan_array_available = _check()  # other interpreters have different hashing
+else:
+    morgan_array_available = False
 
 
 class Morgan:
     __slots__ = ()
+    morgan_array_threshold = 100  # minimal number of atoms for array-backed refinement. None - disable
 
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def atoms_order(self) -> Dict[int, int]:
         """
@@ -47,6 +112,9 @@ class Morgan:
     def _morgan(self, weights: Dict[int, int]) -> Dict[int, int]:
         atoms = self._atoms
         bonds = self._bonds
+        threshold = self.morgan_array_threshold
+        if threshold is not None and len(atoms) >= threshold and morgan_array_available:
+            return self._morgan_array(weights)
 
         tries = len(atoms) - 1
         numb = len(set(weights.values()))
@@ -73,5 +141,59 @@ class Morgan:
         return {n: i for i, (_, g) in enumerate(groupby(sorted(weights.items(), key=itemgetter(1)), key=itemgetter(1)),
                                                 start=1) for n, _ in g}
 
+    def _morgan_array(self, weights: Dict[int, int]) -> Dict[int, int]:
+        """
+        Array-backed refinement. Adjacency stored in CSR form. On each iteration weights of neighbors
+        sorted and packed into matrix rows, then tuples hashes of all atoms calculated column by column.
+        Gives exactly the same ranks as hash based refinement.
+        """
+        atoms = self._atoms
+        bonds = self._bonds
+        size = len(atoms)
+        index = {n: i for i, n in enumerate(atoms)}
+
+        degrees = array([len(bonds[n]) for n in atoms], dtype=int64)
+        neighbors = array([index[m] for n in atoms for m in bonds[n]], dtype=int64)
+        rows = repeat(arange(size), degrees)
+        columns = arange(len(neighbors)) - repeat(degrees.cumsum() - degrees, degrees)
+        width = int(degrees.max(initial=0))
+        matrix = full((width, size), 0, dtype=uint64)  # columns of neighbors hashes
+        masks = [degrees > x for x in range(width)]  # real neighbors in columns
+
+        ranks = {w: i for i, w in enumerate(sorted(set(weights.values())))}  # initial weights can be any integers
+        keys = array([ranks[weights[n]] for n in atoms], dtype=int64)  # neighbors sorting order
+        lanes = array([hash(weights[n]) for n in atoms], dtype=int64).view(uint64)
+
+        if size == 1:
+            return {n: 1 for n in atoms}
+
+        tries = size - 1
+        numb = len(ranks)
+        stab = old_numb = 0
+
+        for _ in range(tries):
+            ordered = neighbors[lexsort((keys[neighbors], rows))]
+            matrix[columns, rows] = lanes[ordered]
+            keys = _tuple_hash(lanes, matrix, masks)
+            lanes = _int_hash(keys)
+            counts = unique(keys, return_counts=True)[1]
+            old_numb, numb = numb, len(counts)
+            if numb == size:  # each atom now unique
+                break
+            elif numb == old_numb:  # not changed. molecules like benzene
+                if counts.min() > 1:
+                    if stab == 3:
+                        break
+                elif stab >= 2:
+                    break
+                stab += 1
+            elif stab:  # changed unique atoms number. reset stability check.
+                stab = 0
+        else:
+            if numb < old_numb:
+                warning('morgan. number of attempts exceeded. uniqueness has decreased.')
+
+        return {n: int(x) for n, x in zip(atoms, unique(keys, return_inverse=True)[1].reshape(-1) + 1)}
+
 
 __all__ = ['Morgan']
@@ -19,8 +19,10 @@
 #
 from CachedMethods import cached_method, cached_property
 from collections import defaultdict
-from hashlib import sha512
+from hashlib import blake2b, sha512
 from itertools import count, product
+from typing import List
+from ._cache import cache_depends
 
 
 charge_str = {-4: '-4', -3: '-3', -2: '-2', -1: '-', 0: '0', 1: '+', 2: '+2', 3: '+3', 4: '+4'}
@@ -40,10 +42,15 @@ dyn_charge_str[(0, 0)] = ''
 
 dyn_radical_str = {(True, True): '*', (True, False): '*>^', (False, True): '^>*'}
 
+modulo = (1 << 61) - 1  # mersenne prime. stable between python versions unlike tuple hash
+base = 1000003
+tokens_hashes = {}
+
 
 class Smiles:
     __slots__ = ()
 
+    @cache_depends('atoms', 'bonds', 'stereo')
     @cached_method
     def __str__(self):
         return ''.join(self._smiles(self.atoms_order.get))
@@ -76,14 +83,79 @@ class Smiles:
     def __eq__(self, other):
         return isinstance(other, Smiles) and str(self) == str(other)
 
-    @cached_method
     def __hash__(self):
-        return hash(str(self))
+        return hash(self.canonical_hash)
 
+    @cache_depends('atoms', 'bonds', 'stereo')
     @cached_method
     def __bytes__(self):
         return sha512(str(self).encode()).digest()
 
+    @cache_depends('atoms', 'bonds', 'stereo')
+    @cached_property
+    def canonical_hash(self) -> int:
+        """
+        Stable between sessions 128-bit hash of structure. Equal for structures with equal SMILES.
+        Calculated from refined atoms invariants without SMILES string generation.
+        """
+        return int.from_bytes(blake2b(b''.join(sorted(self._components_hashes)), digest_size=16).digest(), 'big')
+
+    @cache_depends('atoms', 'bonds', 'stereo')
+    @cached_property
+    def _components_hashes(self) -> List[bytes]:
+        """
+        Canonical hashes of connected components.
+        """
+        bonds = self._bonds
+        stereo = getattr(self, '_atoms_stereo', None)
+        hashes = []
+        for component in self.connected_components:
+            # atoms and bonds labels are SMILES tokens without stereo signs. equal SMILES has equal tokens.
+            labels = {}
+            for n in component:
+                if stereo and n in stereo:
+                    token = self._format_atom(n, adjacency={n: self._tetrahedrons[n]}).replace('@', '')
+                else:
+                    token = self._format_atom(n, stereo=False)
+                labels[n] = self.__token_hash(token)
+            bonds_labels = {n: [(m, self.__token_hash(self._format_bond(n, m, stereo=False))) for m in bonds[n]]
+                            for n in component}
+
+            numb = len(set(labels.values()))
+            for _ in range(len(component) - 1):
+                new_labels = {}
+                for n, ms in bonds_labels.items():
+                    h = labels[n]
+                    for x in sorted((labels[m] * base + b) % modulo for m, b in ms):
+                        h = (h * base + x) % modulo
+                    new_labels[n] = h
+                labels = new_labels
+                old_numb, numb = numb, len(set(new_labels.values()))
+                if numb == old_numb:  # partition is stable
+                    break
+
+            if stereo:
+                for n, s in stereo.items():
+                    if n not in labels:
+                        continue
+                    env = self._tetrahedrons[n]
+                    if len({labels[m] for m in env}) == len(env):  # parity in order of unique labels is invariant
+                        mark = 3 if self._translate_tetrahedron_stereo(n, sorted(env, key=labels.get)) else 2
+                    else:
+                        mark = 1
+                    labels[n] = (labels[n] * base + mark) % modulo
+            hashes.append(blake2b(b''.join(x.to_bytes(8, 'big') for x in sorted(labels.values())),
+                                  digest_size=16).digest())
+        return hashes
+
+    @staticmethod
+    def __token_hash(token: str) -> int:
+        try:
+            return tokens_hashes[token]
+        except KeyError:
+            h = tokens_hashes[token] = int.from_bytes(blake2b(token.encode(), digest_size=7).digest(), 'big')
+            return h
+
     def _smiles(self, weights, *, asymmetric_closures=False, open_parenthesis='(', close_parenthesis=')',
                 delimiter='.', **kwargs):
         if not self._atoms:
@@ -214,6 +286,7 @@ class Smiles:
 class MoleculeSmiles(Smiles):
     __slots__ = ()
 
+    @cache_depends('bonds')
     @cached_property
     def __aromatic_atoms(self):
         aromatics = set()
@@ -20,6 +20,7 @@ from CachedMethods import cached_property
 from collections import defaultdict
 from itertools import chain, combinations
 from typing import Set, Dict, Union, Any, Tuple
+from ._cache import cache_depends
 
 
 class SSSR:
@@ -30,7 +31,9 @@ class SSSR:
         http://doi.org/10.1073/pnas.0813040106
     """
     __slots__ = ()
+    sssr_bitset_threshold = 100  # minimal number of atoms in rings system for bitset based search. None - disable
 
+    @cache_depends()
     @cached_property
     def sssr(self) -> Tuple[Tuple[int, ...], ...]:
         """
@@ -41,6 +44,19 @@ class SSSR:
         # ignore isolated atoms. optimization.
         return self._sssr(self._bonds)
 
+    @cache_depends()
+    @cached_property
+    def relevant_cycles(self) -> Tuple[Tuple[int, ...], ...]:
+        """
+        Relevant cycles. Union of all minimal cycle bases. Each cycle can't be composed from smaller cycles.
+        E.g. cubane has 6 relevant cycles and 5 SSSR rings.
+        Note: number of relevant cycles can grow exponentially in macrocycles of fused rings.
+
+        :return rings atoms numbers
+        """
+        bonds = self._skin_graph(self._bonds)
+        return tuple(ring for system in self.__rings_systems(bonds) for ring in self.__gf2_rings(system, True))
+
     @classmethod
     def _sssr(cls, bonds: Dict[int, Union[Set[int], Dict[int, Any]]]) -> Tuple[Tuple[int, ...], ...]:
         """
@@ -48,11 +64,200 @@ class SSSR:
         """
         bonds = cls._skin_graph(bonds)
         if bonds:
-            terminated, n_sssr = cls.__bfs(bonds)
-            if n_sssr:
-                return cls.__rings_filter(cls.__pid(terminated), n_sssr, bonds)
+            threshold = cls.sssr_bitset_threshold
+            if threshold is not None and len(bonds) >= threshold:
+                systems = cls.__rings_systems(bonds)
+                if any(len(x) >= threshold for x in systems):
+                    rings = []
+                    for system in systems:
+                        if len(system) >= threshold:
+                            rings.extend(cls.__gf2_rings(system))
+                        else:
+                            rings.extend(cls.__pid_rings(system))
+                    return tuple(rings)
+            return cls.__pid_rings(bonds)
+        return ()
+
+    @classmethod
+    def __pid_rings(cls, bonds):
+        terminated, n_sssr = cls.__bfs(bonds)
+        if n_sssr:
+            return cls.__rings_filter(cls.__pid(terminated), n_sssr, bonds)
         return ()
 
+    @staticmethod
+    def __rings_systems(bonds):
+        """
+        Connected components of skin graph
+        """
+        systems = []
+        atoms = set(bonds)
+        while atoms:
+            start = atoms.pop()
+            seen = {start}
+            stack = [start]
+            while stack:
+                for m in bonds[stack.pop()]:
+                    if m not in seen:
+                        seen.add(m)
+                        stack.append(m)
+            atoms.difference_update(seen)
+            systems.append({n: bonds[n] for n in bonds if n in seen})
+        return systems
+
+    @classmethod
+    def __gf2_rings(cls, bonds, relevant=False):
+        """
+        Smallest rings or relevant cycles of connected rings system.
+
+        Vismara prototypes are combined from two shortest paths of breadth-first search from root atom in subgraph of
+        atoms preceding root. Prototypes sorted by length and checked for independence by gaussian elimination over
+        GF(2) of rings bonds bitsets. Prototype is in SSSR if independent from already selected. Prototype is
+        relevant if independent from all smaller prototypes. Relevant cycles are all rings of relevant prototypes
+        families, i.e. combinations of all shortest paths.
+        """
+        order = {n: i for i, n in enumerate(bonds)}
+        edges = {}
+        for n, ms in bonds.items():
+            for m in ms:
+                if (m, n) not in edges:
+                    edges[(n, m)] = edges[(m, n)] = 1 << len(edges) // 2
+        n_sssr = len(edges) // 2 - len(bonds) + 1
+        if not n_sssr:
+            return []
+
+        prototypes = {}
+        for r in bonds:
+            distances, predecessors, atoms, paths = cls.__restricted_bfs(r, bonds, order, edges)
+            for y, dy in distances.items():
+                for z in bonds[y]:  # odd rings closed by bond of atoms of same layer
+                    if distances.get(z) == dy and order[y] < order[z] and atoms[y] & atoms[z] == atoms[r]:
+                        bits = paths[y] | paths[z] | edges[(y, z)]
+                        if bits not in prototypes:
+                            prototypes[bits] = (2 * dy + 1, r, y, z, None)
+                ps = predecessors[y]
+                for i, x in enumerate(ps):  # even rings closed by atom
+                    for z in ps[i + 1:]:
+                        if atoms[x] & atoms[z] == atoms[r]:
+                            bits = paths[x] | paths[z] | edges[(x, y)] | edges[(z, y)]
+                            if bits not in prototypes:
+                                prototypes[bits] = (2 * dy, r, x, z, y)
+
+        basis = {}
+        smaller = {}
+        sssr = []
+        families = []
+        size = 0
+        for bits, prototype in sorted(prototypes.items(), key=lambda x: x[1][0]):
+            if prototype[0] != size:
+                if len(sssr) == n_sssr:
+                    break
+                size = prototype[0]
+                smaller = basis.copy()
+            if relevant:
+                v = bits
+                while v:
+                    b = smaller.get(v.bit_length() - 1)
+                    if b is None:
+                        families.append(prototype)
+                        break
+                    v ^= b
+            v = bits
+            while v:
+                pivot = v.bit_length() - 1
+                b = basis.get(pivot)
+                if b is None:
+                    basis[pivot] = v
+                    sssr.append(cls.__path(prototype, cls.__restricted_bfs(prototype[1], bonds, order, edges)[1]))
+                    break
+                v ^= b
+
+        if not relevant:
+            return sssr
+        rings = []
+        for prototype in families:
+            _, r, y, z, p = prototype
+            predecessors = cls.__restricted_bfs(r, bonds, order, edges)[1]
+            for y_path in cls.__all_paths(y, predecessors):
+                y_set = set(y_path)
+                for z_path in cls.__all_paths(z, predecessors):
+                    if y_set.isdisjoint(z_path[1:]):
+                        if p is None:
+                            rings.append((*y_path, *z_path[:0:-1]))
+                        else:
+                            rings.append((*y_path, p, *z_path[:0:-1]))
+        return rings
+
+    @staticmethod
+    def __restricted_bfs(r, bonds, order, edges):
+        """
+        Breadth-first search from root. Only atoms preceding root and reachable by shortest path of preceding
+        atoms are kept.
+
+        :return: distances, all shortest paths predecessors and atoms and bonds bitsets of first shortest paths
+        """
+        limit = order[r]
+        distances = {r: 0}
+        predecessors = {r: []}
+        atoms = {r: 1 << limit}
+        paths = {r: 0}
+        seen = {r: 0}
+        layer = [r]
+        depth = 0
+        while layer:
+            depth += 1
+            new_layer = []
+            for n in layer:
+                for m in bonds[n]:
+                    d = seen.get(m)
+                    if d is None:
+                        seen[m] = depth
+                        new_layer.append(m)
+                    elif d != depth:
+                        continue
+                    if n not in distances or order[m] > limit:
+                        continue
+                    if m in distances:
+                        predecessors[m].append(n)
+                    else:
+                        distances[m] = depth
+                        predecessors[m] = [n]
+                        atoms[m] = atoms[n] | 1 << order[m]
+                        paths[m] = paths[n] | edges[(n, m)]
+            layer = new_layer
+        return distances, predecessors, atoms, paths
+
+    @staticmethod
+    def __path(prototype, predecessors):
+        """
+        Ring of prototype by first shortest paths
+        """
+        _, r, y, z, p = prototype
+        y_path = [y]
+        while y != r:
+            y = predecessors[y][0]
+            y_path.append(y)
+        z_path = [z]
+        while z != r:
+            z = predecessors[z][0]
+            z_path.append(z)
+        if p is None:
+            return (*y_path[::-1], *z_path[:-1])
+        return (*y_path[::-1], p, *z_path[:-1])
+
+    @classmethod
+    def __all_paths(cls, n, predecessors):
+        """
+        All shortest paths from root to atom
+        """
+        ps = predecessors[n]
+        if not ps:
+            yield n,
+            return
+        for m in ps:
+            for path in cls.__all_paths(m, predecessors):
+                yield (*path, n)
+
     @staticmethod
     def __bfs(bonds):
         n_sssr = sum(len(x) for x in bonds.values()) // 2 - len(bonds) + 1
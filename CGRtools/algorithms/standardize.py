@@ -17,6 +17,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
+from collections import defaultdict
 from ..exceptions import ValenceError
 
 
@@ -31,7 +32,10 @@ class Standardize:
         atom_map = {'charge': self._charges, 'is_radical': self._radicals, 'hybridization': self._hybridizations}
         bonds = self._bonds
         hs = set()
-        for pattern, atom_fix, bonds_fix in self._standardize_compiled_rules:
+        matched = set(self._standardize_matcher.get_matched(self))
+        for i, (pattern, atom_fix, bonds_fix) in enumerate(self._standardize_compiled_rules):
+            if not hs and i not in matched:  # structure not changed yet. single pass matching result is actual
+                continue
             for mapping in pattern.get_mapping(self):
                 hs.update(mapping.values())
 
@@ -41,9 +45,10 @@ class Standardize:
                         atom_map[key][n] = value
                 for n, m, b in bonds_fix:
                     bonds[mapping[n]][mapping[m]]._Bond__order = b
+                self.__dict__.pop('fingerprint', None)  # next patterns should be screened by actual structure
         if hs:
             if not neutralized:
-                self.flush_cache()
+                self.flush_cache('atoms', 'bonds')
             for n in hs:
                 self._calc_implicit(n)
             return True
@@ -90,7 +95,7 @@ class Standardize:
                 hs.add(n)
                 hs.update(x for _, x, _ in path)
         if hs:
-            self.flush_cache()
+            self.flush_cache('atoms', 'bonds')
             for n in hs:
                 self._calc_implicit(n)
                 self._calc_hybridization(n)
@@ -565,7 +570,7 @@ class StandardizeReaction:
             return True
 
         if total:
-            self.flush_cache()
+            self.flush_cache('atoms', 'bonds')
         return total
 
     def fix_mapping(self) -> bool:
@@ -573,13 +578,17 @@ class StandardizeReaction:
         Fix atom-to-atom mapping of some functional groups. Return True if found AAM errors
         """
         seen = set()
-        for r_pattern, p_pattern, fix in self._standardize_compiled_rules:
+        r_mappings = defaultdict(list)
+        for m in self.reactants:  # reactants not changed. match all patterns at once
+            for i, mapping in self._standardize_matcher.get_mapping(m, automorphism_filter=False):
+                r_mappings[i].append(mapping)
+
+        for i, (_, p_pattern, fix) in enumerate(self._standardize_compiled_rules):
             found = []
-            for m in self.reactants:
-                for mapping in r_pattern.get_mapping(m, automorphism_filter=False):
-                    if mapping[1] not in seen:
-                        found.append(({fix.get(k, k): v for k, v in mapping.items()},
-                                      {mapping[k]: mapping[v] for k, v in fix.items()}))
+            for mapping in r_mappings[i]:
+                if mapping[1] not in seen:
+                    found.append(({fix.get(k, k): v for k, v in mapping.items()},
+                                  {mapping[k]: mapping[v] for k, v in fix.items()}))
 
             if not found:
                 continue
@@ -21,6 +21,7 @@ from collections import defaultdict
 from itertools import combinations, product
 from logging import info
 from ..exceptions import AtomNotFound, NotChiral, IsChiral, ValenceError
+from ._cache import cache_depends
 
 
 def _pyramid_sign(n, u, v, w):
@@ -196,7 +197,7 @@ class MoleculeStereo(Stereo):
                     s = _pyramid_sign(order[-1], *order[:3])
             if s:
                 self._atoms_stereo[n] = s > 0
-                self.flush_cache()
+                self.flush_cache('stereo')
         else:  # only tetrahedrons supported
             raise NotChiral
 
@@ -219,10 +220,11 @@ class MoleculeStereo(Stereo):
                 mark = not mark
 
             self._atoms_stereo[n] = mark
-            self.flush_cache()
+            self.flush_cache('stereo')
         else:  # only tetrahedrons supported
             raise NotChiral
 
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def _tetrahedrons(self):
         #    2
@@ -258,6 +260,7 @@ class MoleculeStereo(Stereo):
                         failed_stereo[n] = s
                 stereo = failed_stereo
 
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def _chiral_atoms(self):
         morgan = self.atoms_order
@@ -286,6 +289,7 @@ class MoleculeStereo(Stereo):
 class QueryStereo(Stereo):
     __slots__ = ()
 
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def _tetrahedrons(self):
         #    2
@@ -310,6 +314,7 @@ class QueryStereo(Stereo):
 
 
 class NotUsed:
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def __cumulenes(self):
         # 5       4
@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
+from typing import Mapping, Optional
 
 
 class JupyterWidget:
@@ -36,32 +37,35 @@ class JupyterWidget:
 class X3dom:
     __slots__ = ()
 
-    def depict3d(self, index: int = 0) -> str:
+    def depict3d(self, index: int = 0, settings: Optional[Mapping] = None) -> str:
         """Get X3DOM XML string.
 
         :param index: index of conformer
+        :param settings: depict settings created by `depict_settings`. By default settings set by last call of
+            `depict_settings` used.
         """
+        config = self._render_config if settings is None else settings
         xyz = self._conformers[index]
         mx = sum(x for x, _, _ in xyz.values()) / len(xyz)
         my = sum(y for _, y, _ in xyz.values()) / len(xyz)
         mz = sum(z for _, _, z in xyz.values()) / len(xyz)
         xyz = {n: (x - mx, y - my, z - mz) for n, (x, y, z) in xyz.items()}
-        atoms = self.__render_atoms(xyz)
-        bonds = self._render_3d_bonds(xyz)
+        atoms = self.__render_atoms(xyz, config)
+        bonds = self._render_3d_bonds(xyz, config)
         return f'<x3d width=100% height=100%>\n  <scene>\n{atoms}{bonds}  </scene>\n</x3d>'
 
-    def view3d(self, index: int = 0, width='600px', height='400px'):
+    def view3d(self, index: int = 0, width='600px', height='400px', settings: Optional[Mapping] = None):
         """
         Jupyter widget for 3D visualization.
 
         :param index: index of conformer
         :param width: widget width
         :param height: widget height
+        :param settings: depict settings. see `depict3d`
         """
-        return JupyterWidget(self.depict3d(index), width, height)
+        return JupyterWidget(self.depict3d(index, settings), width, height)
 
-    def __render_atoms(self, xyz):
-        config = self._render_config
+    def __render_atoms(self, xyz, config):
         colors = config['atoms_colors']
         mapping_color = config['mapping_color']
         carbon = config['carbon']
@@ -104,16 +108,14 @@ class X3dom:
 class X3domMolecule(X3dom):
     __slots__ = ()
 
-    def _render_3d_bonds(self, xyz):
-        config = self._render_config
+    def _render_3d_bonds(self, xyz, config):
         return ''
 
 
 class X3domCGR(X3dom):
     __slots__ = ()
 
-    def _render_3d_bonds(self, xyz):
-        config = self._render_config
+    def _render_3d_bonds(self, xyz, config):
         return ''
 
 
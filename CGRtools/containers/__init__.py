@@ -24,6 +24,7 @@ from .cgr import *
 from .query import *
 from .cgr_query import *
 from .reaction import *
+from .frozen import *
 
 
 __all__ = [x for x in locals() if x.endswith('Container')]
@@ -19,10 +19,12 @@
 #
 from CachedMethods import cached_property
 from collections import defaultdict
+from struct import pack, unpack_from
 from typing import List, Union, Tuple, Dict, Optional
 from . import cgr_query as query, molecule  # cyclic imports resolve
 from .bonds import Bond, DynamicBond
 from .common import Graph
+from ..algorithms._cache import cache_depends
 from ..algorithms.calculate2d import Calculate2DCGR
 from ..algorithms.depict import DepictCGR
 from ..algorithms.smiles import CGRSmiles
@@ -32,6 +34,8 @@ from ..periodictable import DynamicElement, Element, DynamicQueryElement
 
 class CGRContainer(Graph, CGRSmiles, DepictCGR, Calculate2DCGR):
     __slots__ = ('_p_charges', '_p_radicals', '_neighbors', '_hybridizations', '_p_neighbors', '_p_hybridizations')
+    _pack_type = 2
+    _pack_elements = {x.atomic_number.fget(None): x for x in DynamicElement.__subclasses__()}
 
     def __init__(self):
         self._p_charges: Dict[int, int] = {}
@@ -139,6 +143,49 @@ class CGRContainer(Graph, CGRSmiles, DepictCGR, Calculate2DCGR):
                     elif sph[n] == 2:
                         sph[n] = 3
 
+    def _calc_query_marks(self, n: int):
+        """
+        calculate neighbors and hybridization of atom in both states
+        """
+        atoms = self._atoms
+        neighbors = p_neighbors = 0
+        hybridization = p_hybridization = 1
+        for m, bond in self._bonds[n].items():
+            if atoms[m].atomic_number == 1:  # ignore hydrogen
+                continue
+            order = bond.order
+            p_order = bond.p_order
+            if order:
+                neighbors += 1
+                if hybridization != 4:
+                    if order == 4:
+                        hybridization = 4
+                    elif order == 3:
+                        if hybridization != 3:
+                            hybridization = 3
+                    elif order == 2:
+                        if hybridization == 2:
+                            hybridization = 3
+                        elif hybridization == 1:
+                            hybridization = 2
+            if p_order:
+                p_neighbors += 1
+                if p_hybridization != 4:
+                    if p_order == 4:
+                        p_hybridization = 4
+                    elif p_order == 3:
+                        if p_hybridization != 3:
+                            p_hybridization = 3
+                    elif p_order == 2:
+                        if p_hybridization == 2:
+                            p_hybridization = 3
+                        elif p_hybridization == 1:
+                            p_hybridization = 2
+        self._neighbors[n] = neighbors
+        self._hybridizations[n] = hybridization
+        self._p_neighbors[n] = p_neighbors
+        self._p_hybridizations[n] = p_hybridization
+
     def delete_atom(self, n):
         del self._p_charges[n]
         del self._p_radicals[n]
@@ -623,6 +670,12 @@ class CGRContainer(Graph, CGRSmiles, DepictCGR, Calculate2DCGR):
             return super().get_mcs_mapping(other, **kwargs)
         raise TypeError('CGRContainer expected')
 
+    def get_mcs_clique_mapping(self, other: 'CGRContainer', **kwargs):
+        if isinstance(other, CGRContainer):
+            return super().get_mcs_clique_mapping(other, **kwargs)
+        raise TypeError('CGRContainer expected')
+
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def centers_list(self) -> Tuple[Tuple[int, ...], ...]:
         """ get a list of lists of atoms of reaction centers
@@ -654,6 +707,7 @@ class CGRContainer(Graph, CGRSmiles, DepictCGR, Calculate2DCGR):
                 out.append((n,))
         return tuple(out)
 
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def center_atoms(self) -> Tuple[int, ...]:
         """ get list of atoms of reaction center (atoms with dynamic: bonds, charges, radicals).
@@ -673,12 +727,14 @@ class CGRContainer(Graph, CGRSmiles, DepictCGR, Calculate2DCGR):
 
         return tuple(center)
 
+    @cache_depends('atoms', 'bonds')
     @cached_property
     def center_bonds(self) -> Tuple[Tuple[int, int], ...]:
         """ get list of bonds of reaction center (bonds with dynamic orders).
         """
         return tuple((n, m) for n, m, bond in self.bonds() if bond.order != bond.p_order)
 
+    @cache_depends('bonds')
     @cached_property
     def aromatic_rings(self) -> Tuple[Tuple[int, ...], ...]:
         """
@@ -723,6 +779,38 @@ class CGRContainer(Graph, CGRSmiles, DepictCGR, Calculate2DCGR):
         """
         return self.decompose()
 
+    def _pack_bonds(self, bonds):
+        return pack(f'<{len(bonds) * 2}B', *(x or 0 for b in bonds for x in (b.order, b.p_order)))
+
+    @classmethod
+    def _unpack_bonds(cls, data, offset, size):
+        orders = unpack_from(f'<{size * 2}B', data, offset)
+        bonds = []
+        for i in range(0, size * 2, 2):
+            bond = object.__new__(DynamicBond)
+            bond._DynamicBond__order = orders[i] or None
+            bond._DynamicBond__p_order = orders[i + 1] or None
+            bonds.append(bond)
+        return bonds, offset + size * 2
+
+    def _pack_atoms(self, numbers):
+        size = len(numbers)
+        return pack(f'<{size}b{size * 5}B', *(self._p_charges[n] for n in numbers),
+                    *(x[n] for x in (self._p_radicals, self._neighbors, self._hybridizations, self._p_neighbors,
+                                     self._p_hybridizations) for n in numbers))
+
+    def _unpack_atoms(self, data, offset, numbers):
+        size = len(numbers)
+        self._p_charges = dict(zip(numbers, unpack_from(f'<{size}b', data, offset)))
+        offset += size
+        values = unpack_from(f'<{size * 5}B', data, offset)
+        self._p_radicals = {n: bool(x) for n, x in zip(numbers, values)}
+        self._neighbors = dict(zip(numbers, values[size:]))
+        self._hybridizations = dict(zip(numbers, values[size * 2:]))
+        self._p_neighbors = dict(zip(numbers, values[size * 3:]))
+        self._p_hybridizations = dict(zip(numbers, values[size * 4:]))
+        return offset + size * 5
+
     def __getstate__(self):
         return {'p_charges': self._p_charges, 'p_radicals': self._p_radicals, **super().__getstate__()}
 
@@ -16,10 +16,11 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
+from struct import pack, unpack_from
 from typing import List, Union, Tuple, Dict
 from . import cgr, molecule, query  # cyclic imports resolve
 from .bonds import Bond, DynamicBond
-from .common import Graph
+from .common import Graph, pack_tuples, unpack_tuples
 from ..algorithms.calculate2d import Calculate2DCGR
 from ..algorithms.depict import DepictQueryCGR
 from ..algorithms.smiles import QueryCGRSmiles
@@ -28,6 +29,9 @@ from ..periodictable import Element, DynamicElement, QueryElement, DynamicQueryE
 
 class QueryCGRContainer(Graph, QueryCGRSmiles, DepictQueryCGR, Calculate2DCGR):
     __slots__ = ('_p_charges', '_p_radicals', '_neighbors', '_hybridizations', '_p_neighbors', '_p_hybridizations')
+    _pack_type = 4
+    _pack_elements = {0: DynamicAnyElement,
+                      **{x.atomic_number.fget(None): x for x in DynamicQueryElement.__subclasses__()}}
 
     def __init__(self):
         self._p_charges: Dict[int, int] = {}
@@ -275,6 +279,11 @@ class QueryCGRContainer(Graph, QueryCGRSmiles, DepictQueryCGR, Calculate2DCGR):
             return super().get_mcs_mapping(other, **kwargs)
         raise TypeError('CGRContainer or QueryCGRContainer expected')
 
+    def get_mcs_clique_mapping(self, other: Union['QueryCGRContainer', 'cgr.CGRContainer'], **kwargs):
+        if isinstance(other, (QueryCGRContainer, cgr.CGRContainer)):
+            return super().get_mcs_clique_mapping(other, **kwargs)
+        raise TypeError('CGRContainer or QueryCGRContainer expected')
+
     @staticmethod
     def _validate_neighbors(neighbors):
         if neighbors is None:
@@ -331,6 +340,43 @@ class QueryCGRContainer(Graph, QueryCGRSmiles, DepictQueryCGR, Calculate2DCGR):
             hybridization, p_hybridization = zip(*sorted(zip(hybridization, p_hybridization)))
         return hybridization, p_hybridization
 
+    def _pack_bonds(self, bonds):
+        return pack(f'<{len(bonds) * 2}B', *(x or 0 for b in bonds for x in (b.order, b.p_order)))
+
+    @classmethod
+    def _unpack_bonds(cls, data, offset, size):
+        orders = unpack_from(f'<{size * 2}B', data, offset)
+        bonds = []
+        for i in range(0, size * 2, 2):
+            bond = object.__new__(DynamicBond)
+            bond._DynamicBond__order = orders[i] or None
+            bond._DynamicBond__p_order = orders[i + 1] or None
+            bonds.append(bond)
+        return bonds, offset + size * 2
+
+    def _pack_atoms(self, numbers):
+        size = len(numbers)
+        return b''.join((pack(f'<{size}b{size}B', *(self._p_charges[n] for n in numbers),
+                              *(self._p_radicals[n] for n in numbers)),
+                         *(pack_tuples(x[n] for n in numbers) for x in (self._neighbors, self._hybridizations,
+                                                                        self._p_neighbors, self._p_hybridizations))))
+
+    def _unpack_atoms(self, data, offset, numbers):
+        size = len(numbers)
+        self._p_charges = dict(zip(numbers, unpack_from(f'<{size}b', data, offset)))
+        offset += size
+        self._p_radicals = {n: bool(x) for n, x in zip(numbers, unpack_from(f'<{size}B', data, offset))}
+        offset += size
+        values, offset = unpack_tuples(data, offset, size)
+        self._neighbors = dict(zip(numbers, values))
+        values, offset = unpack_tuples(data, offset, size)
+        self._hybridizations = dict(zip(numbers, values))
+        values, offset = unpack_tuples(data, offset, size)
+        self._p_neighbors = dict(zip(numbers, values))
+        values, offset = unpack_tuples(data, offset, size)
+        self._p_hybridizations = dict(zip(numbers, values))
+        return offset
+
     def __getstate__(self):
         return {'p_charges': self._p_charges, 'p_radicals': self._p_radicals, 'neighbors': self._neighbors,
                 'hybridizations': self._hybridizations, 'p_neighbors': self._p_neighbors,
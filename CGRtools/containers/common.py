@@ -18,9 +18,14 @@
 #
 from abc import ABC, abstractmethod
 from CachedMethods import cached_property, cached_args_method
+from pickle import dumps, loads
+from struct import Struct, pack, unpack_from
 from typing import Dict, Optional, Tuple, Iterable, Iterator, Union, List, Type
+from weakref import ref
 from .bonds import Bond, DynamicBond
+from ..algorithms._cache import cache_dependencies, cache_depends
 from ..algorithms.components import GraphComponents
+from ..algorithms.fingerprints import Fingerprints
 from ..algorithms.isomorphism import Isomorphism
 from ..algorithms.mcs import MCS
 from ..algorithms.morgan import Morgan
@@ -29,7 +34,73 @@ from ..exceptions import AtomNotFound
 from ..periodictable.element import Core
 
 
-class Graph(GraphComponents, Morgan, SSSR, Isomorphism, MCS, ABC):
+pack_magic = b'CGR'
+pack_version = 1
+# magic, format version, container type, flags, atoms count, adjacency entries count (twice bonds count)
+pack_header = Struct('<3sBBBII')
+pack_size = Struct('<I')
+packed_types = {}  # container type code: container class
+
+
+def pack_string(string: str) -> bytes:
+    string = string.encode()
+    return pack_size.pack(len(string)) + string
+
+
+def unpack_string(data: bytes, offset: int) -> Tuple[str, int]:
+    size, = pack_size.unpack_from(data, offset)
+    offset += 4
+    return data[offset: offset + size].decode(), offset + size
+
+
+def pack_meta(meta: Dict, name: str) -> Tuple[bool, bytes]:
+    """
+    Pack name and metadata. Flag is True if metadata contains not only strings and pickled.
+    """
+    name = pack_string(name)
+    if all(isinstance(k, str) and isinstance(v, str) for k, v in meta.items()):
+        return False, b''.join((name, pack_size.pack(len(meta)), *(pack_string(x) for kv in meta.items() for x in kv)))
+    meta = dumps(meta)
+    return True, b''.join((name, pack_size.pack(len(meta)), meta))
+
+
+def unpack_meta(data: bytes, offset: int, pickled: bool) -> Tuple[Dict, str, int]:
+    name, offset = unpack_string(data, offset)
+    size, = pack_size.unpack_from(data, offset)
+    offset += 4
+    if pickled:
+        return loads(data[offset: offset + size]), name, offset + size
+    meta = {}
+    for _ in range(size):
+        key, offset = unpack_string(data, offset)
+        meta[key], offset = unpack_string(data, offset)
+    return meta, name, offset
+
+
+def pack_tuples(values: Iterable[Tuple[int, ...]]) -> bytes:
+    """
+    Pack tuples of small ints as lengths array and flat values array.
+    """
+    values = list(values)
+    flat = [x for v in values for x in v]
+    return pack_size.pack(len(flat)) + pack(f'<{len(values)}B{len(flat)}B', *(len(v) for v in values), *flat)
+
+
+def unpack_tuples(data: bytes, offset: int, size: int) -> Tuple[List[Tuple[int, ...]], int]:
+    total, = pack_size.unpack_from(data, offset)
+    offset += 4
+    lengths = unpack_from(f'<{size}B', data, offset)
+    offset += size
+    flat = unpack_from(f'<{total}B', data, offset)
+    values = []
+    start = 0
+    for x in lengths:
+        values.append(flat[start: start + x])
+        start += x
+    return values, offset + total
+
+
+class Graph(GraphComponents, Morgan, SSSR, Fingerprints, Isomorphism, MCS, ABC):
     __slots__ = ('_atoms', '_bonds', '_plane', '_charges', '_radicals', '__meta', '__name', '_parsed_mapping',
                  '__dict__', '__weakref__')
 
@@ -63,6 +134,163 @@ class Graph(GraphComponents, Morgan, SSSR, Isomorphism, MCS, ABC):
         self.__meta = state['meta']
         self.__name = state.get('name', '')  # 4.0.9 compatibility
 
+    def __reduce__(self):
+        return self.__class__.unpack, (self.pack(),)
+
+    def pack(self) -> bytes:
+        """
+        Compact binary representation of graph.
+
+        Versioned format of flat arrays of atoms attributes, adjacency and optional 2d coordinates.
+        Metadata, name, stereo and parsed mapping included.
+        """
+        atoms = self._atoms
+        bonds = self._bonds
+        charges = self._charges
+        radicals = self._radicals
+        plane = self._plane
+        numbers = list(atoms)
+        index = {n: i for i, n in enumerate(numbers)}
+        size = len(numbers)
+
+        degrees = []
+        neighbors = []
+        entries = []
+        for n in numbers:
+            m_bond = bonds[n]
+            degrees.append(len(m_bond))
+            for m, bond in m_bond.items():
+                neighbors.append(index[m])
+                entries.append(bond)
+
+        flags = 0
+        if any(x or y for x, y in plane.values()):
+            flags |= 1
+        pickled, meta = pack_meta(self.__meta, self.__name)
+        if pickled:
+            flags |= 2
+        mapping = [x for kv in self._parsed_mapping.items() for x in kv]
+
+        data = [pack_header.pack(pack_magic, pack_version, self._pack_type, flags, size, len(neighbors)),
+                pack(f'<{size}I{size}B{size}H{size}b{size}B{size}H{len(neighbors)}I', *numbers,
+                     *(a.atomic_number for a in atoms.values()), *(a.isotope or 0 for a in atoms.values()),
+                     *(charges[n] for n in numbers), *(radicals[n] for n in numbers), *degrees, *neighbors),
+                self._pack_bonds(entries)]
+        if flags & 1:
+            data.append(pack(f'<{size * 2}d', *(x for n in numbers for x in plane[n])))
+        data.append(pack(f'<I{len(mapping)}I', len(mapping) // 2, *mapping))
+        data.append(self._pack_atoms(numbers))
+        data.append(meta)
+        return b''.join(data)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> 'Graph':
+        """
+        Restore graph from packed form. Graph class is taken from packed data if called from Graph.
+        """
+        magic, version, kind, flags, size, entries = pack_header.unpack_from(data)
+        if magic != pack_magic:
+            raise ValueError('packed container expected')
+        if version != pack_version:
+            raise ValueError(f'unsupported packed format version {version}')
+        if cls is Graph:
+            if not packed_types:
+                packed_types.update((x._pack_type, x) for x in Graph.__subclasses__())
+            cls = packed_types[kind]
+        elif kind != cls._pack_type:
+            raise TypeError(f'{cls.__name__} data expected')
+
+        self = object.__new__(cls)
+        offset = pack_header.size
+        numbers = unpack_from(f'<{size}I', data, offset)
+        offset += size * 4
+        elements = unpack_from(f'<{size}B', data, offset)
+        offset += size
+        isotopes = unpack_from(f'<{size}H', data, offset)
+        offset += size * 2
+        charges = unpack_from(f'<{size}b', data, offset)
+        offset += size
+        radicals = unpack_from(f'<{size}B', data, offset)
+        offset += size
+        degrees = unpack_from(f'<{size}H', data, offset)
+        offset += size * 2
+        neighbors = unpack_from(f'<{entries}I', data, offset)
+        offset += entries * 4
+        entries, offset = cls._unpack_bonds(data, offset, entries)
+
+        self._charges = dict(zip(numbers, charges))
+        self._radicals = {n: bool(x) for n, x in zip(numbers, radicals)}
+        if flags & 1:
+            xy = unpack_from(f'<{size * 2}d', data, offset)
+            offset += size * 16
+            self._plane = {n: (xy[i], xy[i + 1]) for i, n in zip(range(0, size * 2, 2), numbers)}
+        else:
+            self._plane = {n: (0., 0.) for n in numbers}
+
+        count, = pack_size.unpack_from(data, offset)
+        offset += 4
+        mapping = unpack_from(f'<{count * 2}I', data, offset)
+        offset += count * 8
+        self._parsed_mapping = dict(zip(mapping[::2], mapping[1::2]))
+
+        self._atoms = sa = {}
+        classes = cls._pack_elements
+        wr = ref(self)
+        for n, e, i in zip(numbers, elements, isotopes):
+            atom = object.__new__(classes[e])
+            atom._Core__isotope = i or None
+            atom._graph = wr
+            atom._map = n
+            sa[n] = atom
+
+        self._bonds = sb = {n: {} for n in numbers}
+        k = 0
+        for n, d in zip(numbers, degrees):
+            bn = sb[n]
+            for i in range(k, k + d):
+                m = numbers[neighbors[i]]
+                try:
+                    bn[m] = sb[m][n]
+                except KeyError:
+                    bn[m] = entries[i]
+            k += d
+
+        offset = self._unpack_atoms(data, offset, numbers)
+        self.__meta, self.__name, _ = unpack_meta(data, offset, flags & 2)
+        return self
+
+    @property
+    @abstractmethod
+    def _pack_type(self) -> int:
+        """
+        Code of container in packed format
+        """
+
+    @abstractmethod
+    def _pack_bonds(self, bonds: List[Union[Bond, DynamicBond]]) -> bytes:
+        """
+        Pack bonds of adjacency entries
+        """
+
+    @classmethod
+    @abstractmethod
+    def _unpack_bonds(cls, data: bytes, offset: int, size: int) -> Tuple[List[Union[Bond, DynamicBond]], int]:
+        """
+        Unpack bonds of adjacency entries. Returns bonds and offset of next block
+        """
+
+    @abstractmethod
+    def _pack_atoms(self, numbers: List[int]) -> bytes:
+        """
+        Pack container specific atoms attributes
+        """
+
+    @abstractmethod
+    def _unpack_atoms(self, data: bytes, offset: int, numbers: Tuple[int, ...]) -> int:
+        """
+        Unpack container specific atoms attributes. Returns offset of next block
+        """
+
     def __len__(self):
         return len(self._atoms)
 
@@ -87,14 +315,17 @@ class Graph(GraphComponents, Morgan, SSSR, Isomorphism, MCS, ABC):
         """
         return iter(self._atoms.items())
 
+    @cache_depends()
     @cached_property
     def atoms_count(self) -> int:
         return len(self._atoms)
 
+    @cache_depends()
     @cached_property
     def atoms_numbers(self) -> Tuple[int, ...]:
         return tuple(self._atoms)
 
+    @cache_depends('bonds')
     @cached_args_method
     def environment(self, atom: int) -> Tuple[Tuple[Union[Bond, DynamicBond], Core], ...]:
         """
@@ -126,6 +357,7 @@ class Graph(GraphComponents, Morgan, SSSR, Isomorphism, MCS, ABC):
                 if m not in seen:
                     yield n, m, bond
 
+    @cache_depends()
     @cached_property
     def bonds_count(self) -> int:
         return sum(len(x) for x in self._bonds.values()) // 2
@@ -422,8 +654,23 @@ class Graph(GraphComponents, Morgan, SSSR, Isomorphism, MCS, ABC):
         """
         return [self.substructure(c, meta=meta) for c in self.connected_components]
 
-    def flush_cache(self):
-        self.__dict__.clear()
+    def flush_cache(self, *changes: str):
+        """
+        Clear cached attributes.
+
+        :param changes: kinds of changed data: 'atoms', 'bonds', 'stereo' or 'coordinates'.
+            Only attributes depending on them cleared. Without arguments all attributes cleared.
+            Connectivity changes require full clearing.
+        """
+        cache = self.__dict__
+        if changes:
+            depends = cache_dependencies(self.__class__)
+            for name in list(cache):
+                d = depends.get(name)
+                if d is None or not d.isdisjoint(changes):
+                    del cache[name]
+        else:
+            cache.clear()
 
     @staticmethod
     def _validate_charge(charge):
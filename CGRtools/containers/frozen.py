@@ -0,0 +1,499 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from array import array
+from CachedMethods import cached_property
+from copyreg import __newobj__
+from collections.abc import ItemsView, Mapping, ValuesView
+from typing import Dict, Iterator, List, Optional, Tuple
+from weakref import ref
+from .bonds import Bond
+from .molecule import MoleculeContainer
+
+
+elements = MoleculeContainer._pack_elements
+
+
+class FrozenMoleculeContainer(MoleculeContainer):
+    """
+    Read-only compact molecule. Atoms attributes stored in typed arrays, bonds in CSR form with bond orders.
+    Read-only algorithms like atoms_order, sssr, connected_components, get_mapping work directly.
+    Atoms and bonds objects created on access.
+
+    For editing use `thaw` method, which returns MoleculeContainer. Copy, substructure and union also return
+    MoleculeContainer.
+    """
+    __slots__ = ('_numbers', '_elements', '_isotopes', '_charges_array', '_radicals_array', '_hydrogens_array',
+                 '_neighbors_array', '_hybridizations_array', '_plane_array', '_conformers_arrays',
+                 '_indptr', '_indices', '_orders')
+
+    def __init__(self, molecule: MoleculeContainer):
+        """
+        Compact copy of molecule.
+        """
+        if not isinstance(molecule, MoleculeContainer):
+            raise TypeError('MoleculeContainer expected')
+        if isinstance(molecule, FrozenMoleculeContainer):
+            molecule = molecule.thaw()
+
+        atoms = molecule._atoms
+        bonds = molecule._bonds
+        charges = molecule._charges
+        radicals = molecule._radicals
+        plane = molecule._plane
+        hydrogens = molecule._hydrogens
+        neighbors = molecule._neighbors
+        hybridizations = molecule._hybridizations
+        index = {n: i for i, n in enumerate(atoms)}
+
+        self._numbers = array('L', atoms)
+        self._elements = array('B', [a.atomic_number for a in atoms.values()])
+        self._isotopes = array('H', [a.isotope or 0 for a in atoms.values()])
+        self._charges_array = array('b', [charges[n] for n in atoms])
+        self._radicals_array = array('B', [radicals[n] for n in atoms])
+        self._hydrogens_array = array('b', [-1 if hydrogens[n] is None else hydrogens[n] for n in atoms])
+        self._neighbors_array = array('B', [neighbors[n] for n in atoms])
+        self._hybridizations_array = array('B', [hybridizations[n] for n in atoms])
+        self._plane_array = array('d', [x for n in atoms for x in plane[n]])
+        self._conformers_arrays = tuple(array('d', [x for n in atoms for x in c[n]]) for c in molecule._conformers)
+
+        indptr = [0]
+        indices = []
+        orders = []
+        for n in atoms:
+            for m, bond in bonds[n].items():
+                indices.append(index[m])
+                orders.append(bond.order)
+            indptr.append(len(indices))
+        self._indptr = array('L', indptr)
+        self._indices = array('L', indices)
+        self._orders = array('B', orders)
+
+        self._atoms_stereo = molecule._atoms_stereo.copy()
+        self._parsed_mapping = molecule._parsed_mapping.copy()
+        self._Graph__meta = molecule.meta.copy()
+        self._Graph__name = molecule.name
+
+    def thaw(self, *, meta: bool = True) -> MoleculeContainer:
+        """
+        Editable copy of molecule.
+
+        :param meta: include metadata
+        """
+        copy = object.__new__(MoleculeContainer)
+        if meta:
+            copy._Graph__meta = self.meta.copy()
+            copy._Graph__name = self.name
+        else:
+            copy._Graph__meta = {}
+            copy._Graph__name = ''
+
+        numbers = self._numbers
+        copy._charges = dict(zip(numbers, self._charges_array))
+        copy._radicals = {n: bool(x) for n, x in zip(numbers, self._radicals_array)}
+        copy._hydrogens = {n: None if x == -1 else x for n, x in zip(numbers, self._hydrogens_array)}
+        copy._neighbors = dict(zip(numbers, self._neighbors_array))
+        copy._hybridizations = dict(zip(numbers, self._hybridizations_array))
+        copy._plane = self.__pairs(self._plane_array, 2)
+        copy._conformers = [self.__pairs(c, 3) for c in self._conformers_arrays]
+        copy._atoms_stereo = self._atoms_stereo.copy()
+        copy._parsed_mapping = self._parsed_mapping.copy()
+
+        copy._atoms = ca = {}
+        for n, z, isotope in zip(numbers, self._elements, self._isotopes):
+            atom = object.__new__(elements[z])
+            atom._Core__isotope = isotope or None
+            ca[n] = atom
+            atom._attach_to_graph(copy, n)
+
+        indptr = self._indptr
+        indices = self._indices
+        orders = self._orders
+        copy._bonds = cb = {n: {} for n in numbers}
+        for i, n in enumerate(numbers):
+            bn = cb[n]
+            for k in range(indptr[i], indptr[i + 1]):
+                m = numbers[indices[k]]
+                try:
+                    bn[m] = cb[m][n]
+                except KeyError:
+                    bond = bn[m] = object.__new__(Bond)
+                    bond._Bond__order = orders[k]
+        return copy
+
+    def freeze(self) -> 'FrozenMoleculeContainer':
+        return self
+
+    def copy(self, **kwargs) -> MoleculeContainer:
+        return self.thaw(**kwargs)
+
+    def substructure(self, atoms, **kwargs):
+        return self.thaw().substructure(atoms, **kwargs)
+
+    def union(self, other, **kwargs):
+        return self.thaw().union(other, **kwargs)
+
+    def remap(self, mapping, *, copy=False) -> MoleculeContainer:
+        if not copy:
+            raise TypeError('frozen molecule can be remapped only with copy')
+        return self.thaw().remap(mapping)
+
+    def add_atom(self, *args, **kwargs):
+        raise TypeError('frozen molecule is immutable')
+
+    def add_bond(self, *args, **kwargs):
+        raise TypeError('frozen molecule is immutable')
+
+    def delete_atom(self, n):
+        raise TypeError('frozen molecule is immutable')
+
+    def delete_bond(self, n, m):
+        raise TypeError('frozen molecule is immutable')
+
+    def add_atom_stereo(self, *args, **kwargs):
+        raise TypeError('frozen molecule is immutable')
+
+    def add_wedge(self, *args, **kwargs):
+        raise TypeError('frozen molecule is immutable')
+
+    def standardize(self) -> bool:
+        raise TypeError('frozen molecule is immutable')
+
+    def neutralize(self) -> bool:
+        raise TypeError('frozen molecule is immutable')
+
+    def thiele(self) -> bool:
+        raise TypeError('frozen molecule is immutable')
+
+    def kekule(self) -> bool:
+        raise TypeError('frozen molecule is immutable')
+
+    def implicify_hydrogens(self) -> int:
+        raise TypeError('frozen molecule is immutable')
+
+    def explicify_hydrogens(self) -> int:
+        raise TypeError('frozen molecule is immutable')
+
+    def clean2d(self):
+        raise TypeError('frozen molecule is immutable')
+
+    def __len__(self):
+        return len(self._numbers)
+
+    def __iter__(self):
+        return iter(self._numbers)
+
+    def __contains__(self, n: int):
+        return self._index(n) is not None
+
+    def __bool__(self):
+        return bool(self._numbers)
+
+    @property
+    def _atoms(self) -> Mapping:
+        return AtomsView(self)
+
+    @property
+    def _bonds(self) -> Mapping:
+        return AdjacencyView(self)
+
+    @property
+    def _charges(self) -> Mapping:
+        return ArrayView(self, self._charges_array)
+
+    @property
+    def _radicals(self) -> Mapping:
+        return ArrayView(self, self._radicals_array, bool)
+
+    @property
+    def _hydrogens(self) -> Mapping:
+        return ArrayView(self, self._hydrogens_array, none_hydrogens)
+
+    @property
+    def _neighbors(self) -> Mapping:
+        return ArrayView(self, self._neighbors_array)
+
+    @property
+    def _hybridizations(self) -> Mapping:
+        return ArrayView(self, self._hybridizations_array)
+
+    @property
+    def _plane(self) -> Mapping:
+        return PointsView(self, self._plane_array, 2)
+
+    @property
+    def _conformers(self) -> List[Mapping]:
+        return [PointsView(self, c, 3) for c in self._conformers_arrays]
+
+    def _index(self, n: int) -> Optional[int]:
+        """
+        Position of atom in arrays. None for not existing atoms.
+        """
+        numbers = self._numbers
+        i = n - 1
+        if 0 <= i < len(numbers) and numbers[i] == n:  # atoms numbered from one
+            return i
+        return self.__positions.get(n)
+
+    @cached_property
+    def __positions(self) -> Dict[int, int]:
+        return {n: i for i, n in enumerate(self._numbers)}
+
+    def __pairs(self, values: array, size: int) -> Dict[int, Tuple[float, ...]]:
+        return {n: tuple(values[i: i + size]) for n, i in zip(self._numbers, range(0, len(values), size))}
+
+    def __reduce__(self):
+        return __newobj__, (self.__class__,), self.__getstate__()
+
+    @classmethod
+    def unpack(cls, data: bytes) -> 'FrozenMoleculeContainer':
+        return cls(MoleculeContainer.unpack(data))
+
+    def __getstate__(self):
+        return {'numbers': self._numbers, 'elements': self._elements, 'isotopes': self._isotopes,
+                'charges': self._charges_array, 'radicals': self._radicals_array,
+                'hydrogens': self._hydrogens_array, 'neighbors': self._neighbors_array,
+                'hybridizations': self._hybridizations_array, 'plane': self._plane_array,
+                'conformers': self._conformers_arrays, 'indptr': self._indptr, 'indices': self._indices,
+                'orders': self._orders, 'atoms_stereo': self._atoms_stereo, 'parsed_mapping': self._parsed_mapping,
+                'meta': self.meta, 'name': self.name}
+
+    def __setstate__(self, state):
+        self._numbers = state['numbers']
+        self._elements = state['elements']
+        self._isotopes = state['isotopes']
+        self._charges_array = state['charges']
+        self._radicals_array = state['radicals']
+        self._hydrogens_array = state['hydrogens']
+        self._neighbors_array = state['neighbors']
+        self._hybridizations_array = state['hybridizations']
+        self._plane_array = state['plane']
+        self._conformers_arrays = state['conformers']
+        self._indptr = state['indptr']
+        self._indices = state['indices']
+        self._orders = state['orders']
+        self._atoms_stereo = state['atoms_stereo']
+        self._parsed_mapping = state['parsed_mapping']
+        self._Graph__meta = state['meta']
+        self._Graph__name = state['name']
+
+
+def none_hydrogens(x):
+    return None if x == -1 else x
+
+
+class View(Mapping):
+    """
+    Read-only mapping with fast items and values iteration.
+    """
+    __slots__ = ()
+
+    def items(self) -> ItemsView:
+        return Items(self)
+
+    def values(self) -> ValuesView:
+        return Values(self)
+
+    def _iter_items(self) -> Iterator:
+        raise NotImplementedError
+
+    def _iter_values(self) -> Iterator:
+        raise NotImplementedError
+
+
+class Items(ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class Values(ValuesView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return self._mapping._iter_values()
+
+
+class ArrayView(View):
+    """
+    Read-only atoms attribute mapping over array.
+    """
+    __slots__ = ('_graph', '_values', '_cast')
+
+    def __init__(self, graph: FrozenMoleculeContainer, values: array, cast=None):
+        self._graph = graph
+        self._values = values
+        self._cast = cast
+
+    def __getitem__(self, n):
+        i = self._graph._index(n)
+        if i is None:
+            raise KeyError(n)
+        if self._cast is None:
+            return self._values[i]
+        return self._cast(self._values[i])
+
+    def __iter__(self):
+        return iter(self._graph._numbers)
+
+    def __len__(self):
+        return len(self._graph._numbers)
+
+    def __contains__(self, n):
+        return self._graph._index(n) is not None
+
+    def _iter_items(self) -> Iterator:
+        cast = self._cast
+        if cast is None:
+            return zip(self._graph._numbers, self._values)
+        return zip(self._graph._numbers, map(cast, self._values))
+
+    def _iter_values(self) -> Iterator:
+        if self._cast is None:
+            return iter(self._values)
+        return map(self._cast, self._values)
+
+
+class PointsView(ArrayView):
+    """
+    Read-only atoms coordinates mapping over flat array.
+    """
+    __slots__ = ('_size',)
+
+    def __init__(self, graph: FrozenMoleculeContainer, values: array, size: int):
+        super().__init__(graph, values)
+        self._size = size
+
+    def __getitem__(self, n):
+        i = self._graph._index(n)
+        if i is None:
+            raise KeyError(n)
+        size = self._size
+        i *= size
+        return tuple(self._values[i: i + size])
+
+    def _iter_items(self) -> Iterator:
+        return zip(self._graph._numbers, self.values())
+
+    def _iter_values(self) -> Iterator:
+        values = self._values
+        size = self._size
+        return (tuple(values[i: i + size]) for i in range(0, len(values), size))
+
+
+class AtomsView(ArrayView):
+    """
+    Read-only atoms mapping. Elements objects attached to frozen molecule created on access.
+    """
+    __slots__ = ()
+
+    def __init__(self, graph: FrozenMoleculeContainer):
+        super().__init__(graph, graph._elements)
+
+    def __getitem__(self, n):
+        i = self._graph._index(n)
+        if i is None:
+            raise KeyError(n)
+        return self._atom(n, i)
+
+    def _iter_items(self) -> Iterator:
+        return ((n, self._atom(n, i)) for i, n in enumerate(self._graph._numbers))
+
+    def _iter_values(self) -> Iterator:
+        return (self._atom(n, i) for i, n in enumerate(self._graph._numbers))
+
+    def _atom(self, n, i):
+        graph = self._graph
+        atom = object.__new__(elements[self._values[i]])
+        atom._Core__isotope = graph._isotopes[i] or None
+        atom._graph = ref(graph)
+        atom._map = n
+        return atom
+
+
+class AdjacencyView(ArrayView):
+    """
+    Read-only bonds mapping over CSR arrays.
+    """
+    __slots__ = ()
+
+    def __init__(self, graph: FrozenMoleculeContainer):
+        super().__init__(graph, graph._indptr)
+
+    def __getitem__(self, n):
+        i = self._graph._index(n)
+        if i is None:
+            raise KeyError(n)
+        return BondsView(self._graph, i)
+
+    def _iter_items(self) -> Iterator:
+        graph = self._graph
+        return ((n, BondsView(graph, i)) for i, n in enumerate(graph._numbers))
+
+    def _iter_values(self) -> Iterator:
+        graph = self._graph
+        return (BondsView(graph, i) for i in range(len(graph._numbers)))
+
+
+class BondsView(View):
+    """
+    Read-only bonds of atom. Bonds objects created on access.
+    """
+    __slots__ = ('_graph', '_start', '_end')
+
+    def __init__(self, graph: FrozenMoleculeContainer, i: int):
+        self._graph = graph
+        self._start = graph._indptr[i]
+        self._end = graph._indptr[i + 1]
+
+    def __getitem__(self, m):
+        graph = self._graph
+        numbers = graph._numbers
+        indices = graph._indices
+        for k in range(self._start, self._end):
+            if numbers[indices[k]] == m:
+                return self._bond(k)
+        raise KeyError(m)
+
+    def __iter__(self):
+        numbers = self._graph._numbers
+        return (numbers[i] for i in self._graph._indices[self._start: self._end])
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __contains__(self, m):
+        numbers = self._graph._numbers
+        return any(numbers[i] == m for i in self._graph._indices[self._start: self._end])
+
+    def _iter_items(self) -> Iterator:
+        numbers = self._graph._numbers
+        indices = self._graph._indices
+        return ((numbers[indices[k]], self._bond(k)) for k in range(self._start, self._end))
+
+    def _iter_values(self) -> Iterator:
+        return (self._bond(k) for k in range(self._start, self._end))
+
+    def _bond(self, k):
+        bond = object.__new__(Bond)
+        bond._Bond__order = self._graph._orders[k]
+        return bond
+
+
+__all__ = ['FrozenMoleculeContainer']
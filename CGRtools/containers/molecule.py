@@ -18,26 +18,31 @@
 #
 from CachedMethods import cached_args_method, cached_property, class_cached_property
 from collections import defaultdict
+from struct import pack, unpack_from
 from typing import List, Union, Tuple, Optional, Dict
 from . import cgr, query  # cyclic imports resolve
 from .bonds import Bond, DynamicBond
 from .common import Graph
+from ..algorithms._cache import cache_depends
 from ..algorithms.aromatics import Aromatize
 from ..algorithms.calculate2d import Calculate2DMolecule
 from ..algorithms.components import StructureComponents
 from ..algorithms.depict import DepictMolecule
+from ..algorithms.isomorphism import QueryMatcher
 from ..algorithms.smiles import MoleculeSmiles
 from ..algorithms.standardize import Standardize
 from ..algorithms.stereo import MoleculeStereo
 from ..algorithms.x3dom import X3domMolecule
 from ..exceptions import ValenceError, MappingError
-from ..periodictable import Element, QueryElement
+from ..periodictable import DynamicElement, Element, QueryElement
 
 
 class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeSmiles, StructureComponents,
                         DepictMolecule, Calculate2DMolecule, X3domMolecule):
     __slots__ = ('_conformers', '_neighbors', '_hybridizations', '_atoms_stereo', '_hydrogens')
     __class_cache__ = {}
+    _pack_type = 1
+    _pack_elements = {x.atomic_number.fget(None): x for x in Element.__subclasses__()}
 
     def __init__(self):
         self._conformers: List[Dict[int, Tuple[float, float, float]]] = []
@@ -182,6 +187,13 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
         copy._atoms_stereo = self._atoms_stereo.copy()
         return copy
 
+    def freeze(self) -> 'frozen.FrozenMoleculeContainer':
+        """
+        Read-only compact copy of molecule.
+        """
+        from .frozen import FrozenMoleculeContainer  # cyclic import
+        return FrozenMoleculeContainer(self)
+
     def substructure(self, atoms, *, as_query: bool = False, **kwargs) -> Union['MoleculeContainer',
                                                                                 'query.QueryContainer']:
         """
@@ -284,9 +296,10 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
             common = sa.keys() & other
             h = cgr.CGRContainer()
             atoms = h._atoms
+            add_atom = self.__cgr_atom_adder(h)
 
             for n in sa.keys() - common:  # cleavage atoms
-                h.add_atom(sa[n], n, charge=sc[n], is_radical=sr[n], xy=sp[n], p_charge=sc[n], p_is_radical=sr[n])
+                add_atom(sa[n], n, sc[n], sr[n], sp[n], sc[n], sr[n])
                 for m, bond in sb[n].items():
                     if m not in atoms:
                         if m in common:  # bond to common atoms is broken bond
@@ -295,7 +308,7 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
                             bond._DynamicBond__order, bond._DynamicBond__p_order = order, None
                         bonds.append((n, m, bond))
             for n in other._atoms.keys() - common:  # coupling atoms
-                h.add_atom(oa[n], n, charge=oc[n], is_radical=or_[n], xy=op[n], p_charge=oc[n], p_is_radical=or_[n])
+                add_atom(oa[n], n, oc[n], or_[n], op[n], oc[n], or_[n])
                 for m, bond in ob[n].items():
                     if m not in atoms:
                         if m in common:  # bond to common atoms is formed bond
@@ -315,7 +328,7 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
                 san = sa[n]
                 if san.atomic_number != oa[n].atomic_number or san.isotope != oa[n].isotope:
                     raise MappingError(f'atoms with number {{{n}}} not equal')
-                h.add_atom(san, n, charge=sc[n], is_radical=sr[n], xy=sp[n], p_charge=oc[n], p_is_radical=or_[n])
+                add_atom(san, n, sc[n], sr[n], sp[n], oc[n], or_[n])
                 for m, (o1, o2) in adj[n].items():
                     if m not in atoms:
                         bond = object.__new__(DynamicBond)
@@ -332,9 +345,10 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
             common = sa.keys() & other
             h = other.__class__()  # subclasses support
             atoms = h._atoms
+            add_atom = self.__cgr_atom_adder(h)
 
             for n in sa.keys() - common:  # cleavage atoms
-                h.add_atom(sa[n], n, charge=sc[n], is_radical=sr[n], xy=sp[n], p_charge=sc[n], p_is_radical=sr[n])
+                add_atom(sa[n], n, sc[n], sr[n], sp[n], sc[n], sr[n])
                 for m, bond in sb[n].items():
                     if m not in atoms:
                         if m in common:  # bond to common atoms is broken bond
@@ -343,8 +357,7 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
                             bond._DynamicBond__order, bond._DynamicBond__p_order = order, None
                         bonds.append((n, m, bond))
             for n in other._atoms.keys() - common:  # coupling atoms
-                h.add_atom(oa[n].copy(), n, charge=oc[n], is_radical=or_[n], xy=op[n], p_charge=opc[n],
-                           p_is_radical=opr[n])
+                add_atom(oa[n].copy(), n, oc[n], or_[n], op[n], opc[n], opr[n])
                 for m, bond in ob[n].items():
                     if m not in atoms:
                         if m in common:  # bond to common atoms is formed bond
@@ -368,7 +381,7 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
                 san = sa[n]
                 if san.atomic_number != oa[n].atomic_number or san.isotope != oa[n].isotope:
                     raise MappingError(f'atoms with number {{{n}}} not equal')
-                h.add_atom(san, n, charge=sc[n], is_radical=sr[n], xy=sp[n], p_charge=opc[n], p_is_radical=opr[n])
+                add_atom(san, n, sc[n], sr[n], sp[n], opc[n], opr[n])
                 for m, (o1, o2) in adj[n].items():
                     if m not in atoms:
                         bond = object.__new__(DynamicBond)
@@ -377,10 +390,44 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
         else:
             raise TypeError('MoleculeContainer or CGRContainer expected')
 
+        hb = h._bonds
         for n, m, bond in bonds:
-            h.add_bond(n, m, bond)
+            if not isinstance(bond, DynamicBond):
+                order = bond.order
+                bond = object.__new__(DynamicBond)
+                bond._DynamicBond__order = bond._DynamicBond__p_order = order
+            hb[n][m] = hb[m][n] = bond
+        for n in atoms:
+            h._calc_query_marks(n)
         return h
 
+    @staticmethod
+    def __cgr_atom_adder(h):
+        """
+        atoms adder to CGR storage without validation and query marks calculation
+        """
+        atoms = h._atoms
+        charges = h._charges
+        radicals = h._radicals
+        p_charges = h._p_charges
+        p_radicals = h._p_radicals
+        plane = h._plane
+        bonds = h._bonds
+        elements = h._pack_elements
+
+        def add_atom(atom, n, charge, is_radical, xy, p_charge, p_is_radical):
+            if not isinstance(atom, DynamicElement):
+                atom = elements[atom.atomic_number](atom.isotope)
+            atoms[n] = atom
+            atom._attach_to_graph(h, n)
+            charges[n] = charge
+            radicals[n] = is_radical
+            p_charges[n] = p_charge
+            p_radicals[n] = p_is_radical
+            plane[n] = xy
+            bonds[n] = {}
+        return add_atom
+
     def __xor__(self, other):
         """
         G ^ H is CGR generation
@@ -397,6 +444,11 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
             return super().get_mcs_mapping(other, **kwargs)
         raise TypeError('MoleculeContainer expected')
 
+    def get_mcs_clique_mapping(self, other: 'MoleculeContainer', **kwargs):
+        if isinstance(other, MoleculeContainer):
+            return super().get_mcs_clique_mapping(other, **kwargs)
+        raise TypeError('MoleculeContainer expected')
+
     def implicify_hydrogens(self) -> int:
         """
         remove explicit hydrogen if possible
@@ -489,6 +541,7 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
                             break
         return list(errors)
 
+    @cache_depends('atoms')
     @cached_property
     def molecular_charge(self):
         """
@@ -502,6 +555,7 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
         """
         return self.molecular_charge
 
+    @cache_depends('atoms')
     @cached_property
     def molecular_mass(self):
         return sum(x.atomic_mass for x in self._atoms.values())
@@ -509,6 +563,7 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
     def __float__(self):
         return self.molecular_mass
 
+    @cache_depends('atoms')
     @cached_args_method
     def _explicit_hydrogens(self, n: int) -> int:
         """
@@ -519,6 +574,7 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
         atoms = self._atoms
         return sum(atoms[m].atomic_number == 1 for m in self._bonds[n])
 
+    @cache_depends('atoms', 'bonds')
     @cached_args_method
     def _total_hydrogens(self, n: int) -> int:
         return self._hydrogens[n] + self._explicit_hydrogens(n)
@@ -584,6 +640,63 @@ class MoleculeContainer(MoleculeStereo, Graph, Aromatize, Standardize, MoleculeS
             rules.append((q, atom_fix, bonds_fix))
         return rules
 
+    @class_cached_property
+    def _standardize_matcher(self):
+        return QueryMatcher([q for q, *_ in self._standardize_compiled_rules])
+
+    def _pack_bonds(self, bonds):
+        return pack(f'<{len(bonds)}B', *(b.order for b in bonds))
+
+    @classmethod
+    def _unpack_bonds(cls, data, offset, size):
+        bonds = []
+        for order in unpack_from(f'<{size}B', data, offset):
+            bond = object.__new__(Bond)
+            bond._Bond__order = order
+            bonds.append(bond)
+        return bonds, offset + size
+
+    def _pack_atoms(self, numbers):
+        hydrogens = self._hydrogens
+        neighbors = self._neighbors
+        hybridizations = self._hybridizations
+        stereo = self._atoms_stereo
+        conformers = self._conformers
+        size = len(numbers)
+        count = len(stereo)
+        data = [pack(f'<{size}b{size}B{size}BI{count}I{count}?I',
+                     *(-1 if hydrogens[n] is None else hydrogens[n] for n in numbers),
+                     *(neighbors[n] for n in numbers), *(hybridizations[n] for n in numbers),
+                     count, *stereo, *stereo.values(), len(conformers))]
+        for c in conformers:
+            data.append(pack(f'<{size * 3}d', *(x for n in numbers for x in c[n])))
+        return b''.join(data)
+
+    def _unpack_atoms(self, data, offset, numbers):
+        size = len(numbers)
+        hydrogens = unpack_from(f'<{size}b', data, offset)
+        offset += size
+        self._hydrogens = {n: None if h == -1 else h for n, h in zip(numbers, hydrogens)}
+        self._neighbors = dict(zip(numbers, unpack_from(f'<{size}B', data, offset)))
+        offset += size
+        self._hybridizations = dict(zip(numbers, unpack_from(f'<{size}B', data, offset)))
+        offset += size
+
+        count, = unpack_from('<I', data, offset)
+        offset += 4
+        stereo = unpack_from(f'<{count}I{count}?', data, offset)
+        offset += count * 5
+        self._atoms_stereo = dict(zip(stereo[:count], stereo[count:]))
+
+        count, = unpack_from('<I', data, offset)
+        offset += 4
+        self._conformers = conformers = []
+        for _ in range(count):
+            xyz = unpack_from(f'<{size * 3}d', data, offset)
+            offset += size * 24
+            conformers.append({n: xyz[i: i + 3] for i, n in zip(range(0, size * 3, 3), numbers)})
+        return offset
+
     def __getstate__(self):
         return {'conformers': self._conformers, 'atoms_stereo': self._atoms_stereo, **super().__getstate__()}
 
@@ -16,10 +16,11 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
+from struct import pack, unpack_from
 from typing import List, Tuple, Union, Dict
 from . import cgr, molecule  # cyclic imports resolve
 from .bonds import Bond
-from .common import Graph
+from .common import Graph, pack_tuples, unpack_tuples
 from ..algorithms.calculate2d import Calculate2DMolecule
 from ..algorithms.components import StructureComponents
 from ..algorithms.depict import DepictQuery
@@ -30,6 +31,8 @@ from ..periodictable import Element, QueryElement, AnyElement
 
 class QueryContainer(QueryStereo, Graph, QuerySmiles, StructureComponents, DepictQuery, Calculate2DMolecule):
     __slots__ = ('_neighbors', '_hybridizations', '_atoms_stereo')
+    _pack_type = 3
+    _pack_elements = {0: AnyElement, **{x.atomic_number.fget(None): x for x in QueryElement.__subclasses__()}}
 
     def __init__(self):
         self._neighbors: Dict[int, Tuple[int, ...]] = {}
@@ -220,6 +223,11 @@ class QueryContainer(QueryStereo, Graph, QuerySmiles, StructureComponents, Depic
             return super().get_mcs_mapping(other, **kwargs)
         raise TypeError('MoleculeContainer or QueryContainer expected')
 
+    def get_mcs_clique_mapping(self, other: Union['QueryContainer', 'molecule.MoleculeContainer'], **kwargs):
+        if isinstance(other, (QueryContainer, molecule.MoleculeContainer)):
+            return super().get_mcs_clique_mapping(other, **kwargs)
+        raise TypeError('MoleculeContainer or QueryContainer expected')
+
     @staticmethod
     def _validate_neighbors(neighbors):
         if neighbors is None:
@@ -260,6 +268,37 @@ class QueryContainer(QueryStereo, Graph, QuerySmiles, StructureComponents, Depic
             raise TypeError('hybridization should be int or list or tuple of ints')
         return hybridization
 
+    def _pack_bonds(self, bonds):
+        return pack(f'<{len(bonds)}B', *(b.order for b in bonds))
+
+    @classmethod
+    def _unpack_bonds(cls, data, offset, size):
+        bonds = []
+        for order in unpack_from(f'<{size}B', data, offset):
+            bond = object.__new__(Bond)
+            bond._Bond__order = order
+            bonds.append(bond)
+        return bonds, offset + size
+
+    def _pack_atoms(self, numbers):
+        stereo = self._atoms_stereo
+        count = len(stereo)
+        return b''.join((pack_tuples(self._neighbors[n] for n in numbers),
+                         pack_tuples(self._hybridizations[n] for n in numbers),
+                         pack(f'<I{count}I{count}?', count, *stereo, *stereo.values())))
+
+    def _unpack_atoms(self, data, offset, numbers):
+        size = len(numbers)
+        neighbors, offset = unpack_tuples(data, offset, size)
+        self._neighbors = dict(zip(numbers, neighbors))
+        hybridizations, offset = unpack_tuples(data, offset, size)
+        self._hybridizations = dict(zip(numbers, hybridizations))
+        count, = unpack_from('<I', data, offset)
+        offset += 4
+        stereo = unpack_from(f'<{count}I{count}?', data, offset)
+        self._atoms_stereo = dict(zip(stereo[:count], stereo[count:]))
+        return offset + count * 5
+
     def __getstate__(self):
         return {'atoms_stereo': self._atoms_stereo, 'neighbors': self._neighbors,
                 'hybridizations': self._hybridizations, **super().__getstate__()}
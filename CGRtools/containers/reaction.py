@@ -16,21 +16,27 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
-from CachedMethods import cached_method, class_cached_property
+from CachedMethods import cached_args_method, cached_method, cached_property, class_cached_property
 from collections.abc import Iterable
 from itertools import chain
 from functools import reduce
-from hashlib import sha512
+from hashlib import blake2b, sha512
 from operator import or_
+from struct import Struct
 from typing import Tuple, Dict, Iterable as TIterable, Optional, Iterator
 from .cgr import CGRContainer
-from .common import Graph
+from .common import Graph, pack_magic, pack_meta, pack_size, pack_version, unpack_meta
 from .molecule import MoleculeContainer
 from .query import QueryContainer
 from ..algorithms.depict import DepictReaction
+from ..algorithms.isomorphism import QueryMatcher
 from ..algorithms.standardize import StandardizeReaction
 
 
+# magic, format version, container type, flags, reactants, products and reagents counts
+pack_header = Struct('<3sBBBIII')
+
+
 class ReactionContainer(StandardizeReaction, DepictReaction):
     """
     reaction storage. contains reactants, products and reagents lists.
@@ -107,6 +113,55 @@ class ReactionContainer(StandardizeReaction, DepictReaction):
             return self.__name
         raise KeyError('invalid attribute')
 
+    def __reduce__(self):
+        return self.__class__.unpack, (self.pack(),)
+
+    def pack(self) -> bytes:
+        """
+        Compact binary representation of reaction. Molecules packed by Graph.pack.
+        """
+        pickled, meta = pack_meta(self.__meta, self.__name)
+        data = [pack_header.pack(pack_magic, pack_version, 5, pickled, len(self.__reactants), len(self.__products),
+                                 len(self.__reagents))]
+        for m in chain(self.__reactants, self.__products, self.__reagents):
+            m = m.pack()
+            data.append(pack_size.pack(len(m)))
+            data.append(m)
+        data.append(meta)
+        return b''.join(data)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> 'ReactionContainer':
+        """
+        Restore reaction from packed form.
+        """
+        magic, version, kind, pickled, *sizes = pack_header.unpack_from(data)
+        if magic != pack_magic:
+            raise ValueError('packed container expected')
+        if version != pack_version:
+            raise ValueError(f'unsupported packed format version {version}')
+        if kind != 5:
+            raise TypeError('ReactionContainer data expected')
+
+        offset = pack_header.size
+        molecules = []
+        for size in sizes:
+            group = []
+            for _ in range(size):
+                length, = pack_size.unpack_from(data, offset)
+                offset += 4
+                group.append(Graph.unpack(data[offset: offset + length]))
+                offset += length
+            molecules.append(tuple(group))
+
+        reaction = object.__new__(cls)
+        reaction._ReactionContainer__reactants, reaction._ReactionContainer__products, \
+            reaction._ReactionContainer__reagents = molecules
+        reaction._ReactionContainer__meta, reaction._ReactionContainer__name, _ = unpack_meta(data, offset, pickled)
+        reaction._arrow = None
+        reaction._signs = None
+        return reaction
+
     def __getstate__(self):
         return dict(reactants=self.__reactants, products=self.__products, reagents=self.__reagents, meta=self.__meta,
                     name=self.__name)
@@ -244,7 +299,7 @@ class ReactionContainer(StandardizeReaction, DepictReaction):
                 if m.thiele() and not total:
                     total = True
         if total:
-            self.flush_cache()
+            self.flush_cache('atoms', 'bonds')
         return total
 
     def kekule(self) -> bool:
@@ -258,7 +313,7 @@ class ReactionContainer(StandardizeReaction, DepictReaction):
                 if m.kekule() and not total:
                     total = True
         if total:
-            self.flush_cache()
+            self.flush_cache('atoms', 'bonds')
         return total
 
     @cached_method
@@ -292,6 +347,59 @@ class ReactionContainer(StandardizeReaction, DepictReaction):
         """
         return self.compose()
 
+    @cached_args_method
+    def reaction_center(self, deep: int = 0) -> CGRContainer:
+        """
+        CGR of reaction center atoms (atoms with dynamic bonds, charges or radicals) and their neighbors
+        up to `deep` bonds. Equal to `augmented_substructure` of reaction CGR by `center_atoms`, but
+        unchanged atoms out of environment of center are skipped instead of composing.
+
+        Canonical hash and SMILES of returned CGR are signature of reaction rule, e.g. for grouping of reactions:
+        `groups[r.reaction_center(1).canonical_hash].append(r)`.
+
+        :param deep: number of bonds between center atoms and neighbors
+        """
+        rr = self.__reagents + self.__reactants
+        if not all(isinstance(x, MoleculeContainer) for x in chain(rr, self.__products)):
+            cgr = self.compose()  # CGRs in reaction
+            center = cgr.center_atoms
+            return cgr.augmented_substructure(center, deep) if center else CGRContainer()
+
+        r_atoms = {n: m for m in rr for n in m._atoms}
+        p_atoms = {n: m for m in self.__products for n in m._atoms}
+        if len(r_atoms) != sum(len(m) for m in rr) or len(p_atoms) != sum(len(m) for m in self.__products):
+            raise ValueError('mapping of graphs is not disjoint')
+
+        center = set()
+        for n, m in r_atoms.items():
+            bonds = m._bonds[n]
+            o = p_atoms.get(n)
+            if o is None:
+                if not p_atoms.keys().isdisjoint(bonds):  # broken bond of leaving group
+                    center.add(n)
+                continue
+            p_bonds = o._bonds[n]
+            if m._charges[n] != o._charges[n] or m._radicals[n] != o._radicals[n] or \
+                    bonds.keys() != p_bonds.keys() or any(b.order != p_bonds[x].order for x, b in bonds.items()):
+                center.add(n)
+        for n, m in p_atoms.items():
+            if n not in r_atoms and not r_atoms.keys().isdisjoint(m._bonds[n]):  # formed bond of new group
+                center.add(n)
+        if not center:
+            return CGRContainer()
+
+        atoms = set(center)
+        layer = center
+        for _ in range(deep):
+            layer = {x for n in layer for m in (r_atoms.get(n), p_atoms.get(n)) if m for x in m._bonds[n]} - atoms
+            if not layer:
+                break
+            atoms.update(layer)
+
+        r = [m.substructure(atoms.intersection(m._atoms)) for m in rr if not atoms.isdisjoint(m._atoms)]
+        p = [m.substructure(atoms.intersection(m._atoms)) for m in self.__products if not atoms.isdisjoint(m._atoms)]
+        return (reduce(or_, r) if r else MoleculeContainer()) ^ (reduce(or_, p) if p else MoleculeContainer())
+
     def clean2d(self):
         """
         recalculate 2d coordinates
@@ -336,7 +444,7 @@ class ReactionContainer(StandardizeReaction, DepictReaction):
             shift_x = max_x + 1
         self._arrow = (arrow_min, arrow_max)
         self._signs = tuple(signs)
-        self.flush_cache()
+        self.flush_cache('coordinates')
 
     @staticmethod
     def __fix_reagent_positions(molecule, shift_x):
@@ -381,14 +489,26 @@ class ReactionContainer(StandardizeReaction, DepictReaction):
     def __eq__(self, other):
         return isinstance(other, ReactionContainer) and str(self) == str(other)
 
-    @cached_method
     def __hash__(self):
-        return hash(str(self))
+        return hash(self.canonical_hash)
 
     @cached_method
     def __bytes__(self):
         return sha512(str(self).encode()).digest()
 
+    @cached_property
+    def canonical_hash(self) -> int:
+        """
+        Stable between sessions 128-bit hash of reaction. Equal for reactions with equal SMIRKS.
+        Calculated from molecules canonical hashes without SMIRKS string generation.
+        """
+        h = blake2b(digest_size=16)
+        for ml in (self.__reactants, self.__reagents, self.__products):
+            h.update(b'>')
+            for x in sorted(m.__class__.__name__.encode() + c for m in ml for c in m._components_hashes):
+                h.update(x)
+        return int.from_bytes(h.digest(), 'big')
+
     @cached_method
     def __str__(self):
         """
@@ -396,11 +516,16 @@ class ReactionContainer(StandardizeReaction, DepictReaction):
         """
         sig = []
         for ml in (self.__reactants, self.__reagents, self.__products):
-            sig.append(self.__get_smiles(ml) if ml else '')
+            sig.append(self._get_smiles(ml) if ml else '')
         return '>'.join(sig)
 
     @staticmethod
-    def __get_smiles(molecules):
+    def _get_smiles(molecules, format_spec: str = '') -> str:
+        """
+        SMILES of group of molecules. Molecules of same type merged.
+
+        :param format_spec: SMILES format options. See `format` of molecules.
+        """
         mc = []
         cc = []
         qc = []
@@ -417,19 +542,24 @@ class ReactionContainer(StandardizeReaction, DepictReaction):
                 qcc.append(m)
 
         if mc:
-            smiles.append(str(reduce(or_, mc)))
+            smiles.append(format(reduce(or_, mc), format_spec))
         if cc:
-            smiles.append(str(reduce(or_, cc)))
+            smiles.append(format(reduce(or_, cc), format_spec))
         if qc:
-            smiles.append(str(reduce(or_, qc)))
+            smiles.append(format(reduce(or_, qc), format_spec))
         if qcc:
-            smiles.append(str(reduce(or_, qcc)))
+            smiles.append(format(reduce(or_, qcc), format_spec))
         return '.'.join(smiles)
 
-    def flush_cache(self):
+    def flush_cache(self, *changes: str):
+        """
+        Clear cached attributes of reaction and molecules.
+
+        :param changes: kinds of changed data of molecules. See `flush_cache` of molecules.
+        """
         self.__dict__.clear()
         for m in self.molecules():
-            m.flush_cache()
+            m.flush_cache(*changes)
 
     @class_cached_property
     def _standardize_compiled_rules(self):
@@ -448,5 +578,9 @@ class ReactionContainer(StandardizeReaction, DepictReaction):
             rules.append((r_q, p_q, fix))
         return rules
 
+    @class_cached_property
+    def _standardize_matcher(self):
+        return QueryMatcher([r_q for r_q, *_ in self._standardize_compiled_rules])
+
 
 __all__ = ['ReactionContainer']
@@ -18,7 +18,6 @@
 #
 from ctypes import c_char, c_double, c_short, c_long, create_string_buffer, POINTER, Structure, cdll, byref
 from distutils.util import get_platform
-from io import StringIO, TextIOWrapper
 from logging import warning
 from os import name
 from pathlib import Path
@@ -28,14 +27,16 @@ from traceback import format_exc
 from typing import List, Optional
 from warnings import warn
 from ._CGRrw import CGRRead, common_isotopes
+from ._bulk import BulkParser
+from ._compress import close_file, open_read
 from ..containers import MoleculeContainer
 
 
-class INCHIRead(CGRRead):
+class INCHIRead(CGRRead, BulkParser):
     """
     INCHI separated per lines files reader. works similar to opened file object. support `with` context manager.
     on initialization accept opened in text mode file, string path to file,
-    pathlib.Path object or another buffered reader object.
+    pathlib.Path object or another buffered reader object. gzip, xz, bz2 and zstd compressed files supported.
     line should be start with INCHI string and
     optionally continues with space/tab separated list of key:value [or key=value] data if header=None.
         example:
@@ -52,17 +53,8 @@ class INCHIRead(CGRRead):
         :param ignore: Skip some checks of data or try to fix some errors.
         :param remap: Remap atom numbers started from one.
         """
-        if isinstance(file, str):
-            self.__file = open(file)
-            self.__is_buffer = False
-        elif isinstance(file, Path):
-            self.__file = file.open()
-            self.__is_buffer = False
-        elif isinstance(file, (TextIOWrapper, StringIO)):
-            self.__file = file
-            self.__is_buffer = True
-        else:
-            raise TypeError('invalid file. TextIOWrapper, StringIO subclasses possible')
+        self.__file, path, _ = open_read(file)
+        self.__is_buffer = path is None
         super().__init__(**kwargs)
 
         if header is True:
@@ -81,10 +73,17 @@ class INCHIRead(CGRRead):
         """
         Create INCHI parser function configured same as INCHIRead object
         """
+        return cls._create_reader(*args, **kwargs).parse
+
+    @classmethod
+    def _create_reader(cls, *args, **kwargs) -> 'INCHIRead':
+        """
+        Create INCHIRead object without file for strings parsing
+        """
         obj = object.__new__(cls)
         obj._INCHIRead__header = None
         super(INCHIRead, obj).__init__(*args, **kwargs)
-        return obj.parse
+        return obj
 
     def close(self, force=False):
         """
@@ -92,8 +91,7 @@ class INCHIRead(CGRRead):
 
         :param force: force closing of externally opened file or buffer
         """
-        if not self.__is_buffer or force:
-            self.__file.close()
+        close_file(self.__file, self.__is_buffer, force)
 
     def __enter__(self):
         return self
@@ -119,8 +117,23 @@ class INCHIRead(CGRRead):
         """
         convert INCHI string into MoleculeContainer object. string should be start with INCHI and
         optionally continues with space/tab separated list of key:value [or key=value] data.
+        raise ValueError for empty string.
+        """
+        if not inchi or inchi.isspace():
+            raise ValueError('empty string')
+        try:
+            return self._parse(inchi)
+        except ValueError:
+            warning(f'string: {inchi}\nconsist errors:\n{format_exc()}')
+
+    def _parse(self, inchi: str) -> MoleculeContainer:
         """
-        inchi, *data = inchi.split()
+        convert INCHI string into MoleculeContainer object. raise ValueError for invalid string.
+        """
+        try:
+            inchi, *data = inchi.split()
+        except ValueError:
+            raise ValueError('empty string')
         if self.__header is None:
             meta = {}
             for x in data:
@@ -128,22 +141,14 @@ class INCHIRead(CGRRead):
                     k, v = split('[=:]', x, 1)
                     meta[k] = v
                 except ValueError:
-                    warning(f'invalid metadata entry: {x}')
+                    self._warning(f'invalid metadata entry: {x}')
         else:
             meta = dict(zip(self.__header, data))
 
-        try:
-            record = self.__parse_inchi(inchi)
-        except ValueError:
-            warning(f'string: {inchi}\nconsist errors:\n{format_exc()}')
-            return
-
+        record = self.__parse_inchi(inchi)
         record['meta'] = meta
-        try:
-            container, mapping = self._convert_structure(record)
-            return container
-        except ValueError:
-            warning(f'record consist errors:\n{format_exc()}')
+        container, mapping = self._convert_structure(record)
+        return container
 
     @staticmethod
     def __parse_inchi(string):
@@ -18,13 +18,12 @@
 #
 from collections import defaultdict
 from importlib.util import find_spec
-from io import StringIO, BytesIO, TextIOWrapper, BufferedIOBase, BufferedReader
 from itertools import count
 from logging import warning
-from pathlib import Path
 from traceback import format_exc
 from warnings import warn
 from ._CGRrw import CGRRead
+from ._compress import close_file, open_read, open_write
 from ..containers import MoleculeContainer, ReactionContainer
 from ..exceptions import EmptyMolecule
 
@@ -73,24 +72,15 @@ class MRVRead(CGRRead):
     """
     ChemAxon MRV files reader. works similar to opened file object. support `with` context manager.
     on initialization accept opened in binary mode file, string path to file,
-    pathlib.Path object or another binary buffered reader object
+    pathlib.Path object or another binary buffered reader object. gzip, xz, bz2 and zstd compressed files supported
     """
     def __init__(self, file, **kwargs):
         """
         :param ignore: Skip some checks of data or try to fix some errors.
         :param remap: Remap atom numbers started from one.
         """
-        if isinstance(file, str):
-            self.__file = open(file, 'rb')
-            self.__is_buffer = False
-        elif isinstance(file, Path):
-            self.__file = file.open('rb')
-            self.__is_buffer = False
-        elif isinstance(file, (BytesIO, BufferedReader, BufferedIOBase)):
-            self.__file = file
-            self.__is_buffer = True
-        else:
-            raise TypeError('invalid file. BytesIO, BufferedReader and BufferedIOBase subclasses possible')
+        self.__file, path, _ = open_read(file, binary=True)
+        self.__is_buffer = path is None
         super().__init__(**kwargs)
         self._data = self.__reader()
 
@@ -100,8 +90,7 @@ class MRVRead(CGRRead):
 
         :param force: force closing of externally opened file or buffer
         """
-        if not self.__is_buffer or force:
-            self.__file.close()
+        close_file(self.__file, self.__is_buffer, force)
 
     def __enter__(self):
         return self
@@ -295,21 +284,11 @@ class MRVWrite:
     """
     ChemAxon MRV files writer. works similar to opened for writing file object. support `with` context manager.
     on initialization accept opened for writing in text mode file, string path to file,
-    pathlib.Path object or another buffered writer object
+    pathlib.Path object or another buffered writer object.
+    paths with .gz, .xz, .bz2 and .zst extensions compressed
     """
     def __init__(self, file):
-        if isinstance(file, str):
-            self._file = open(file, 'w')
-            self._is_buffer = False
-        elif isinstance(file, Path):
-            self._file = file.open('w')
-            self._is_buffer = False
-        elif isinstance(file, (TextIOWrapper, StringIO)):
-            self._file = file
-            self._is_buffer = True
-        else:
-            raise TypeError('invalid file. '
-                            'TextIOWrapper, StringIO, BytesIO, BufferedReader and BufferedIOBase subclasses possible')
+        self._file, self._is_buffer = open_write(file)
         self.__writable = True
 
     def close(self, force=False):
@@ -325,8 +304,7 @@ class MRVWrite:
             self.write = self.__write_closed
             self.__writable = False
 
-        if not self._is_buffer or force:
-            self._file.close()
+        close_file(self._file, self._is_buffer, force)
 
     def __enter__(self):
         return self
@@ -16,11 +16,10 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
-from io import StringIO, TextIOWrapper
 from logging import warning
-from pathlib import Path
 from traceback import format_exc
 from typing import List, Iterable, Tuple, Optional
+from ._compress import close_file, open_read
 from .XYZrw import XYZ
 from ..containers import MoleculeContainer
 
@@ -34,7 +33,7 @@ res_names = {'ALA', 'CYS', 'ASP', 'GLU', 'PHE', 'GLY', 'HIS', 'ILE', 'LYS', 'LEU
 class PDBRead(XYZ):
     """PDB files reader. Works similar to opened file object. Support `with` context manager.
     On initialization accept opened in text mode file, string path to file,
-    pathlib.Path object or another buffered reader object.
+    pathlib.Path object or another buffered reader object. gzip, xz, bz2 and zstd compressed files supported.
 
     Supported multiple structures in same file separated by ENDMDL. Supported only ATOM and HETATM parsing.
     END or ENDMDL required in the end.
@@ -43,17 +42,8 @@ class PDBRead(XYZ):
         """
         :param ignore: Skip some checks of data or try to fix some errors.
         """
-        if isinstance(file, str):
-            self.__file = open(file)
-            self.__is_buffer = False
-        elif isinstance(file, Path):
-            self.__file = file.open()
-            self.__is_buffer = False
-        elif isinstance(file, (TextIOWrapper, StringIO)):
-            self.__file = file
-            self.__is_buffer = True
-        else:
-            raise TypeError('invalid file. TextIOWrapper, StringIO subclasses possible')
+        self.__file, path, _ = open_read(file)
+        self.__is_buffer = path is None
         super().__init__(**kwargs)
         self.__ignore = ignore
         self._data = self.__reader()
@@ -64,8 +54,7 @@ class PDBRead(XYZ):
 
         :param force: Force closing of externally opened file or buffer
         """
-        if not self.__is_buffer or force:
-            self.__file.close()
+        close_file(self.__file, self.__is_buffer, force)
 
     def __enter__(self):
         return self
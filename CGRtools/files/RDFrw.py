@@ -21,9 +21,6 @@ from bisect import bisect_left
 from collections import defaultdict
 from itertools import chain
 from logging import warning
-from os.path import getsize
-from subprocess import check_output
-from sys import platform
 from time import strftime
 from traceback import format_exc
 from warnings import warn
@@ -36,31 +33,34 @@ class RDFRead(MDLRead):
     """
     MDL RDF files reader. works similar to opened file object. support `with` context manager.
     on initialization accept opened in text mode file, string path to file,
-    pathlib.Path object or another buffered reader object
+    pathlib.Path object or another buffered reader object. gzip, xz, bz2 and zstd compressed files supported
     """
-    def __init__(self, file, indexable=False, **kwargs):
+    def __init__(self, file, indexable=False, workers: int = 1, chunksize: int = 100, **kwargs):
         """
         :param indexable: if True: supported methods seek, tell, object size and subscription, it only works when
-            dealing with a real file (the path to the file is specified) because the external grep utility is used,
-            supporting in unix-like OS the object behaves like a normal open file.
+            dealing with a real file (the path to the file is specified). Records offsets stored in sidecar file
+            `.cgridx` near source file or in temp directory.
 
             if False: works like generator converting a record into ReactionContainer and returning each object in
             order, records with errors are skipped
+        :param workers: number of processes for parsing. File split into chunks of records which parsed in parallel.
+            Records returned in original order. Not compatible with indexable mode.
+        :param chunksize: number of records in chunk sent to worker process.
         :param ignore: Skip some checks of data or try to fix some errors.
         :param remap: Remap atom numbers started from one.
         """
-        super().__init__(file, **kwargs)
+        super().__init__(file, seekable=indexable, **kwargs)
+        if workers > 1:
+            if indexable:
+                raise ValueError('parallel parsing not compatible with indexable mode')
+            self._data = self._parallel_reader(self.__chunks(chunksize), workers, **kwargs)
+            return
         self._data = self.__reader()
 
-        if indexable and platform != 'win32' and not self._is_buffer:
+        if indexable and not self._is_buffer:
             self.__file = iter(self._file.readline, '')
             if next(self._data):
-                self._shifts = self._load_cache()
-                if self._shifts is None:
-                    self._shifts = [int(x.split(b':', 1)[0]) for x in
-                                    check_output(['grep', '-boE', r'^\$[RM]FMT', self._file.name]).split()]
-                    self._shifts.append(getsize(self._file.name))
-                    self._dump_cache(self._shifts)
+                self._shifts = self._load_index()
         else:
             self.__file = self._file
             next(self._data)
@@ -109,6 +109,37 @@ class RDFRead(MDLRead):
                 return bisect_left(self._shifts, t) - 1
         raise self._implement_error
 
+    @classmethod
+    def _index_scan(cls, data, start, stop):
+        return sorted(chain(cls._line_starts(data, b'$RFMT', start, stop),
+                            cls._line_starts(data, b'$MFMT', start, stop)))
+
+    @staticmethod
+    def _index_resume(offsets, scanned):
+        return [x for x in offsets[:-1] if x < scanned], scanned
+
+    @staticmethod
+    def _index_offsets(offsets, size):
+        return [*offsets, size]
+
+    def __chunks(self, size):
+        header = next(self._file, '') + next(self._file, '')
+        if header.startswith('$RXN'):  # single reaction file
+            yield header + self._file.read()
+            return
+        chunk = [header]
+        records = 0
+        for line in self._file:
+            if line.startswith(('$RFMT', '$MFMT')):
+                if records == size:
+                    yield ''.join(chunk)
+                    chunk = [header]
+                    records = 0
+                records += 1
+            chunk.append(line)
+        if records:
+            yield ''.join(chunk)
+
     def __reader(self):
         record = parser = mkey = None
         failed = False
@@ -241,7 +272,8 @@ class RDFWrite(MDLWrite):
     """
     MDL RDF files writer. works similar to opened for writing file object. support `with` context manager.
     on initialization accept opened for writing in text mode file, string path to file,
-    pathlib.Path object or another buffered writer object
+    pathlib.Path object or another buffered writer object.
+    paths with .gz, .xz, .bz2 and .zst extensions compressed
     """
     def __init__(self, file, *, write3d: bool = False):
         """
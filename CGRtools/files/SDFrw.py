@@ -18,10 +18,7 @@
 #
 from bisect import bisect_left
 from collections import defaultdict
-from io import BytesIO
 from logging import warning
-from subprocess import check_output
-from sys import platform
 from traceback import format_exc
 from warnings import warn
 from ._MDLrw import MDLRead, MDLWrite, MOLRead, EMOLRead
@@ -31,31 +28,33 @@ class SDFRead(MDLRead):
     """
     MDL SDF files reader. works similar to opened file object. support `with` context manager.
     on initialization accept opened in text mode file, string path to file,
-    pathlib.Path object or another buffered reader object
+    pathlib.Path object or another buffered reader object. gzip, xz, bz2 and zstd compressed files supported
     """
-    def __init__(self, file, indexable=False, **kwargs):
+    def __init__(self, file, indexable=False, workers: int = 1, chunksize: int = 100, **kwargs):
         """
         :param indexable: if True: supported methods seek, tell, object size and subscription, it only works when
-            dealing with a real file (the path to the file is specified) because the external grep utility is used,
-            supporting in unix-like OS the object behaves like a normal open file.
+            dealing with a real file (the path to the file is specified). Records offsets stored in sidecar file
+            `.cgridx` near source file or in temp directory.
 
             if False: works like generator converting a record into MoleculeContainer and returning each object in
             order, records with errors are skipped
+        :param workers: number of processes for parsing. File split into chunks of records which parsed in parallel.
+            Records returned in original order. Not compatible with indexable mode.
+        :param chunksize: number of records in chunk sent to worker process.
         :param ignore: Skip some checks of data or try to fix some errors.
         :param remap: Remap atom numbers started from one.
         """
-        super().__init__(file, **kwargs)
-        self._data = self.__reader()
+        super().__init__(file, seekable=indexable, **kwargs)
+        if workers > 1:
+            if indexable:
+                raise ValueError('parallel parsing not compatible with indexable mode')
+            self._data = self._parallel_reader(self.__chunks(chunksize), workers, **kwargs)
+        else:
+            self._data = self.__reader()
 
-        if indexable and platform != 'win32' and not self._is_buffer:
+        if indexable and not self._is_buffer:
             self.__file = iter(self._file.readline, '')
-            self._shifts = self._load_cache()
-            if self._shifts is None:
-                self._shifts = [0]
-                for x in BytesIO(check_output(['grep', '-bE', r'\$\$\$\$', self._file.name])):
-                    _pos, _line = x.split(b':', 1)
-                    self._shifts.append(int(_pos) + len(_line))
-                self._dump_cache(self._shifts)
+            self._shifts = self._load_index()
         else:
             self.__file = self._file
 
@@ -87,6 +86,37 @@ class SDFRead(MDLRead):
             return bisect_left(self._shifts, t)
         raise self._implement_error
 
+    @classmethod
+    def _index_scan(cls, data, start, stop):
+        offsets = []
+        for x in cls._line_starts(data, b'$$$$', start, stop):
+            x = data.find(b'\n', x, stop)
+            offsets.append(stop if x == -1 else x + 1)
+        return offsets
+
+    @staticmethod
+    def _index_resume(offsets, scanned):
+        offsets = [x for x in offsets[1:] if x <= scanned]  # drop not complete $$$$ line
+        return offsets, offsets[-1] if offsets else 0
+
+    @staticmethod
+    def _index_offsets(offsets, size):
+        return [0, *offsets]
+
+    def __chunks(self, size):
+        chunk = []
+        records = 0
+        for line in self._file:
+            chunk.append(line)
+            if line.startswith('$$$$'):
+                records += 1
+                if records == size:
+                    yield ''.join(chunk)
+                    chunk = []
+                    records = 0
+        if chunk:
+            yield ''.join(chunk)
+
     def __reader(self):
         im = 3
         failkey = False
@@ -165,7 +195,8 @@ class SDFWrite(MDLWrite):
     """
     MDL SDF files writer. works similar to opened for writing file object. support `with` context manager.
     on initialization accept opened for writing in text mode file, string path to file,
-    pathlib.Path object or another buffered writer object
+    pathlib.Path object or another buffered writer object.
+    paths with .gz, .xz, .bz2 and .zst extensions compressed
     """
     def write(self, data):
         """
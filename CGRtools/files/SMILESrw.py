@@ -17,17 +17,21 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
+from functools import lru_cache
+from collections import OrderedDict
 from itertools import permutations
-from io import StringIO, TextIOWrapper
 from logging import warning
-from pathlib import Path
 from re import split, compile, fullmatch
 from traceback import format_exc
-from typing import Union, List
+from typing import Union, List, Optional, Sequence
 from warnings import warn
 from ._CGRrw import CGRRead
-from ..containers import MoleculeContainer, CGRContainer, ReactionContainer
-from ..exceptions import IncorrectSmiles
+from ._bulk import BulkParser
+from ._compress import close_file, open_read, open_write
+from ..containers import MoleculeContainer, CGRContainer, QueryContainer, QueryCGRContainer, ReactionContainer
+from ..containers.bonds import Bond
+from ..exceptions import IncorrectSmiles, ValenceError
+from ..periodictable import Element
 
 
 # tokens structure:
@@ -65,11 +69,44 @@ atom_re = compile(r'([1-9][0-9]{0,2})?([A-IK-PR-Zacnops][a-ik-pr-vy]?)(@@|@)?(H[
 dyn_atom_re = compile(r'([1-9][0-9]{0,2})?([A-IK-PR-Z][a-ik-pr-vy]?)([+-0][1-4+-]?(>[+-0][1-4+-]?)?)?([*^](>[*^])?)?')
 delimiter = compile(r'[=:]')
 
+# fast path lexer of plain molecules. group number is token type:
+# 1: organic atom, 2: aromatic organic atom, 3: in bracket atom, 4: bond, 5: up down bond,
+# 6: open chain, 7: close chain, 8: closure digit, 9: %closure number, 10: dot bond
+fast_token_re = compile(r'(Cl|Br|[BCNOPSFI])|([cnops])|\[([^\[\]]+)\]|([-=#:~])|([\\/])|(\()|(\))|([1-9])|%([1-9][0-9]*)|(\.)')
+elements_classes = {x.__name__: x for x in Element.__subclasses__()}
+organic_atoms = {x: elements_classes[x.capitalize()] for x in ('B', 'C', 'N', 'O', 'P', 'S', 'F', 'I', 'Cl', 'Br',
+                                                               'c', 'n', 'o', 'p', 's')}
+aromatic_elements = {'c', 'n', 'o', 'p', 's', 'as', 'se'}
 
-class SMILESRead(CGRRead):
+
+@lru_cache(4096)
+def fast_atom_parse(token):
+    """
+    Parse in bracket atom token of plain molecule.
+
+    :return: aromatic mark, element class, isotope, charge and mapping. None for invalid or unsupported token.
+    """
+    match = fullmatch(atom_re, token)
+    if match is None:
+        return
+    isotope, element, _, _, charge, mapping = match.groups()
+    if element in aromatic_elements:
+        aromatic = True
+        element = element.capitalize()
+    else:
+        aromatic = False
+    try:
+        element = elements_classes[element]
+        charge = charge_dict[charge] if charge else 0
+    except KeyError:
+        return
+    return aromatic, element, isotope and int(isotope), charge, mapping and int(mapping[1:]) or 0
+
+
+class SMILESRead(CGRRead, BulkParser):
     """SMILES separated per lines files reader. Works similar to opened file object. Support `with` context manager.
     On initialization accept opened in text mode file, string path to file,
-    pathlib.Path object or another buffered reader object.
+    pathlib.Path object or another buffered reader object. gzip, xz, bz2 and zstd compressed files supported.
 
     Line should be start with SMILES string and optionally continues with space/tab separated list of
     `key:value` [or `key=value`] data if `header=None`. For example::
@@ -92,17 +129,8 @@ class SMILESRead(CGRRead):
         :param ignore: Skip some checks of data or try to fix some errors.
         :param remap: Remap atom numbers started from one.
         """
-        if isinstance(file, str):
-            self.__file = open(file)
-            self.__is_buffer = False
-        elif isinstance(file, Path):
-            self.__file = file.open()
-            self.__is_buffer = False
-        elif isinstance(file, (TextIOWrapper, StringIO)):
-            self.__file = file
-            self.__is_buffer = True
-        else:
-            raise TypeError('invalid file. TextIOWrapper, StringIO subclasses possible')
+        self.__file, path, _ = open_read(file)
+        self.__is_buffer = path is None
         super().__init__(**kwargs)
 
         if header is True:
@@ -121,10 +149,17 @@ class SMILESRead(CGRRead):
         """
         Create SMILES parser function configured same as SMILESRead object.
         """
+        return cls._create_reader(*args, **kwargs).parse
+
+    @classmethod
+    def _create_reader(cls, *args, **kwargs) -> 'SMILESRead':
+        """
+        Create SMILESRead object without file for strings parsing.
+        """
         obj = object.__new__(cls)
         obj._SMILESRead__header = None
         super(SMILESRead, obj).__init__(*args, **kwargs)
-        return obj.parse
+        return obj
 
     def close(self, force=False):
         """
@@ -132,8 +167,7 @@ class SMILESRead(CGRRead):
 
         :param force: Force closing of externally opened file or buffer.
         """
-        if not self.__is_buffer or force:
-            self.__file.close()
+        close_file(self.__file, self.__is_buffer, force)
 
     def __enter__(self):
         return self
@@ -156,8 +190,20 @@ class SMILESRead(CGRRead):
         return next(iter(self))
 
     def parse(self, smiles: str) -> Union[MoleculeContainer, CGRContainer, ReactionContainer, None]:
-        """SMILES string parser."""
-        smi, *data = smiles.split()
+        """SMILES string parser. Raise ValueError for empty string."""
+        if not smiles or smiles.isspace():
+            raise ValueError('empty string')
+        try:
+            return self._parse(smiles)
+        except ValueError:
+            warning(f'line: {smiles}\nconsist errors:\n{format_exc()}')
+
+    def _parse(self, smiles: str) -> Union[MoleculeContainer, CGRContainer, ReactionContainer]:
+        """SMILES string parser. Raise ValueError for invalid string."""
+        try:
+            smi, *data = smiles.split()
+        except ValueError:
+            raise ValueError('empty string')
         if self.__header is None:
             meta = {}
             for x in data:
@@ -165,7 +211,7 @@ class SMILESRead(CGRRead):
                     k, v = split(delimiter, x, 1)
                     meta[k] = v
                 except ValueError:
-                    warning(f'invalid metadata entry: {x}')
+                    self._warning(f'invalid metadata entry: {x}')
         else:
             meta = dict(zip(self.__header, data))
 
@@ -174,51 +220,206 @@ class SMILESRead(CGRRead):
             try:
                 reactants, reagents, products = smi.split('>')
             except ValueError:
-                warning('invalid SMIRKS')
-                return
+                raise ValueError('invalid SMIRKS')
 
-            try:
-                if reactants:
-                    for x in reactants.split('.'):
-                        if not x and self._ignore:
-                            warning('empty molecule ignored')
-                        else:
-                            record['reactants'].append(self.__parse_tokens(x))
-                if products:
-                    for x in products.split('.'):
-                        if not x and self._ignore:
-                            warning('empty molecule ignored')
-                        else:
-                            record['products'].append(self.__parse_tokens(x))
-                if reagents:
-                    for x in reagents.split('.'):
-                        if not x and self._ignore:
-                            warning('empty molecule ignored')
-                        else:
-                            record['reagents'].append(self.__parse_tokens(x))
-            except ValueError:
-                warning(f'record consist errors:\n{format_exc()}')
+            if reactants:
+                for x in reactants.split('.'):
+                    if not x and self._ignore:
+                        self._warning('empty molecule ignored')
+                    else:
+                        record['reactants'].append(self.__parse_tokens(x))
+            if products:
+                for x in products.split('.'):
+                    if not x and self._ignore:
+                        self._warning('empty molecule ignored')
+                    else:
+                        record['products'].append(self.__parse_tokens(x))
+            if reagents:
+                for x in reagents.split('.'):
+                    if not x and self._ignore:
+                        self._warning('empty molecule ignored')
+                    else:
+                        record['reagents'].append(self.__parse_tokens(x))
+
+            container, mapping = self._convert_reaction(record)
+            return container
+        else:
+            if '>' not in smi:  # not CGR
+                container = self.__fast_parse(smi)
+                if container is not None:
+                    container.meta.update(meta)
+                    return container
+
+            record = self.__parse_tokens(smi)
+            record['meta'] = meta
+            container, mapping = self._convert_structure(record)
+            return container
+
+    def __fast_parse(self, smiles):
+        """
+        Plain molecule SMILES parser. Tokens lexed by single precompiled regular expression and molecule
+        filled directly without intermediate data.
+
+        Return None for unsupported or invalid SMILES. Generic parser should be used in this case for
+        proper errors reporting.
+        """
+        strong_cycle = not self._ignore
+        atoms = {}
+        charges = {}
+        bonds = {}
+        parsed_mapping = {}
+        aromatic = set()
+        stack = []
+        cycles = {}
+        used_cycles = set()
+        reused_cycles = []
+        atom_num = last_num = end = 0
+        previous = None
+        opened = False
+
+        for match in fast_token_re.finditer(smiles):
+            if match.start() != end:  # unknown symbols found
                 return
+            end = match.end()
+            token_type = match.lastindex
+            if token_type <= 3:  # atom
+                if token_type == 3:
+                    token = fast_atom_parse(match.group(3))
+                    if token is None:
+                        return
+                    is_aromatic, element, isotope, charge, mapping = token
+                    try:
+                        element = element(isotope)
+                    except ValueError:  # invalid isotope
+                        return
+                else:
+                    is_aromatic = token_type == 2
+                    element = organic_atoms[match.group(token_type)]()
+                    charge = mapping = 0
 
-            try:
-                container, mapping = self._convert_reaction(record)
-                return container
-            except ValueError:
-                warning(f'record consist errors:\n{format_exc()}')
+                atom_num += 1
+                atoms[atom_num] = element
+                charges[atom_num] = charge
+                parsed_mapping[atom_num] = mapping
+                bonds[atom_num] = {}
+                if is_aromatic:
+                    aromatic.add(atom_num)
+                if last_num:
+                    if previous is None:
+                        bonds[atom_num][last_num] = bonds[last_num][atom_num] = \
+                            Bond(4 if is_aromatic and last_num in aromatic else 1)
+                    elif previous[0] == 1:
+                        bonds[atom_num][last_num] = bonds[last_num][atom_num] = Bond(previous[1])
+                    elif previous[0] == 9:
+                        bonds[atom_num][last_num] = bonds[last_num][atom_num] = Bond(1)
+                last_num = atom_num
+                previous = None
+            elif not atom_num:  # started from not atom
                 return
-        else:
-            try:
-                record = self.__parse_tokens(smi)
-            except ValueError:
-                warning(f'line: {smi}\nconsist errors:\n{format_exc()}')
+            elif token_type in (8, 9):  # cycle
+                token = int(match.group(token_type))
+                if previous and previous[0] == 4:
+                    return
+                elif token not in cycles:
+                    if token in used_cycles:
+                        if strong_cycle:
+                            return
+                        reused_cycles.append(token)
+                    else:
+                        used_cycles.add(token)
+                    cycles[token] = (last_num, previous)
+                else:
+                    a, b = cycles.pop(token)
+                    if b:
+                        if not previous:
+                            if strong_cycle:
+                                return
+                            previous = b
+                        elif previous != b:
+                            return
+                    elif previous:
+                        if strong_cycle:
+                            return
+                    else:
+                        previous = (1, 4) if last_num in aromatic and a in aromatic else (1, 1)
+                    if a == last_num or a in bonds[last_num]:  # loop or multiple bond
+                        return
+                    bonds[last_num][a] = bonds[a][last_num] = Bond(previous[1] if previous[0] == 1 else 1)
+                previous = None
+            elif token_type == 6:  # (
+                if opened:
+                    return
+                elif previous:
+                    if previous[0] != 4:
+                        return
+                    previous = None
+                stack.append(last_num)
+            elif token_type == 7:  # )
+                if opened or previous or not stack:
+                    return
+                last_num = stack.pop()
+            elif previous:  # 2 bonds in a row
                 return
+            elif token_type == 4:
+                previous = (1, replace_dict[match.group(4)])
+            elif token_type == 5:
+                previous = (9, match.group(5) == '/')
+            else:
+                previous = (4, None)
+            opened = token_type == 6
 
-            record['meta'] = meta
+        if end != len(smiles) or not atom_num or stack or cycles or previous:
+            return
+
+        if not self._remap:
             try:
-                container, mapping = self._convert_structure(record)
-                return container
+                remapped = self._remap_structure(list(parsed_mapping.values()))
             except ValueError:
-                warning(f'record consist errors:\n{format_exc()}')
+                return
+            remapped = {n: remapped[n - 1] for n in atoms}
+            if any(n != m for n, m in remapped.items()):
+                atoms = {remapped[n]: a for n, a in atoms.items()}
+                charges = {remapped[n]: c for n, c in charges.items()}
+                parsed_mapping = {remapped[n]: m for n, m in parsed_mapping.items()}
+                bonds = {remapped[n]: {remapped[m]: b for m, b in mb.items()} for n, mb in bonds.items()}
+
+        for token in reused_cycles:
+            self._warning(f'reused closure number: {token}')
+
+        g = MoleculeContainer()
+        g._atoms = atoms
+        g._charges = charges
+        g._radicals = dict.fromkeys(atoms, False)
+        g._plane = dict.fromkeys(atoms, (0., 0.))
+        g._bonds = bonds
+        g._parsed_mapping = parsed_mapping
+        neighbors = g._neighbors
+        hybridizations = g._hybridizations
+        hydrogens = g._hydrogens
+        for n, atom in atoms.items():
+            atom._attach_to_graph(g, n)
+            if bonds[n]:
+                neighbors[n] = sum(atoms[m].atomic_number != 1 for m in bonds[n])
+                g._calc_hybridization(n)
+                g._calc_implicit(n)
+            else:
+                neighbors[n] = 0
+                hybridizations[n] = 1
+                if atom.atomic_number == 1:
+                    hydrogens[n] = 0
+                    continue
+                try:
+                    rules = atom.valence_rules(charges[n], False, 0)
+                except ValenceError:
+                    hydrogens[n] = None
+                else:
+                    for s, d, h in rules:
+                        if h and not s:
+                            hydrogens[n] = h
+                            break
+                    else:
+                        hydrogens[n] = 0
+        return g
 
     @staticmethod
     def _raw_tokenize(smiles):
@@ -495,7 +696,7 @@ class SMILESRead(CGRRead):
                         if strong_cycle:
                             raise IncorrectSmiles('reused closure number')
                         else:
-                            warning(f'reused closure number: {token}')
+                            self._warning(f'reused closure number: {token}')
                     else:
                         used_cycles.add(token)
                     cycles[token] = (last_num, previous)
@@ -569,6 +770,152 @@ class SMILESRead(CGRRead):
         return mol
 
 
+class SMILESWrite:
+    """
+    SMILES files writer. works similar to opened for writing file object. support `with` context manager.
+    on initialization accept opened for writing in text mode file, string path to file,
+    pathlib.Path object or another buffered writer object.
+    paths with .gz, .xz, .bz2 and .zst extensions compressed
+
+    Records written per line as SMILES followed by space separated list of `key:value` meta data.
+    If header is set, first line is space separated list of SMILES column name and meta keys, and
+    lines contain meta values in header order. Records should have all header keys with non-empty values.
+    Meta values containing whitespaces are not allowed.
+
+    Canonical SMILES of repeated molecules and groups of reaction molecules (e.g. solvents and catalysts)
+    taken from LRU cache. Cache keyed by tuple of atoms and bonds attributes with atoms replaced by their
+    positions in molecule. Key is independent from atom numbers and much cheaper than canonicalization.
+    """
+    def __init__(self, file, header: Optional[Sequence[str]] = None, *, cache_size: int = 1000,
+                 format_spec: str = ''):
+        """
+        :param header: meta keys written as columns. key:value pairs written if not set.
+        :param cache_size: maximal number of cached SMILES. 0 disables caching.
+        :param format_spec: SMILES format options. See `format` of molecules.
+        """
+        if header is not None and (not isinstance(header, (list, tuple)) or
+                                   not all(isinstance(x, str) for x in header)):
+            raise TypeError('expected list (tuple) of strings')
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError('cache_size should be non-negative integer')
+
+        self._file, self._is_buffer = open_write(file)
+        self.__header = header
+        self.__cache_size = cache_size
+        self.__cache = OrderedDict()
+        self.__format_spec = format_spec
+        self.__write = True
+        if header is not None:
+            self._file.write(' '.join(('smiles', *header)))
+            self._file.write('\n')
+
+    def close(self, force=False):
+        """
+        close opened file
+
+        :param force: force closing of externally opened file or buffer
+        """
+        if self.__write:
+            self.write = self.__write_closed
+            self.__write = False
+            self.__cache.clear()
+
+        close_file(self._file, self._is_buffer, force)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _type, value, traceback):
+        self.close()
+
+    @staticmethod
+    def __write_closed(_):
+        raise ValueError('I/O operation on closed writer')
+
+    def write(self, data):
+        """
+        write single molecule or reaction into file
+        """
+        if isinstance(data, ReactionContainer):
+            smiles = '>'.join(self.__smiles(ml) if ml else '' for ml in (data.reactants, data.reagents, data.products))
+        else:
+            smiles = self.__smiles((data,))
+
+        meta = data.meta
+        if self.__header is None:
+            line = [smiles, *(f'{k}:{v}' for k, v in meta.items())]
+        else:
+            try:
+                line = [smiles, *(str(meta[k]) for k in self.__header)]
+            except KeyError as e:
+                raise ValueError(f'header key {e} not found in meta') from e
+            if not all(line[1:]):
+                raise ValueError('meta values should not be empty')
+        if any(x != ''.join(x.split()) for x in line[1:]):
+            raise ValueError('meta values should not contain whitespaces')
+        self._file.write(' '.join(line))
+        self._file.write('\n')
+
+    def __smiles(self, molecules):
+        if not self.__cache_size:
+            return self.__format(molecules)
+
+        key = tuple(self.__key(m) for m in molecules)
+        cache = self.__cache
+        try:
+            smiles = cache[key]
+        except KeyError:
+            smiles = cache[key] = self.__format(molecules)
+            if len(cache) > self.__cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return smiles
+
+    def __format(self, molecules):
+        if len(molecules) == 1:
+            return format(molecules[0], self.__format_spec)
+        return ReactionContainer._get_smiles(molecules, self.__format_spec)
+
+    @staticmethod
+    def __key(molecule):
+        """
+        structure key. equal keys have equal SMILES.
+        atom numbers replaced by atoms positions, thus same structures numbered differently have equal keys.
+        """
+        if isinstance(molecule, MoleculeContainer):
+            attributes = (molecule._charges, molecule._radicals, molecule._hydrogens)
+        elif isinstance(molecule, CGRContainer):
+            attributes = (molecule._charges, molecule._radicals, molecule._p_charges, molecule._p_radicals)
+        elif isinstance(molecule, QueryContainer):
+            attributes = (molecule._charges, molecule._radicals, molecule._neighbors, molecule._hybridizations)
+        elif isinstance(molecule, QueryCGRContainer):
+            attributes = (molecule._charges, molecule._radicals, molecule._p_charges, molecule._p_radicals,
+                          molecule._neighbors, molecule._hybridizations, molecule._p_neighbors,
+                          molecule._p_hybridizations)
+        else:
+            raise TypeError('Graph expected')
+
+        position = {n: i for i, n in enumerate(molecule._atoms)}
+        atoms = tuple((a.__class__, a.isotope, *(x[n] for x in attributes)) for n, a in molecule._atoms.items())
+        if isinstance(molecule, (CGRContainer, QueryCGRContainer)):
+            bonds = sorted((position[n], position[m], b.order, b.p_order) for n, mb in molecule._bonds.items()
+                           for m, b in mb.items() if position[n] < position[m])
+        else:
+            bonds = sorted((position[n], position[m], b.order) for n, mb in molecule._bonds.items()
+                           for m, b in mb.items() if position[n] < position[m])
+
+        stereo = getattr(molecule, '_atoms_stereo', None)
+        if stereo:
+            # sign of stereo atom depends on neighbors order. use neighbors ordered by positions.
+            tetrahedrons = molecule._tetrahedrons
+            stereo = tuple(sorted((position[n], molecule._translate_tetrahedron_stereo(
+                n, sorted(tetrahedrons[n], key=position.__getitem__))) for n in stereo))
+        else:
+            stereo = None
+        return molecule.__class__, atoms, tuple(bonds), stereo
+
+
 class SMILESread:
     def __init__(self, *args, **kwargs):
         warn('SMILESread deprecated. Use SMILESRead instead', DeprecationWarning)
@@ -591,4 +938,4 @@ class SMILESread:
         return self.__obj.__exit__(_type, value, traceback)
 
 
-__all__ = ['SMILESRead', 'SMILESread']
+__all__ = ['SMILESRead', 'SMILESWrite', 'SMILESread']
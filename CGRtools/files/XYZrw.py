@@ -18,61 +18,117 @@
 #
 from collections import defaultdict
 from importlib.util import find_spec
-from itertools import combinations, product
-from io import StringIO, TextIOWrapper
+from itertools import chain, combinations, product
 from logging import warning
 from math import sqrt
-from pathlib import Path
 from random import shuffle
 from traceback import format_exc
 from typing import List, Iterable, Tuple, Optional
 from warnings import warn
+from ._compress import close_file, open_read
 from ..containers import MoleculeContainer
 
-if find_spec('numpy') and find_spec('numba'):  # try to load numba jit
-    from numpy import array, uint16, empty
-    from numba import njit, f8, u2, u4
-    from numba.types import Tuple as nTuple
-
-    @njit(nTuple((u2[:, :], f8[:]))(f8[:, :], f8[:], f8),
-          {'size': u2, 'max_bonds': u4, 'c': u4, 'n': u2, 'm': u2, 'rn': f8, 'r': f8, 'd': f8,
-           'nx': f8, 'ny': f8, 'nz': f8, 'mx': f8, 'my': f8, 'mz': f8}, cache=True)
-    def _get_possible_bonds(xyz, radii, multiplier):
-        size = len(xyz)
-        max_bonds = size * 10  # each atom has less then 10 neighbors approximately
-        nm = empty((max_bonds, 2), dtype=uint16)
-        ds = empty(max_bonds)
-        c = 0
-        for n in range(size - 1):
-            nx, ny, nz = xyz[n]
-            rn = radii[n]
-            for m in range(n + 1, size):
-                mx, my, mz = xyz[m]
-                d = sqrt((nx - mx) ** 2 + (ny - my) ** 2 + (nz - mz) ** 2)
-                r = (rn + radii[m]) * multiplier
-                if d <= r:
-                    nm[c] = n + 1, m + 1
-                    ds[c] = d
-                    c += 1
-        return nm[:c], ds[:c]
+# neighbor cells in half of 3x3x3 cube. each pair of cells checked once
+half_shell = [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1) if (x, y, z) > (0, 0, 0)]
+
+
+if find_spec('numpy'):
+    from numpy import arange, argsort, array, concatenate, cumsum, floor, int64, lexsort, repeat, searchsorted, \
+        sqrt as v_sqrt
 
     def get_possible_bonds(atoms, conformer, multiplier):
+        """
+        Pairs of atoms closer than sum of covalent radii multiplied by `multiplier`.
+
+        Space split into cubic cells with edge equal to the longest possible bond. Bonded atoms placed in the same or
+        adjacent cells. Distances calculated vectorized for pairs of atoms of each cell and its neighbor cell
+        shifted by the same vector. Linear to atoms count for uniformly dense structures.
+        """
         possible_bonds = {n: {} for n in atoms}  # distance matrix
-        radii = array([a.atomic_radius for a in atoms.values()])
-        xyz = array(list(conformer.values()))
-        nm, ds = _get_possible_bonds(xyz, radii, multiplier)
-        for (n, m), d in zip(nm.tolist(), ds.tolist()):
+        size = len(conformer)
+        if size < 2:
+            return possible_bonds
+        numbers = list(conformer)
+        xyz = array(list(conformer.values()), dtype=float)
+        radii = array([atoms[n].atomic_radius for n in numbers])
+
+        cells = floor((xyz - xyz.min(0)) / (radii.max() * 2 * multiplier)).astype(int64) + 1  # padded grid
+        dy = int(cells[:, 1].max()) + 2
+        dz = int(cells[:, 2].max()) + 2
+        keys = (cells[:, 0] * dy + cells[:, 1]) * dz + cells[:, 2]
+        order = argsort(keys, kind='stable')
+        keys = keys[order]
+        x, y, z = xyz[order].T
+        radii = radii[order]
+        index = arange(size)
+
+        found_n, found_m, found_d = [], [], []
+        for sx, sy, sz in [(0, 0, 0)] + half_shell:
+            shift = (sx * dy + sy) * dz + sz
+            end = searchsorted(keys, keys + shift, 'right')
+            if shift:
+                start = searchsorted(keys, keys + shift, 'left')
+            else:  # same cell. only next atoms
+                start = index + 1
+            count = end - start
+            count[count < 0] = 0
+            total = int(count.sum())
+            if not total:
+                continue
+            n = repeat(index, count)
+            m = arange(total) - repeat(cumsum(count) - count - start, count)
+            d = v_sqrt((x[n] - x[m]) ** 2 + (y[n] - y[m]) ** 2 + (z[n] - z[m]) ** 2)
+            mask = d <= (radii[n] + radii[m]) * multiplier
+            found_n.append(order[n[mask]])
+            found_m.append(order[m[mask]])
+            found_d.append(d[mask])
+        if not found_n:
+            return possible_bonds
+
+        n = concatenate(found_n)
+        m = concatenate(found_m)
+        d = concatenate(found_d)
+        n, m = n.clip(max=m), m.clip(min=n)
+        pairs = lexsort((m, n))  # order of atoms in conformer
+        for n, m, d in zip(n[pairs].tolist(), m[pairs].tolist(), d[pairs].tolist()):
+            n = numbers[n]
+            m = numbers[m]
             possible_bonds[n][m] = possible_bonds[m][n] = d
         return possible_bonds
 else:
     def get_possible_bonds(atoms, conformer, multiplier):
+        """
+        Pairs of atoms closer than sum of covalent radii multiplied by `multiplier`.
+
+        Space split into cubic cells with edge equal to the longest possible bond.
+        Only atoms of the same or adjacent cells compared.
+        """
         possible_bonds = {n: {} for n in atoms}  # distance matrix
+        if len(conformer) < 2:
+            return possible_bonds
         radii = {n: a.atomic_radius for n, a in atoms.items()}
-        for (n, (nx, ny, nz)), (m, (mx, my, mz)) in combinations(conformer.items(), 2):
-            d = sqrt((nx - mx) ** 2 + (ny - my) ** 2 + (nz - mz) ** 2)
-            r = (radii[n] + radii[m]) * multiplier
-            if d <= r:
-                possible_bonds[n][m] = possible_bonds[m][n] = d
+        edge = max(radii.values()) * 2 * multiplier
+        x0, y0, z0 = (min(c) for c in zip(*conformer.values()))
+
+        cells = defaultdict(list)
+        for i, (n, (x, y, z)) in enumerate(conformer.items()):
+            cells[(int((x - x0) // edge), int((y - y0) // edge), int((z - z0) // edge))].append((i, n, x, y, z))
+
+        found = []
+        for (cx, cy, cz), cell in cells.items():
+            pairs = [combinations(cell, 2)]
+            for sx, sy, sz in half_shell:
+                neighbor = cells.get((cx + sx, cy + sy, cz + sz))
+                if neighbor:
+                    pairs.append(product(cell, neighbor))
+            for (i, n, nx, ny, nz), (j, m, mx, my, mz) in chain.from_iterable(pairs):
+                d = sqrt((nx - mx) ** 2 + (ny - my) ** 2 + (nz - mz) ** 2)
+                if d <= (radii[n] + radii[m]) * multiplier:
+                    found.append((i, n, j, m, d) if i < j else (j, m, i, n, d))
+
+        found.sort()  # order of atoms in conformer
+        for _, n, _, m, d in found:
+            possible_bonds[n][m] = possible_bonds[m][n] = d
         return possible_bonds
 
 
@@ -94,8 +150,8 @@ class XYZ:
 
         conformer = {}
         defined_charges = {}
-        for a, c, x, y, z in matrix:
-            n = mol.add_atom(a, xy=(x, y))
+        for n, (a, c, x, y, z) in enumerate(matrix, start=1):  # explicit numbers. search of free number is O(n)
+            mol.add_atom(a, n, xy=(x, y))
             conformer[n] = (x, y, z)
             defined_charges[n] = c
 
@@ -331,7 +387,7 @@ class XYZ:
 class XYZRead(XYZ):
     """XYZ files reader. Works similar to opened file object. Support `with` context manager.
     On initialization accept opened in text mode file, string path to file,
-    pathlib.Path object or another buffered reader object.
+    pathlib.Path object or another buffered reader object. gzip, xz, bz2 and zstd compressed files supported.
 
     Supported multiple structures in same file. In second line possible to store total charge of system. Example::
 
@@ -342,17 +398,8 @@ class XYZRead(XYZ):
 
     """
     def __init__(self, file, **kwargs):
-        if isinstance(file, str):
-            self.__file = open(file)
-            self.__is_buffer = False
-        elif isinstance(file, Path):
-            self.__file = file.open()
-            self.__is_buffer = False
-        elif isinstance(file, (TextIOWrapper, StringIO)):
-            self.__file = file
-            self.__is_buffer = True
-        else:
-            raise TypeError('invalid file. TextIOWrapper, StringIO subclasses possible')
+        self.__file, path, _ = open_read(file)
+        self.__is_buffer = path is None
         super().__init__(**kwargs)
         self._data = self.__reader()
 
@@ -362,8 +409,7 @@ class XYZRead(XYZ):
 
         :param force: Force closing of externally opened file or buffer
         """
-        if not self.__is_buffer or force:
-            self.__file.close()
+        close_file(self.__file, self.__is_buffer, force)
 
     def __enter__(self):
         return self
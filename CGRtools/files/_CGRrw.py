@@ -43,10 +43,21 @@ elements_list = list(common_isotopes)
 
 
 class CGRRead:
+    _warnings = None  # list collector of not critical problems of records. if None problems logged
+
     def __init__(self, remap=True, ignore=False):
         self.__remap = remap
         self._ignore = ignore
 
+    def _warning(self, message: str):
+        """
+        report not critical problem of record
+        """
+        if self._warnings is None:
+            warning(message)
+        else:
+            self._warnings.append(message)
+
     def _convert_reaction(self, reaction):
         if not (reaction['reactants'] or reaction['products'] or reaction['reagents']):
             raise ValueError('empty reaction')
@@ -60,7 +71,7 @@ class CGRRead:
                         if m in used:
                             if not self._ignore:
                                 raise MappingError('mapping in molecules should be unique')
-                            warning(f'non-unique mapping in molecule: {m}')
+                            self._warning(f'non-unique mapping in molecule: {m}')
                         else:
                             used.add(m)
                     tmp.append(m)
@@ -80,7 +91,7 @@ class CGRRead:
                         raise MappingError('mapping in reagents or products or reactants should be unique')
                     # force remap non unique atoms in molecules.
                     remap.append(next(length))
-                    warning(f'mapping changed: {m} to {remap[-1]}')
+                    self._warning(f'mapping changed: {m} to {remap[-1]}')
                 else:
                     remap.append(m)
                     used.add(m)
@@ -91,7 +102,7 @@ class CGRRead:
                 e = f'reagents has map intersection with reactants or products: {tmp}'
                 if not self._ignore:
                     raise MappingError(e)
-                warning(e)
+                self._warning(e)
                 maps['reagents'] = [x if x not in tmp else next(length) for x in maps['reagents']]
 
         # find breaks in map. e.g. 1,2,5,6. 3,4 - skipped
@@ -122,25 +133,35 @@ class CGRRead:
         if self.__remap:
             remapped = {n: k for n, k in enumerate(range(1, len(molecule['atoms']) + 1))}
         else:
-            length = count(max(x['mapping'] for x in molecule['atoms']) + 1)
-            remapped, used = {}, set()
-            for n, atom in enumerate(molecule['atoms']):
-                m = atom['mapping']
-                if not m:
-                    remapped[n] = next(length)
-                elif m in used:
-                    if not self._ignore:
-                        raise MappingError('mapping in molecules should be unique')
-                    remapped[n] = next(length)
-                    warning(f'mapping in molecule changed: {m} to {remapped[n]}')
-                else:
-                    remapped[n] = m
-                    used.add(m)
+            remapped = self._remap_structure([x['mapping'] for x in molecule['atoms']])
 
         g = self.__prepare_structure(molecule, remapped)
         g.meta.update(molecule['meta'])
         return g, remapped
 
+    @property
+    def _remap(self) -> bool:
+        return self.__remap
+
+    def _remap_structure(self, parsed_mapping):
+        """
+        Atoms numbers from parsed mapping. Unmapped and duplicated atoms numbered after maximal mapping.
+        """
+        length = count(max(parsed_mapping) + 1)
+        remapped, used = {}, set()
+        for n, m in enumerate(parsed_mapping):
+            if not m:
+                remapped[n] = next(length)
+            elif m in used:
+                if not self._ignore:
+                    raise MappingError('mapping in molecules should be unique')
+                remapped[n] = next(length)
+                self._warning(f'mapping in molecule changed: {m} to {remapped[n]}')
+            else:
+                remapped[n] = m
+                used.add(m)
+        return remapped
+
     @staticmethod
     def __convert_molecule(molecule, mapping):
         g = MoleculeContainer()
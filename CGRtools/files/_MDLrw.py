@@ -17,20 +17,31 @@
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
 from base64 import urlsafe_b64encode
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from csv import reader
+from hashlib import blake2b
 from logging import warning, info
-from io import StringIO, TextIOWrapper
+from io import StringIO
+from functools import partial
 from itertools import chain, islice
-from os.path import abspath, join
-from pathlib import Path
-from pickle import dump, load, UnpicklingError
+from mmap import mmap, ACCESS_READ
+from os import stat as os_stat
+from os.path import join
+from struct import Struct, pack, unpack_from
 from tempfile import gettempdir
+from typing import Iterator, List, Tuple
 from ._CGRrw import CGRRead, common_isotopes
+from ._compress import close_file, open_read, open_write
 from ..containers import MoleculeContainer, CGRContainer, QueryContainer, QueryCGRContainer
 from ..exceptions import EmptyMolecule, NotChiral, IsChiral, ValenceError
 
 
+index_magic = b'CGRIDX'
+index_version = 2
+# magic, version, source size, source mtime, source hash, end of scanned complete lines, offsets count
+index_header = Struct('<6sHQQ16sQQ')
+
 query_keys = {'atomhyb': 'hybridization', 'hybridization': 'hybridization', 'hyb': 'hybridization',
               'atomneighbors': 'neighbors', 'neighbors': 'neighbors'}
 
@@ -460,18 +471,12 @@ class MDLReadMeta(type):
 
 
 class MDLRead(CGRRead, metaclass=MDLReadMeta):
-    def __init__(self, file, **kwargs):
-        if isinstance(file, str):
-            self._file = open(file)
-            self._is_buffer = False
-        elif isinstance(file, Path):
-            self._file = file.open()
-            self._is_buffer = False
-        elif isinstance(file, (TextIOWrapper, StringIO)):
-            self._file = file
-            self._is_buffer = True
-        else:
-            raise TypeError('invalid file. TextIOWrapper, StringIO subclasses possible')
+    def __init__(self, file, *, seekable=False, **kwargs):
+        """
+        :param seekable: random access to compressed file required
+        """
+        self._file, self._path, self._compression = open_read(file, seekable=seekable)
+        self._is_buffer = self._path is None
         super().__init__(**kwargs)
 
     def close(self, force=False):
@@ -480,8 +485,7 @@ class MDLRead(CGRRead, metaclass=MDLReadMeta):
 
         :param force: force closing of externally opened file or buffer
         """
-        if not self._is_buffer or force:
-            self._file.close()
+        close_file(self._file, self._is_buffer, force)
 
     def __enter__(self):
         return self
@@ -489,33 +493,166 @@ class MDLRead(CGRRead, metaclass=MDLReadMeta):
     def __exit__(self, _type, value, traceback):
         self.close()
 
-    def _load_cache(self):
+    def _load_index(self):
+        """
+        byte offsets of records. offsets stored in sidecar file near source file or in temp directory if
+        source directory is not writable. sidecar with equal source file size and mtime used as is.
+        otherwise sidecar validated by hash of whole indexed content: for touched files only mtime updated,
+        for appended not compressed files only new data scanned. any other change triggers full rescan.
+
+        :return: list of byte offsets of records and end of last record
+        """
+        name = self._path
+        paths = (name + '.cgridx',
+                 join(gettempdir(), 'cgrtools_' + urlsafe_b64encode(name.encode()).decode() + '.cgridx'))
+        stat = os_stat(self._path)
+        size = stat.st_size
+        mtime = stat.st_mtime_ns
+        if not size:
+            return self._index_offsets([], 0)
+
+        with open(name, 'rb') as f, mmap(f.fileno(), 0, access=ACCESS_READ) as data:
+            offsets = None
+            for path in paths:
+                index = self.__read_index(path)
+                if index is None:
+                    continue
+                i_size, i_mtime, i_hash, i_scanned, i_offsets = index
+                if i_size == size and i_mtime == mtime:
+                    return i_offsets
+                if i_size > size or i_hash != self.__hash(data, i_size):
+                    continue  # file changed
+                if i_size == size:  # touched. update mtime
+                    self.__write_index(paths, size, mtime, i_hash, i_scanned, i_offsets)
+                    return i_offsets
+                if not self._compression:  # appended. scan only new data
+                    offsets, start = self._index_resume(i_offsets, i_scanned)
+                    offsets.extend(self._index_scan(data, start, size))
+                break
+
+            if self._compression:  # offsets in decompressed data
+                offsets, total, scanned = self.__scan_stream()
+            else:
+                if offsets is None:
+                    offsets = self._index_scan(data, 0, size)
+                total = size
+                scanned = data.rfind(b'\n', 0, size) + 1  # end of last complete line
+            offsets = self._index_offsets(offsets, total)
+            self.__write_index(paths, size, mtime, self.__hash(data, size), scanned, offsets)
+        return offsets
+
+    def __scan_stream(self):
+        """
+        scan decompressed file by chunks of complete lines
+        """
+        offsets = []
+        start = 0
+        tail = b''
+        stream, *_ = open_read(self._path, binary=True)
+        with stream:
+            for chunk in iter(partial(stream.read, 1 << 24), b''):
+                chunk = tail + chunk
+                end = chunk.rfind(b'\n') + 1
+                offsets.extend(start + x for x in self._index_scan(chunk, 0, end))
+                start += end
+                tail = chunk[end:]
+        offsets.extend(start + x for x in self._index_scan(tail, 0, len(tail)))
+        return offsets, start + len(tail), start
+
+    @staticmethod
+    def _index_scan(data, start: int, stop: int) -> List[int]:
+        """
+        offsets of records in data[start:stop]. start is beginning of line
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _index_resume(offsets: List[int], scanned: int) -> Tuple[List[int], int]:
+        """
+        scanned offsets not affected by appended data and position from which scanning should be continued.
+
+        :param offsets: complete offsets of records
+        :param scanned: end of complete lines of indexed data
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _index_offsets(offsets: List[int], size: int) -> List[int]:
+        """
+        complete offsets of records from scanned offsets
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _line_starts(data, prefix: bytes, start: int, stop: int) -> Iterator[int]:
         """
-        the method is implemented for the purpose of optimization, byte positions will not be re-read from a file
-        that has already been used, if the content of the file has changed, and the name has been left the same,
-        the old version of byte offsets will be loaded
-        :return: list of byte offsets from existing file
+        positions of lines started with prefix
         """
+        if data[start: start + len(prefix)] == prefix:
+            yield start
+        prefix = b'\n' + prefix
+        while True:
+            start = data.find(prefix, start, stop)
+            if start == -1:
+                return
+            start += 1
+            yield start
+
+    @staticmethod
+    def __hash(data, size: int) -> bytes:
+        """
+        hash of first size bytes of file
+        """
+        h = blake2b(digest_size=16)
+        for start in range(0, size, 1 << 24):
+            h.update(data[start: min(start + (1 << 24), size)])
+        return h.digest()
+
+    @staticmethod
+    def __read_index(path):
         try:
-            with open(self.__cache_path, 'rb') as f:
-                return load(f)
+            with open(path, 'rb') as f:
+                data = f.read()
         except FileNotFoundError:
             return
         except IsADirectoryError as e:
-            raise IsADirectoryError(f'Please delete {self.__cache_path} directory') from e
-        except (UnpicklingError, EOFError) as e:
-            raise UnpicklingError(f'Invalid cache file {self.__cache_path}. Please delete it') from e
+            raise IsADirectoryError(f'Please delete {path} directory') from e
+        if len(data) < index_header.size:
+            return
+        magic, version, size, mtime, hash_, scanned, count = index_header.unpack_from(data)
+        if magic != index_magic or version != index_version or len(data) != index_header.size + count * 8:
+            return
+        return size, mtime, hash_, scanned, list(unpack_from(f'<{count}Q', data, index_header.size))
 
-    @property
-    def __cache_path(self):
-        return abspath(join(gettempdir(), 'cgrtools_' + urlsafe_b64encode(abspath(self._file.name).encode()).decode()))
+    @staticmethod
+    def __write_index(paths, size, mtime, hash_, scanned, offsets):
+        data = index_header.pack(index_magic, index_version, size, mtime, hash_, scanned, len(offsets)) + \
+            pack(f'<{len(offsets)}Q', *offsets)
+        for path in paths:
+            try:
+                with open(path, 'wb') as f:
+                    f.write(data)
+            except OSError:  # not writable directory
+                continue
+            return
 
-    def _dump_cache(self, _shifts):
+    def _parallel_reader(self, chunks, workers: int, **kwargs):
         """
-        _shifts dumps in /tmp directory after reboot it will drop
+        parse chunks of file text in process pool. records returned in original order.
+        only two chunks per worker are kept in memory.
+
+        :param chunks: iterator of texts of complete records
+        :param kwargs: reader options
         """
-        with open(self.__cache_path, 'wb') as f:
-            dump(_shifts, f)
+        cls = self.__class__
+        pending = deque()
+        with ProcessPoolExecutor(workers) as executor:
+            for chunk in chunks:
+                pending.append(executor.submit(parse_chunk, cls, chunk, kwargs))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
 
     def read(self):
         """
@@ -588,24 +725,21 @@ class MDLRead(CGRRead, metaclass=MDLReadMeta):
     _implement_error = NotImplementedError('Indexable supported in unix-like o.s. and for files stored on disk')
 
 
+def parse_chunk(cls, chunk, kwargs):
+    """
+    parse text of records in worker process. records with errors returned as None
+    """
+    with cls(StringIO(chunk), **kwargs) as f:
+        return list(f._data)
+
+
 class MDLWrite:
     def __init__(self, file, *, write3d: int = 0):
         """
         :param write3d: write for Molecules 3D coordinates instead 2D if exists.
             if 0 - 2D only, 1 - first 3D, 2 - all 3D in sequence.
         """
-        if isinstance(file, str):
-            self._file = open(file, 'w')
-            self._is_buffer = False
-        elif isinstance(file, Path):
-            self._file = file.open('w')
-            self._is_buffer = False
-        elif isinstance(file, (TextIOWrapper, StringIO)):
-            self._file = file
-            self._is_buffer = True
-        else:
-            raise TypeError('invalid file. '
-                            'TextIOWrapper, StringIO, BytesIO, BufferedReader and BufferedIOBase subclasses possible')
+        self._file, self._is_buffer = open_write(file)
 
         if not isinstance(write3d, int):
             raise TypeError('int expected')
@@ -624,8 +758,7 @@ class MDLWrite:
             self.write = self.__write_closed
             self.__write = False
 
-        if not self._is_buffer or force:
-            self._file.close()
+        close_file(self._file, self._is_buffer, force)
 
     def __enter__(self):
         return self
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
+
+
+class BulkParser:
+    """
+    Parsing of many strings per call. Readers should implement `_create_reader` classmethod returning reader
+    object without file and `_parse` method which raises ValueError on invalid string.
+    Not critical problems should be reported by `_warning` method.
+    """
+    @classmethod
+    def parse_many(cls, strings: Iterable[str], workers: int = 1, chunksize: int = 1000, packed: bool = False,
+                   **kwargs) -> Tuple[List, Dict[int, str], Dict[int, List[str]]]:
+        """
+        Parse many strings. Errors and warnings not logged but returned by index of string.
+
+        :param strings: strings in same format as lines of file
+        :param workers: number of processes for parsing. Strings split into chunks which parsed in parallel.
+        :param chunksize: number of strings in chunk
+        :param packed: return packed containers (see `pack` method of containers) instead of objects.
+            Packed containers are cheaper to transfer from worker processes.
+        :param kwargs: parser options same as for `create_parser`
+        :return: list of parsed records in order of strings with None for invalid strings,
+            dict of errors messages of invalid strings by index and
+            dict of lists of warnings (e.g. invalid metadata or ignored problems) by index of string
+        """
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError('workers should be positive integer')
+        if not isinstance(chunksize, int) or chunksize < 1:
+            raise ValueError('chunksize should be positive integer')
+
+        if workers == 1:
+            return parse_batch(cls, strings, kwargs, packed)
+
+        records = []
+        errors = {}
+        warnings = {}
+
+        def collect(future):
+            chunk_records, chunk_errors, chunk_warnings = future.result()
+            shift = len(records)
+            records.extend(chunk_records)
+            errors.update((shift + n, e) for n, e in chunk_errors.items())
+            warnings.update((shift + n, w) for n, w in chunk_warnings.items())
+
+        strings = iter(strings)
+        pending = deque()
+        with ProcessPoolExecutor(workers) as executor:
+            for chunk in iter(lambda: list(islice(strings, chunksize)), []):
+                pending.append(executor.submit(parse_batch, cls, chunk, kwargs, packed))
+                if len(pending) >= workers * 2:  # only two chunks per worker are kept in memory
+                    collect(pending.popleft())
+            while pending:
+                collect(pending.popleft())
+        return records, errors, warnings
+
+
+def parse_batch(cls, strings, kwargs, packed):
+    """
+    parse strings in worker process
+    """
+    reader = cls._create_reader(**kwargs)
+    parse = reader._parse
+    records = []
+    errors = {}
+    warnings = {}
+    for n, string in enumerate(strings):
+        reader._warnings = messages = []
+        try:
+            record = parse(string)
+        except ValueError as e:
+            errors[n] = f'{e.__class__.__name__}: {e}'
+            records.append(None)
+        else:
+            records.append(record.pack() if packed else record)
+        if messages:
+            warnings[n] = messages
+    return records, errors, warnings
+
+
+__all__ = ['BulkParser']
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Transparent gzip, xz, bz2 and zstd (if zstandard installed) compression of files.
+Compression of input detected by magic bytes, of output by file extension.
+"""
+from bisect import bisect_right
+from bz2 import BZ2File
+from gzip import GzipFile
+from importlib.util import find_spec
+from io import BufferedIOBase, BufferedReader, RawIOBase, TextIOBase, TextIOWrapper, SEEK_CUR, SEEK_SET
+from lzma import LZMAFile
+from os.path import abspath
+from pathlib import Path
+from typing import IO, Optional, Tuple
+from zlib import decompressobj
+
+
+if find_spec('zstandard'):
+    from zstandard import ZstdCompressor, ZstdDecompressor
+else:
+    ZstdCompressor = ZstdDecompressor = None
+
+
+magics = ((b'\x1f\x8b', 'gzip'), (b'\xfd7zXZ\x00', 'xz'), (b'BZh', 'bz2'), (b'\x28\xb5\x2f\xfd', 'zstd'))
+extensions = {'.gz': 'gzip', '.gzip': 'gzip', '.xz': 'xz', '.lzma': 'xz', '.bz2': 'bz2', '.zst': 'zstd',
+              '.zstd': 'zstd'}
+
+
+def open_read(file, binary: bool = False, seekable: bool = False) -> Tuple[IO, Optional[str], Optional[str]]:
+    """
+    Open file for reading. Compressed files and binary buffers decompressed on the fly.
+
+    :param file: path string, pathlib.Path, text or binary file object
+    :param binary: return binary stream instead text
+    :param seekable: random access to decompressed stream required
+    :return: file object, absolute path of opened by path file or None for external file object and compression
+    """
+    if isinstance(file, (str, Path)):
+        path = abspath(file)
+        stream = open(path, 'rb')
+    elif isinstance(file, TextIOBase):
+        if binary:
+            raise TypeError('binary file object expected')
+        return file, None, None
+    elif isinstance(file, (BufferedIOBase, RawIOBase)):
+        path = None
+        stream = file
+    else:
+        raise TypeError('invalid file. path, text or binary file object expected')
+
+    compression = detect(stream)
+    if compression:
+        try:
+            stream = decompress(stream, compression, seekable, path is not None)
+        except Exception:
+            if path:
+                stream.close()
+            raise
+    if binary:
+        return stream, path, compression
+    if path is None:
+        return BufferWrapper(stream), path, compression
+    return TextIOWrapper(stream), path, compression
+
+
+def open_write(file, binary: bool = False) -> Tuple[IO, bool]:
+    """
+    Open file for writing. Compression detected by extension of path.
+
+    :param file: path string, pathlib.Path, text or binary file object
+    :param binary: return binary stream instead text
+    :return: file object and flag of external file object
+    """
+    if isinstance(file, (str, Path)):
+        path = str(file)
+        compression = next((c for e, c in extensions.items() if path.endswith(e)), None)
+        if compression is None:
+            return open(path, 'wb' if binary else 'w'), False
+        stream = compress(open(path, 'wb'), compression)
+        if binary:
+            return stream, False
+        return TextIOWrapper(stream), False
+    elif isinstance(file, TextIOBase):
+        if binary:
+            raise TypeError('binary file object expected')
+        return file, True
+    elif isinstance(file, (BufferedIOBase, RawIOBase)):
+        if binary:
+            return file, True
+        return BufferWrapper(file), True
+    raise TypeError('invalid file. path, text or binary file object expected')
+
+
+def close_file(file, external: bool, force: bool = False):
+    """
+    Close file object opened by `open_read` or `open_write`.
+
+    :param external: file object opened by caller. kept open if not forced
+    :param force: close external file object
+    """
+    if isinstance(file, BufferWrapper):  # own wrapper of external binary buffer
+        buffer = None if file.closed else file.buffer
+        file.close()
+        if force and buffer is not None:
+            buffer.close()
+    elif not external or force:
+        file.close()
+
+
+def detect(stream) -> Optional[str]:
+    """
+    Compression of binary stream by magic bytes. Stream position not changed.
+    """
+    if isinstance(stream, BufferedReader):
+        head = stream.peek(6)[:6]
+    else:
+        position = stream.tell()
+        head = stream.read(6)
+        stream.seek(position)
+    for magic, compression in magics:
+        if head.startswith(magic):
+            return compression
+
+
+def decompress(stream, compression: str, seekable: bool = False, closefd: bool = True):
+    """
+    Decompressing binary stream.
+
+    :param closefd: close underlying stream on closing of decompressing stream
+    """
+    if compression == 'gzip':
+        if seekable:
+            return BufferedReader(GzipCheckpoints(stream, closefd=closefd))
+        stream = GzipFile(fileobj=stream)
+        if closefd:
+            stream.myfileobj = stream.fileobj
+        return stream
+    elif compression == 'xz':
+        stream = LZMAFile(stream)
+    elif compression == 'bz2':
+        stream = BZ2File(stream)
+    elif ZstdDecompressor is None:
+        raise ImportError('zstandard package required for zstd compressed files')
+    elif seekable:
+        raise ValueError('random access to zstd compressed files not supported')
+    else:
+        return BufferedReader(ZstdDecompressor().stream_reader(stream, closefd=closefd))
+    stream._closefp = closefd
+    return stream
+
+
+def compress(stream, compression: str):
+    """
+    Compressing binary stream. Underlying stream closed on closing of compressing stream.
+    """
+    if compression == 'gzip':
+        stream = GzipFile(fileobj=stream, mode='wb')
+        stream.myfileobj = stream.fileobj
+        return stream
+    elif compression == 'xz':
+        stream = LZMAFile(stream, 'wb')
+    elif compression == 'bz2':
+        stream = BZ2File(stream, 'wb')
+    elif ZstdCompressor is None:
+        raise ImportError('zstandard package required for zstd compressed files')
+    else:
+        return ZstdCompressor().stream_writer(stream, closefd=True)
+    stream._closefp = True
+    return stream
+
+
+class BufferWrapper(TextIOWrapper):
+    """
+    Text wrapper of external binary buffer. Closing flushes and detaches wrapper, thus buffer stays open
+    even on garbage collection of wrapper.
+    """
+    __detached = False
+
+    @property
+    def closed(self):
+        return self.__detached or super().closed
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+            self.detach()
+            self.__detached = True
+
+
+class GzipCheckpoints(RawIOBase):
+    """
+    Seekable gzip stream. While reading, decompressor state is saved after every `interval` bytes of data.
+    Seek continues decompression from closest preceding checkpoint instead of beginning of file.
+    """
+    def __init__(self, stream, interval: int = 1 << 22, closefd: bool = True):
+        """
+        :param stream: seekable binary stream of gzip file
+        :param interval: minimal distance in decompressed bytes between checkpoints
+        :param closefd: close stream on closing
+        """
+        self._stream = stream
+        self._closefd = closefd
+        self._interval = interval
+        self._start = stream.tell()
+        self._checkpoints = [(0, self._start, None)]  # decompressed position, compressed position, decompressor
+        self.__restore(0)
+
+    @property
+    def name(self):
+        return self._stream.name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def fileno(self):
+        return self._stream.fileno()
+
+    def close(self):
+        if not self.closed and self._closefd:
+            self._stream.close()
+        super().close()
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_CUR:
+            offset += self._position
+        elif whence != SEEK_SET:
+            raise ValueError('only SEEK_SET and SEEK_CUR supported')
+        if offset < 0:
+            raise ValueError('negative seek position')
+
+        if offset < self._position or offset - self._position > self._interval:
+            checkpoint = bisect_right(self._checkpoints, (offset, float('inf'))) - 1
+            if offset < self._position or self._checkpoints[checkpoint][0] > self._position:
+                self.__restore(checkpoint)
+        while self._position < offset:
+            if not self.__skip(offset - self._position):
+                break
+        return self._position
+
+    def readinto(self, buffer):
+        while not self._output:
+            if not self.__fill():
+                return 0
+        size = min(len(buffer), len(self._output))
+        buffer[:size] = self._output[:size]
+        self._output = self._output[size:]
+        self._position += size
+        return size
+
+    def __skip(self, size):
+        while not self._output:
+            if not self.__fill():
+                return False
+        size = min(size, len(self._output))
+        self._output = self._output[size:]
+        self._position += size
+        return True
+
+    def __restore(self, checkpoint):
+        position, offset, decompressor = self._checkpoints[checkpoint]
+        self._stream.seek(offset)
+        self._decompressor = decompressor.copy() if decompressor else decompressobj(31)
+        self._position = position
+        self._tail = b''
+        self._output = b''
+
+    def __fill(self):
+        decompressor = self._decompressor
+        if self._tail:
+            data = self._tail
+        else:  # all input consumed and output returned. good place for checkpoint
+            if self._position >= self._checkpoints[-1][0] + self._interval:
+                self._checkpoints.append((self._position, self._stream.tell(), decompressor.copy()))
+            data = self._stream.read(1 << 16)
+            if not data:
+                return False
+        if decompressor.eof:  # next gzip member
+            decompressor = self._decompressor = decompressobj(31)
+        self._output = decompressor.decompress(data, 1 << 20)
+        self._tail = decompressor.unconsumed_tail or decompressor.unused_data
+        return True
+
@@ -197,7 +197,7 @@ class Element(Core):
             g._calc_implicit(self._map)
             if self._map in g._atoms_stereo:
                 del g._atoms_stereo[self._map]
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -209,7 +209,7 @@ class Element(Core):
             g._calc_implicit(self._map)
             if self._map in g._atoms_stereo:
                 del g._atoms_stereo[self._map]
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -373,7 +373,7 @@ class Query(Core):
             g._charges[self._map] = g._validate_charge(charge)
             if self._map in g._atoms_stereo:
                 del g._atoms_stereo[self._map]
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -384,7 +384,7 @@ class Query(Core):
             g._radicals[self._map] = g._validate_radical(is_radical)
             if self._map in g._atoms_stereo:
                 del g._atoms_stereo[self._map]
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -393,7 +393,7 @@ class Query(Core):
         try:
             g = self._graph()
             g._neighbors[self._map] = g._validate_neighbors(neighbors)
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -402,7 +402,7 @@ class Query(Core):
         try:
             g = self._graph()
             g._hybridizations[self._map] = g._validate_hybridization(hybridization)
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -422,7 +422,7 @@ class Dynamic(Core):
         try:
             g = self._graph()
             g._charges[self._map] = g._validate_charge(charge)
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -431,7 +431,7 @@ class Dynamic(Core):
         try:
             g = self._graph()
             g._radicals[self._map] = g._validate_radical(is_radical)
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -447,7 +447,7 @@ class Dynamic(Core):
         try:
             g = self._graph()
             g._p_charges[self._map] = g._validate_charge(charge)
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -463,7 +463,7 @@ class Dynamic(Core):
         try:
             g = self._graph()
             g._p_radicals[self._map] = g._validate_radical(is_radical)
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -493,7 +493,7 @@ class DynamicQuery(Dynamic):
             neighbors, p_neighbors = g._validate_neighbors_pairing(neighbors, g._p_neighbors[self._map])
             g._neighbors[self._map] = neighbors
             g._p_neighbors[self._map] = p_neighbors
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -506,7 +506,7 @@ class DynamicQuery(Dynamic):
                                                                                g._p_hybridizations[self._map])
             g._hybridizations[self._map] = hybridization
             g._p_hybridizations[self._map] = p_hybridization
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -518,7 +518,7 @@ class DynamicQuery(Dynamic):
             neighbors, p_neighbors = g._validate_neighbors_pairing(g._neighbors[self._map], p_neighbors)
             g._neighbors[self._map] = neighbors
             g._p_neighbors[self._map] = p_neighbors
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -531,7 +531,7 @@ class DynamicQuery(Dynamic):
                                                                                p_hybridization)
             g._hybridizations[self._map] = hybridization
             g._p_hybridizations[self._map] = p_hybridization
-            g.flush_cache()
+            g.flush_cache('atoms')
         except AttributeError:
             raise IsNotConnectedAtom
 
@@ -643,7 +643,7 @@ class QueryElement(Query):
                     return True
         elif isinstance(other, QueryElement) and self.atomic_number == other.atomic_number and \
                 self.isotope == other.isotope and self.charge == other.charge and self.is_radical == other.is_radical \
-                and self.neighbors == other.neighbors and self.hybridization and other.hybridization:
+                and self.neighbors == other.neighbors and self.hybridization == other.hybridization:
             # equal query element has equal query marks
             return True
         return False
@@ -710,8 +710,8 @@ class DynamicQueryElement(DynamicQuery):
         elif isinstance(other, DynamicQueryElement) and self.atomic_number == other.atomic_number and \
                 self.isotope == other.isotope and self.charge == other.charge and self.p_charge == other.p_charge and \
                 self.is_radical == other.is_radical and self.p_is_radical == other.p_is_radical and \
-                self.neighbors == other.neighbors and self.hybridization and other.hybridization and \
-                self.p_neighbors == other.p_neighbors and self.p_hybridization and other.p_hybridization:
+                self.neighbors == other.neighbors and self.hybridization == other.hybridization and \
+                self.p_neighbors == other.p_neighbors and self.p_hybridization == other.p_hybridization:
             # equal query element has equal query marks
             return True
         return False
@@ -765,11 +765,11 @@ class AnyElement(Query):  # except Hydrogen!
                     return True
         elif isinstance(other, QueryElement):
             if other.atomic_number != 1 and self.charge == other.charge and self.is_radical == other.is_radical \
-                    and self.neighbors == other.neighbors and self.hybridization and other.hybridization:
+                    and self.neighbors == other.neighbors and self.hybridization == other.hybridization:
                 return True
         elif isinstance(other, AnyElement):
             if self.charge == other.charge and self.is_radical == other.is_radical \
-                    and self.neighbors == other.neighbors and self.hybridization and other.hybridization:
+                    and self.neighbors == other.neighbors and self.hybridization == other.hybridization:
                 return True
         return False
 
@@ -820,15 +820,15 @@ class DynamicAnyElement(DynamicQuery):  # except Hydrogen!
         elif isinstance(other, DynamicQueryElement):
             if other.atomic_number != 1 and self.charge == other.charge and self.p_charge == other.p_charge and \
                     self.is_radical == other.is_radical and self.p_is_radical == other.p_is_radical and \
-                    self.neighbors == other.neighbors and self.hybridization and other.hybridization and \
-                    self.p_neighbors == other.p_neighbors and self.p_hybridization and other.p_hybridization:
+                    self.neighbors == other.neighbors and self.hybridization == other.hybridization and \
+                    self.p_neighbors == other.p_neighbors and self.p_hybridization == other.p_hybridization:
                 # equal query element has equal query marks
                 return True
         elif isinstance(other, DynamicAnyElement):
             if self.charge == other.charge and self.p_charge == other.p_charge and \
                     self.is_radical == other.is_radical and self.p_is_radical == other.p_is_radical and \
-                    self.neighbors == other.neighbors and self.hybridization and other.hybridization and \
-                    self.p_neighbors == other.p_neighbors and self.p_hybridization and other.p_hybridization:
+                    self.neighbors == other.neighbors and self.hybridization == other.hybridization and \
+                    self.p_neighbors == other.p_neighbors and self.p_hybridization == other.p_hybridization:
                 # equal query element has equal query marks
                 return True
         return False
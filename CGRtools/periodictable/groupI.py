@@ -75,7 +75,7 @@ class Li(Element, PeriodII, GroupI):
 
     @property
     def atomic_radius(self):
-        return 167
+        return 1.67
 
 
 class Na(Element, PeriodIII, GroupI):
@@ -16,11 +16,16 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
+from itertools import islice
 from logging import warning
 from operator import or_
+from typing import Iterable, Iterator, Optional, Union
 from warnings import warn
 from .containers import MoleculeContainer, CGRContainer, ReactionContainer
+from .exceptions import MappingError
 
 
 class CGRPreparer:
@@ -59,6 +64,53 @@ class CGRPreparer:
         g.meta.update(data.meta)
         return g
 
+    def compose_many(self, reactions: Iterable[ReactionContainer], workers: int = 1, chunksize: int = 100,
+                     packed: bool = False) -> Iterator[Optional[Union[CGRContainer, bytes]]]:
+        """
+        Condense stream of reactions. CGRs returned in order of reactions. For not condensable reactions
+        (mapping errors or queries) and not reactions None returned.
+
+        :param reactions: reactions iterable. E.g. RDFRead object.
+        :param workers: number of processes. Reactions split into chunks which condensed in parallel.
+            Only two chunks per worker are kept in memory.
+        :param chunksize: number of reactions in chunk
+        :param packed: return packed CGRs (see `pack` method of containers) instead of objects.
+            Packed CGRs are cheaper to transfer from worker processes.
+        """
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError('workers should be positive integer')
+        if not isinstance(chunksize, int) or chunksize < 1:
+            raise ValueError('chunksize should be positive integer')
+
+        if workers == 1:
+            for reaction in reactions:
+                yield self._compose_safe(reaction, packed)
+            return
+
+        reactions = iter(reactions)
+        pending = deque()
+        with ProcessPoolExecutor(workers) as executor:
+            # reactions transferred to workers packed. cheaper than pickling
+            for chunk in iter(lambda: [x.pack() if isinstance(x, ReactionContainer) else None
+                                       for x in islice(reactions, chunksize)], []):
+                pending.append(executor.submit(compose_chunk, self, chunk, packed))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _compose_safe(self, reaction, packed):
+        """
+        condense reaction. None returned for not condensable reactions and not reactions
+        """
+        if not isinstance(reaction, ReactionContainer):
+            return
+        try:
+            cgr = self.compose(reaction)
+        except (MappingError, TypeError):
+            return
+        return cgr.pack() if packed else cgr
+
     @staticmethod
     def decompose(data):
         """
@@ -165,6 +217,14 @@ class CGRPreparer:
         return reduce(or_, data) if data else MoleculeContainer()
 
 
+def compose_chunk(preparer, reactions, packed):
+    """
+    condense chunk of packed reactions in worker process
+    """
+    compose = preparer._compose_safe
+    return [x and compose(ReactionContainer.unpack(x), packed) for x in reactions]
+
+
 class CGRpreparer:
     def __init__(self, *args, **kwargs):
         warn('CGRpreparer deprecated. Use CGRPreparer instead', DeprecationWarning)
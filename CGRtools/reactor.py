@@ -17,17 +17,20 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program; if not, see <https://www.gnu.org/licenses/>.
 #
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
-from itertools import chain, count, permutations, product
+from itertools import chain, count, islice, permutations, product
 from logging import info
-from operator import or_
-from typing import Union, Iterable
+from operator import itemgetter, or_
+from typing import Iterable, Iterator, List, Sequence, Tuple, Union
 from .containers import QueryContainer, QueryCGRContainer, MoleculeContainer, CGRContainer, ReactionContainer
 from .periodictable import Element, DynamicElement
 
 
 class BaseReactor:
+    direct_patch = True  # fill products containers directly. False - build products by add_atom and add_bond API
+
     def __init__(self, reactants, products, delete_atoms):
         if isinstance(reactants, QueryContainer):
             self.__is_cgr = is_cgr = False
@@ -91,6 +94,92 @@ class BaseReactor:
 
             to_delete.update(delete)
 
+        if not self.direct_patch:
+            return self.__api_patcher(structure, new, mapping, to_delete)
+
+        # atoms and bonds added directly to containers without validation and hydrogens and hybridization
+        # recalculation. only atoms of reaction center and its neighbors have changed environment.
+        na = new._atoms
+        nb = new._bonds
+        nc = new._charges
+        nr = new._radicals
+        nxy = new._plane
+        if self.__is_cgr:
+            npc = new._p_charges
+            npr = new._p_radicals
+
+        max_atom = max(charges) + 1
+        for n, atom in self.__atom_attrs.items():
+            if n in mapping:  # add matched atoms
+                m = mapping[n]
+                xy = plane[m]
+            else:  # new atoms
+                mapping[n] = m = max_atom
+                max_atom += 1
+                xy = atom['xy']
+            na[m] = a = elements[n].copy()
+            a._attach_to_graph(new, m)
+            nc[m] = atom['charge']
+            nr[m] = atom['is_radical']
+            nxy[m] = xy
+            nb[m] = {}
+            if self.__is_cgr:
+                npc[m] = atom['p_charge']
+                npr[m] = atom['p_is_radical']
+
+        old_atoms = set(na)
+        for n, atom in structure.atoms():  # add unmatched atoms
+            if n not in old_atoms and n not in to_delete:
+                na[n] = a = atom.copy()
+                a._attach_to_graph(new, n)
+                nc[n] = charges[n]
+                nr[n] = radicals[n]
+                nxy[n] = plane[n]
+                nb[n] = {}
+                if self.__is_cgr:
+                    npc[n] = p_charges[n]
+                    npr[n] = p_radicals[n]
+
+        for n, m, bond in self.__bond_attrs:  # add patch bonds
+            n = mapping[n]
+            m = mapping[m]
+            nb[n][m] = nb[m][n] = bond.copy()
+
+        changed = set(old_atoms)
+        for n in to_delete:
+            changed.update(bonds[n])
+        for n in old_atoms:
+            if n in bonds:
+                changed.update(bonds[n])
+        for n, m_bond in bonds.items():
+            if n in to_delete:  # atoms for removing
+                continue
+            to_delete.add(n)
+            for m, bond in m_bond.items():
+                if m in to_delete or n in old_atoms and m in old_atoms:
+                    continue
+                nb[n][m] = nb[m][n] = bond.copy()
+
+        if self.__is_cgr:
+            self.__cgr_marks(structure, new, changed)
+        else:
+            self.__molecule_marks(structure, new, changed)
+        # todo: calculate stereo mark based on new atom order
+        return new
+
+    def __api_patcher(self, structure, new, mapping, to_delete):
+        """
+        products building by containers API. slower, but validates atoms and bonds and calculates all marks.
+        """
+        elements = self.__elements
+        plane = structure._plane
+        bonds = structure._bonds
+        charges = structure._charges
+        radicals = structure._radicals
+        if self.__is_cgr:
+            p_charges = structure._p_charges
+            p_radicals = structure._p_radicals
+
         max_atom = max(charges) + 1
         for n, atom in self.__atom_attrs.items():
             if n in mapping:  # add matched atoms
@@ -124,10 +213,44 @@ class BaseReactor:
                 if m in to_delete or n in old_atoms and m in old_atoms:
                     continue
                 new.add_bond(n, m, bond.copy())
-
-        # todo: calculate stereo mark based on new atom order
         return new
 
+    @staticmethod
+    def __molecule_marks(structure, new, changed):
+        """
+        query marks and implicit hydrogens of molecule. only changed atoms recalculated
+        """
+        atoms = new._atoms
+        sn = structure._neighbors
+        sh = structure._hybridizations
+        shg = structure._hydrogens
+        nn = new._neighbors
+        nh = new._hybridizations
+        nhg = new._hydrogens
+        for n in atoms:
+            if n in changed:
+                nn[n] = sum(atoms[m].atomic_number != 1 for m in new._bonds[n])
+                new._calc_hybridization(n)
+                new._calc_implicit(n)
+            else:
+                nn[n] = sn[n]
+                nh[n] = sh[n]
+                nhg[n] = shg[n]
+
+    @staticmethod
+    def __cgr_marks(structure, new, changed):
+        """
+        query marks of CGR. only changed atoms recalculated
+        """
+        for n in new._atoms:
+            if n in changed:
+                new._calc_query_marks(n)
+            else:
+                new._neighbors[n] = structure._neighbors[n]
+                new._hybridizations[n] = structure._hybridizations[n]
+                new._p_neighbors[n] = structure._p_neighbors[n]
+                new._p_hybridizations[n] = structure._p_hybridizations[n]
+
     def __getstate__(self):
         return {'elements': self.__elements, 'atom_attrs': self.__atom_attrs, 'bond_attrs': self.__bond_attrs,
                 'is_cgr': self.__is_cgr, 'to_delete': self.__to_delete}
@@ -234,18 +357,24 @@ class Reactor(BaseReactor):
                 mapping = match[0]
                 for m in match[1:]:
                     mapping.update(m)
-                new = self._patcher(united_chosen, mapping)
-                collision = set(new).intersection(ignored_numbers)
-                if collision:
-                    new.remap(dict(zip(collision, count(max(max(ignored_numbers), max(new.atoms_numbers)) + 1))))
-                if self.__split > 1:
-                    new = new.split()
-                    if len(new) != self.__split:
-                        info(f'expected {self.__split} molecules in reaction products, but {len(new)} formed.\n'
-                             'input molecules has disconnected components')
-                else:
-                    new = [new]
-                yield ReactionContainer(structures, new + ignored, meta=self.__meta)
+                yield self._react(structures, united_chosen, mapping, ignored, ignored_numbers)
+
+    def _react(self, structures, chosen, mapping, ignored=(), ignored_numbers=()) -> ReactionContainer:
+        """
+        Reaction of chosen structures transformed by mapping of patterns
+        """
+        new = self._patcher(chosen, mapping)
+        collision = set(new).intersection(ignored_numbers)
+        if collision:
+            new.remap(dict(zip(collision, count(max(max(ignored_numbers), max(new.atoms_numbers)) + 1))))
+        if self.__split > 1:
+            new = new.split()
+            if len(new) != self.__split:
+                info(f'expected {self.__split} molecules in reaction products, but {len(new)} formed.\n'
+                     'input molecules has disconnected components')
+        else:
+            new = [new]
+        return ReactionContainer(structures, new + list(ignored), meta=self.__meta)
 
     @staticmethod
     def __remap(structures):
@@ -272,4 +401,122 @@ class Reactor(BaseReactor):
         super().__setstate__(state)
 
 
-__all__ = ['CGRReactor', 'Reactor']
+class BatchReactor:
+    """
+    Application of many single reactant templates to molecules libraries.
+
+    Templates with equal reactant patterns share substructure matching. Patterns screened by fingerprints
+    before matching. Calling returns generator of (molecule index, template index, reaction) in order of molecules
+    and templates. Reactions are same as generated by Reactor.
+
+    Patterns shared only if equal up to numbering of atoms and matched in same order. Otherwise automorphism filter
+    of shared matching can keep other orientation of symmetric pattern than Reactor of template.
+    """
+    def __init__(self, templates: Sequence[ReactionContainer], delete_atoms: bool = False,
+                 automorphism_filter: bool = True):
+        """
+        :param templates: CGRtools ReactionContainers with single reactant
+        :param delete_atoms: if True atoms exists in reactants but
+                            not exists in products will be removed
+        :param automorphism_filter: skip matches same up to automorphism of pattern
+        """
+        groups = defaultdict(list)  # equal patterns have equal signatures
+        for i, template in enumerate(templates):
+            if len(template.reactants) != 1:
+                raise ValueError('only single reactant templates supported')
+            reactor = Reactor(template, delete_atoms)
+            pattern = QueryContainer() | template.reactants[0]
+            order = pattern._matching_order
+            for core, members in groups[str(pattern)]:
+                translation = self.__translate(core, pattern, order)
+                if translation is not None:
+                    members.append((i, reactor, translation))
+                    break
+            else:
+                groups[str(pattern)].append((pattern, [(i, reactor, None)]))
+
+        self.__groups = [(core, core.fingerprint, members) for x in groups.values() for core, members in x]
+        self.__automorphism_filter = automorphism_filter
+
+    def __call__(self, molecules: Iterable[MoleculeContainer], workers: int = 1,
+                 chunksize: int = 1000) -> Iterator[Tuple[int, int, ReactionContainer]]:
+        """
+        :param molecules: molecules library
+        :param workers: number of processes. Molecules split into chunks which processed in parallel.
+        :param chunksize: number of molecules in chunk
+        """
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError('workers should be positive integer')
+        if not isinstance(chunksize, int) or chunksize < 1:
+            raise ValueError('chunksize should be positive integer')
+
+        if workers == 1:
+            for i, molecule in enumerate(molecules):
+                for j, reaction in self._react(molecule):
+                    yield i, j, reaction
+            return
+
+        molecules = iter(molecules)
+        pending = deque()
+        with ProcessPoolExecutor(workers) as executor:
+            for start in count(0, chunksize):
+                chunk = list(islice(molecules, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(react_batch, self, start, chunk))
+                if len(pending) >= workers * 2:  # only two chunks per worker are kept in memory
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _react(self, molecule: MoleculeContainer) -> List[Tuple[int, ReactionContainer]]:
+        """
+        All reactions of molecule ordered by templates
+        """
+        if not isinstance(molecule, MoleculeContainer):
+            raise TypeError('only Molecules possible')
+
+        fingerprint = molecule.fingerprint
+        automorphism_filter = self.__automorphism_filter
+        reactions = []
+        for core, core_fingerprint, members in self.__groups:
+            if fingerprint & core_fingerprint != core_fingerprint:
+                continue
+            for mapping in core.get_mapping(molecule, automorphism_filter=automorphism_filter):
+                for i, reactor, translation in members:
+                    if translation is None:
+                        m = mapping.copy()
+                    else:
+                        m = {translation[n]: x for n, x in mapping.items()}
+                    reactions.append((i, reactor._react([molecule], molecule, m)))
+        reactions.sort(key=itemgetter(0))
+        return reactions
+
+    @staticmethod
+    def __translate(core, pattern, order):
+        """
+        Core to pattern atoms mapping which keeps matching order of pattern
+        """
+        core_order = core._matching_order
+        for translation in core.get_mapping(pattern, automorphism_filter=False):
+            if len(translation) != len(pattern):
+                continue
+            if tuple(tuple((translation[n], m and translation[m]) for n, m in x) for x in core_order) == order:
+                return translation
+
+    def __getstate__(self):
+        return {'groups': self.__groups, 'automorphism_filter': self.__automorphism_filter}
+
+    def __setstate__(self, state):
+        self.__groups = state['groups']
+        self.__automorphism_filter = state['automorphism_filter']
+
+
+def react_batch(reactor, start, molecules):
+    """
+    apply batch reactor to chunk of molecules in worker process
+    """
+    return [(i, j, reaction) for i, molecule in enumerate(molecules, start) for j, reaction in reactor._react(molecule)]
+
+
+__all__ = ['BatchReactor', 'CGRReactor', 'Reactor']
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from logging import info
+from mmap import mmap, ACCESS_READ
+from os import stat
+from struct import Struct
+from typing import Iterator, List, Optional, Tuple, Union
+from .containers import ReactionContainer
+from .containers.common import Graph
+from .files import SDFRead, RDFRead
+
+
+header = Struct('<8sIIIQQ')  # magic, fingerprint length, depth, records count, source file size and mtime
+magic = b'CGRFPIDX'
+
+
+class SubstructureIndex:
+    """
+    Persistent substructure search index over indexable SDF and RDF files.
+
+    Screening fingerprints of records stored in sidecar file as bit-sliced matrix: for each fingerprint bit
+    bitmap of records having it. Query screening requires reading only columns of bits set in query fingerprint.
+    Candidates records seeked in source file and verified by substructure mapping.
+
+    For reactions fingerprint of record is union of fingerprints of all molecules.
+    """
+    def __init__(self, reader: Union[SDFRead, RDFRead], path: Optional[str] = None):
+        """
+        :param reader: indexable SDFRead or RDFRead object.
+        :param path: path to index file. By default near source file with `.cgrfp` suffix.
+            Outdated or incompatible index will be rebuilt.
+        """
+        if not isinstance(reader, (SDFRead, RDFRead)):
+            raise TypeError('SDFRead or RDFRead expected')
+        if not reader._shifts:
+            raise ValueError('indexable reader expected')
+
+        self._reader = reader
+        self._path = path or reader._path + '.cgrfp'
+        self._length = Graph.fingerprint_length
+        self._depth = Graph.fingerprint_depth
+        self._stride = (len(reader) + 7) // 8  # bytes of column
+
+        if not self.__load():
+            info(f'building substructure index {self._path}')
+            self.__build()
+            if not self.__load():
+                raise OSError(f'invalid index file {self._path}')
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        """
+        close memory mapped index. reader should be closed separately.
+        """
+        self._mmap.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _type, value, traceback):
+        self.close()
+
+    def screen(self, query: Graph) -> List[int]:
+        """
+        Indices of records which can contain query. List is sorted.
+        """
+        candidates = (1 << self._size) - 1
+        # start from rarest columns. cheaper to get zero.
+        for n in sorted(self.__bits(query.fingerprint, self._length), key=self._counts.__getitem__):
+            candidates &= self.__column(n)
+            if not candidates:
+                return []
+        return self.__bits(candidates, self._size)
+
+    def search(self, query: Graph) -> Iterator[Tuple[int, Union[Graph, ReactionContainer]]]:
+        """
+        Substructure search. Records without errors which contain query returned with its indices.
+        For reactions query should be substructure of any molecule of reaction.
+        """
+        reader = self._reader
+        for i in self.screen(query):
+            try:
+                record = reader[i]
+            except IndexError:  # record with errors
+                continue
+            if isinstance(record, ReactionContainer):
+                if any(self.__is_substructure(query, m) for m in record.molecules()):
+                    yield i, record
+            elif self.__is_substructure(query, record):
+                yield i, record
+
+    @staticmethod
+    def __is_substructure(query, structure):
+        try:
+            return query.is_substructure(structure)
+        except TypeError:  # incompatible types of containers
+            return False
+
+    @staticmethod
+    def __bits(number: int, length: int) -> List[int]:
+        """
+        Sorted numbers of set bits.
+        """
+        bits = []
+        for i, byte in enumerate(number.to_bytes((length + 7) // 8, 'little')):
+            if byte:
+                i <<= 3
+                for j in range(8):
+                    if byte >> j & 1:
+                        bits.append(i + j)
+        return bits
+
+    def __column(self, n) -> int:
+        start = self._offset + n * self._stride
+        return int.from_bytes(self._mmap[start: start + self._stride], 'little')
+
+    def __source(self):
+        s = stat(self._reader._path)
+        return s.st_size, s.st_mtime_ns
+
+    def __load(self) -> bool:
+        try:
+            index = open(self._path, 'rb')
+        except FileNotFoundError:
+            return False
+        try:
+            data = mmap(index.fileno(), 0, access=ACCESS_READ)
+        except ValueError:  # empty file
+            index.close()
+            return False
+
+        size = len(self._reader)
+        counts = Struct(f'<{self._length}I')
+        if len(data) != header.size + counts.size + self._length * self._stride or \
+                header.unpack_from(data) != (magic, self._length, self._depth, size, *self.__source()):
+            data.close()
+            index.close()
+            return False
+
+        self._index = index
+        self._mmap = data
+        self._size = size
+        self._counts = counts.unpack_from(data, header.size)
+        self._offset = header.size + counts.size
+        return True
+
+    def __build(self):
+        reader = self._reader
+        length = self._length
+        stride = self._stride
+        size = len(reader)
+
+        columns = [bytearray(stride) for _ in range(length)]
+        counts = [0] * length
+        current = reader.tell()
+        reader.seek(0)
+        for i, record in zip(range(size), reader._data):
+            if record is None:  # record with errors. never found
+                continue
+            elif isinstance(record, ReactionContainer):
+                fingerprint = 0
+                for m in record.molecules():
+                    fingerprint |= m.fingerprint
+            else:
+                fingerprint = record.fingerprint
+
+            byte = i >> 3
+            bit = 1 << (i & 7)
+            for n in self.__bits(fingerprint, length):
+                columns[n][byte] |= bit
+                counts[n] += 1
+        reader.seek(current)
+
+        with open(self._path, 'wb') as f:
+            f.write(header.pack(magic, length, self._depth, size, *self.__source()))
+            f.write(Struct(f'<{length}I').pack(*counts))
+            for column in columns:
+                f.write(column)
+
+
+__all__ = ['SubstructureIndex']
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Maximum common substructure search comparison of cliques enumeration and branch and bound max clique search
+on pairs of similar molecules of different size.
+
+usage: python benchmarks/mcs.py [timeout]
+"""
+from sys import argv
+from time import perf_counter
+from CGRtools import smiles
+
+
+pairs = {'ibuprofen amide': ('CC(C)Cc1ccc(cc1)C(C)C(=O)NCC', 'CC(C)Cc1ccc(cc1)C(C)C(=O)NC(C)C'),
+         'steroids': ('CC12CCC3C(CCC4=CC(=O)CCC34C)C1CCC2O', 'CC12CCC3C(CCc4cc(O)ccc34)C1CCC2=O'),
+         'peptides': ('NCC(=O)NC(C)C(=O)NC(CO)C(=O)NC(CC(=O)O)C(=O)NCC(=O)O',
+                      'NC(C)C(=O)NCC(=O)NC(CO)C(=O)NC(CCC(=O)O)C(=O)NC(C)C(=O)O'),
+         'drug-like 45': ('CC(C)Cc1ccc(cc1)C(C)C(=O)NCCc2ccc(O)c(O)c2CCN(C)C(=O)c3ccccc3OCCOC(C)(C)C',
+                          'CC(C)Cc1ccc(cc1)C(C)C(=O)NCCc2ccc(OC)c(O)c2CCN(CC)C(=O)c3ccccc3OCCCOC(C)C')}
+
+
+def main(timeout):
+    print(f'{"pair":<16}{"atoms":>8}{"cliques, atoms":>16}{"time, s":>9}{"clique, atoms":>15}{"time, s":>9}'
+          f'{"proved":>8}')
+    for name, (x, y) in pairs.items():
+        x, y = smiles(x), smiles(y)
+        start = perf_counter()
+        old = next(x.get_mcs_mapping(y), {})
+        old_time = perf_counter() - start
+        start = perf_counter()
+        new, complete = x.get_mcs_clique_mapping(y, timeout=timeout)
+        new_time = perf_counter() - start
+        print(f'{name:<16}{f"{len(x)}/{len(y)}":>8}{len(old):>16}{old_time:>9.2f}{len(new):>15}{new_time:>9.2f}'
+              f'{str(complete):>8}')
+
+
+if __name__ == '__main__':
+    main(float(argv[1]) if len(argv) > 1 else 60.)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Hash based and array-backed Morgan refinement comparison on peptides and polymers of different size.
+
+usage: python benchmarks/morgan.py
+"""
+from timeit import repeat
+from CGRtools import smiles
+from CGRtools.algorithms.morgan import Morgan
+
+
+amino_acids = ['NCC(=O)', 'NC(C)C(=O)', 'NC(CO)C(=O)', 'NC(CC=C)C(=O)', 'NC(CCCCN)C(=O)', 'NC(CC(=O)O)C(=O)']
+structures = {}
+for size in (5, 10, 20, 50, 100, 200):
+    structures[f'peptide {size}'] = smiles(''.join(amino_acids[x % 6] for x in range(size)) + 'O')
+    structures[f'polyethylene {size * 5}'] = smiles('C' * size * 5)
+
+
+def run(molecule, threshold):
+    Morgan.morgan_array_threshold = threshold
+    molecule.copy().atoms_order
+
+
+def equal_ranks(molecule):
+    ranks = []
+    for threshold in (None, 0):
+        Morgan.morgan_array_threshold = threshold
+        ranks.append(molecule.copy().atoms_order)
+    return ranks[0] == ranks[1]
+
+
+def main():
+    default = Morgan.morgan_array_threshold
+    print(f'{"structure":<20}{"atoms":>8}{"hash, ms":>12}{"array, ms":>12}{"equal":>8}')
+    for name, molecule in structures.items():
+        hashed, vectorized = (min(repeat(lambda: run(molecule, t), number=5, repeat=3)) / 5 * 1000 for t in (None, 0))
+        print(f'{name:<20}{len(molecule):>8}{hashed:>12.2f}{vectorized:>12.2f}{equal_ranks(molecule)!s:>8}')
+    Morgan.morgan_array_threshold = default
+
+
+if __name__ == '__main__':
+    main()
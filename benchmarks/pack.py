@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Packed binary format and dict-of-dicts state pickling comparison on molecules and reactions from test files.
+
+usage: python benchmarks/pack.py [file.sdf|file.rdf ...]
+"""
+from pickle import dumps, loads
+from sys import argv
+from timeit import repeat
+from CGRtools.files import RDFRead, SDFRead
+
+
+def state_dumps(records):
+    return dumps([(x.__class__, x.__getstate__()) for x in records])
+
+
+def state_loads(data):
+    records = []
+    for cls, state in loads(data):
+        x = object.__new__(cls)
+        x.__setstate__(state)
+        records.append(x)
+    return records
+
+
+def measure(f, *args):
+    return min(repeat(lambda: f(*args), number=3, repeat=3)) / 3 * 1000
+
+
+def main(files):
+    print(f'{"file":<24}{"records":>8}{"state, kb":>11}{"packed, kb":>12}'
+          f'{"dump, ms":>10}{"pack, ms":>10}{"load, ms":>10}{"unpack, ms":>12}')
+    for file in files:
+        with (RDFRead if file.endswith('.rdf') else SDFRead)(file) as f:
+            records = f.read()
+        state = state_dumps(records)
+        packed = dumps(records)
+        print(f'{file.rsplit("/", 1)[-1]:<24}{len(records):>8}{len(state) / 1024:>11.1f}{len(packed) / 1024:>12.1f}'
+              f'{measure(state_dumps, records):>10.1f}{measure(dumps, records):>10.1f}'
+              f'{measure(state_loads, state):>10.1f}{measure(loads, packed):>12.1f}')
+
+
+if __name__ == '__main__':
+    main(argv[1:] or ['test/cycle.sdf', 'test/stereo.sdf', 'test/arenes.sdf', 'test/MR.rdf', 'test/standardize.rdf'])
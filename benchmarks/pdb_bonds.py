@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Bond perception of PDB reader on protein-sized complexes: all pairs distances check and cells grid search.
+Complexes are cubic lattices of copies of test/ch.xyz molecule.
+
+usage: python benchmarks/pdb_bonds.py [max atoms for all pairs check]
+"""
+from io import StringIO
+from itertools import combinations, product
+from math import sqrt
+from sys import argv
+from time import perf_counter
+from CGRtools.files import PDBRead
+from CGRtools.files.XYZrw import get_possible_bonds
+from CGRtools.periodictable import Element
+
+
+def all_pairs(atoms, conformer, multiplier):
+    possible_bonds = {n: {} for n in atoms}
+    radii = {n: a.atomic_radius for n, a in atoms.items()}
+    for (n, (nx, ny, nz)), (m, (mx, my, mz)) in combinations(conformer.items(), 2):
+        d = sqrt((nx - mx) ** 2 + (ny - my) ** 2 + (nz - mz) ** 2)
+        if d <= (radii[n] + radii[m]) * multiplier:
+            possible_bonds[n][m] = possible_bonds[m][n] = d
+    return possible_bonds
+
+
+def complex_pdb(side):
+    with open('test/ch.xyz') as f:
+        size = int(next(f))
+        next(f)
+        molecule = [(e, float(x), float(y), float(z)) for e, x, y, z in (next(f).split() for _ in range(size))]
+    lines = []
+    for i, j, k in product(range(side), repeat=3):
+        for e, x, y, z in molecule:
+            lines.append(f'HETATM{len(lines) % 100000:>5} {e.upper():<4} LIG A{i:>4}    '
+                         f'{x + i * 12:8.3f}{y + j * 12:8.3f}{z + k * 12:8.3f}  1.00  0.00          {e.upper():>2}')
+    lines.append('END')
+    return '\n'.join(lines)
+
+
+def main(limit):
+    print(f'{"atoms":>8}{"all pairs, s":>14}{"grid, s":>10}{"read, s":>10}')
+    for side in (2, 4, 6, 9):
+        pdb = complex_pdb(side)
+        start = perf_counter()
+        with PDBRead(StringIO(pdb)) as f:
+            molecule = next(f)
+        read = perf_counter() - start
+
+        atoms = {n: Element.from_atomic_number(a.atomic_number)() for n, a in molecule.atoms()}
+        conformer = molecule._conformers[0]
+        start = perf_counter()
+        grid = get_possible_bonds(atoms, conformer, 1.25)
+        grid_time = perf_counter() - start
+        if len(atoms) <= limit:
+            start = perf_counter()
+            pairs = all_pairs(atoms, conformer, 1.25)
+            pairs_time = f'{perf_counter() - start:.3f}'
+            assert pairs.keys() == grid.keys() and all(pairs[n].keys() == grid[n].keys() for n in pairs)
+        else:
+            pairs_time = '-'
+        print(f'{len(atoms):>8}{pairs_time:>14}{grid_time:>10.3f}{read:>10.3f}')
+
+
+if __name__ == '__main__':
+    main(int(argv[1]) if len(argv) > 1 else 10000)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+"""
+SMILES parsing throughput of generic tokens based parser and plain molecules fast path.
+Bundled test/smiles.txt and synthetic corpus of SMILES of molecules from test SDF files are used.
+
+usage: python benchmarks/smiles.py [synthetic corpus size]
+"""
+from glob import glob
+from logging import disable, CRITICAL
+from sys import argv
+from time import perf_counter
+from CGRtools.files import SDFRead, SMILESRead
+
+
+def generic_parser():
+    parser = SMILESRead.create_parser()
+    parser.__self__._SMILESRead__fast_parse = lambda _: None  # disable fast path
+    return parser
+
+
+def measure(parser, lines):
+    start = perf_counter()
+    for line in lines:
+        parser(line)
+    return len(lines) / (perf_counter() - start)
+
+
+def synthetic(size):
+    molecules = []
+    for file in sorted(glob('test/*.sdf')):
+        with SDFRead(file) as f:
+            molecules.extend(format(m) for m in f)
+    return [molecules[x % len(molecules)] for x in range(size)]
+
+
+def main(size):
+    disable(CRITICAL)  # invalid records in test files
+    print(f'{"corpus":<16}{"lines":>10}{"generic, lines/s":>18}{"fast, lines/s":>16}{"speedup":>10}')
+    with open('test/smiles.txt') as f:
+        bundled = [x for x in f if x.strip()] * 100
+    for name, lines in (('smiles.txt', bundled), ('synthetic', synthetic(size))):
+        generic = measure(generic_parser(), lines)
+        fast = measure(SMILESRead.create_parser(), lines)
+        print(f'{name:<16}{len(lines):>10}{generic:>18.0f}{fast:>16.0f}{fast / generic:>10.2f}')
+
+
+if __name__ == '__main__':
+    main(int(argv[1]) if len(argv) > 1 else 100000)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+"""
+SSSR search comparison of paths intersection based and bitset based engines
+on bundled test/spheroids.sdf, test/cycle.sdf and synthetic fused rings grids.
+
+usage: python benchmarks/sssr.py [maximal grid width]
+"""
+from logging import disable, CRITICAL
+from sys import argv
+from time import perf_counter
+from CGRtools.containers import MoleculeContainer
+from CGRtools.files import SDFRead
+
+
+def grid(width, height):
+    molecule = MoleculeContainer()
+    atoms = [[molecule.add_atom('C') for _ in range(height)] for _ in range(width)]
+    for i in range(width):
+        for j in range(height):
+            if i + 1 < width:
+                molecule.add_bond(atoms[i][j], atoms[i + 1][j], 1)
+            if j + 1 < height and not (i + j) % 2:
+                molecule.add_bond(atoms[i][j], atoms[i][j + 1], 1)
+    return molecule
+
+
+def measure(molecules, threshold):
+    MoleculeContainer.sssr_bitset_threshold = threshold
+    start = perf_counter()
+    rings = sum(len(MoleculeContainer._sssr(m._bonds)) for m in molecules)
+    return rings, perf_counter() - start
+
+
+def main(width):
+    disable(CRITICAL)  # invalid records in test files
+    sets = {}
+    for file in ('test/spheroids.sdf', 'test/cycle.sdf'):
+        with SDFRead(file) as f:
+            sets[file[5:]] = list(f)
+    w = 6
+    while w <= width:
+        sets[f'grid {w}x{w // 2}'] = [grid(w, w // 2)]
+        w *= 2
+
+    default = MoleculeContainer.sssr_bitset_threshold
+    print(f'{"set":<16}{"atoms":>8}{"rings":>8}{"paths, s":>10}{"bitset, s":>11}')
+    for name, molecules in sets.items():
+        old, old_time = measure(molecules, None)
+        new, new_time = measure(molecules, 1)
+        assert old == new
+        print(f'{name:<16}{sum(len(m) for m in molecules):>8}{old:>8}{old_time:>10.3f}{new_time:>11.3f}')
+    MoleculeContainer.sssr_bitset_threshold = default
+
+
+if __name__ == '__main__':
+    main(int(argv[1]) if len(argv) > 1 else 24)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from logging import WARNING
+from pathlib import Path
+from pytest import raises
+from CGRtools.files import SMILESRead
+
+
+data = Path(__file__).parent
+
+
+def lines():
+    with open(str(data / 'smiles.txt')) as f:
+        strings = [x for x in f if x.strip()]
+    with open(str(data / 'incorrect_smiles_test.txt')) as f:
+        strings.extend(x for x in f if x.strip())
+    return strings * 3
+
+
+def test_serial():
+    strings = lines()
+    records, errors, warnings = SMILESRead.parse_many(strings)
+    parse = SMILESRead.create_parser()
+    assert len(records) == len(strings)
+    for n, (string, record) in enumerate(zip(strings, records)):
+        expected = parse(string)
+        if expected is None:
+            assert record is None
+            assert n in errors
+        else:
+            assert str(record) == str(expected)
+            assert n not in errors
+
+
+def test_parallel():
+    strings = lines()
+    records, errors, warnings = SMILESRead.parse_many(strings)
+    p_records, p_errors, p_warnings = SMILESRead.parse_many(strings, workers=2, chunksize=7)
+    assert [str(x) for x in records] == [str(x) for x in p_records]
+    assert errors == p_errors
+    assert warnings == p_warnings
+
+    packed, _, _ = SMILESRead.parse_many(strings, workers=2, chunksize=7, packed=True)
+    assert packed == [x and x.pack() for x in records]
+
+
+def test_warnings(caplog):
+    strings = ['CCO id:1 invalid', 'C1CC1C1CC1', 'C>>.CC', '[CH3:1][OH:1]', 'CC', '']
+    with caplog.at_level(WARNING):
+        records, errors, warnings = SMILESRead.parse_many(strings, ignore=True, remap=False)
+    assert not caplog.records  # nothing logged
+    assert warnings[0] == ['invalid metadata entry: invalid']
+    assert warnings[1] == ['reused closure number: 1']
+    assert warnings[2] == ['empty molecule ignored']
+    assert warnings[3] == ['mapping in molecule changed: 1 to 2']
+    assert 4 not in warnings and 4 not in errors
+    assert records[5] is None and 5 in errors
+
+    parse = SMILESRead.create_parser(ignore=True)
+    with caplog.at_level(WARNING):
+        assert str(parse('CCO id:1 invalid')) == str(records[0])
+    assert caplog.records  # single string parser still logs
+
+
+def test_empty_string():
+    parse = SMILESRead.create_parser()
+    for string in ('', ' \n'):
+        with raises(ValueError):
+            parse(string)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pytest import raises
+from CGRtools import smiles
+from CGRtools.algorithms._cache import cache_depends
+
+
+properties = ('connected_components', 'sssr', 'atoms_count', 'bonds_count', 'ring_atoms',
+              'aromatic_rings', 'tetrahedrons', 'atoms_order', 'fingerprint', 'canonical_hash', 'molecular_charge')
+
+
+def warm(molecule):
+    for x in properties:
+        getattr(molecule, x)
+    str(molecule)
+    return molecule
+
+
+def changes():
+    def charge(m):
+        m.atom(5).charge = -1
+
+    def stereo(m):
+        m.add_atom_stereo(2, (1, 3, 4), True)
+
+    def kekule(m):
+        m.kekule()
+
+    def thiele(m):
+        m.thiele()
+
+    def standardize(m):
+        m.standardize()
+
+    yield 'CC(N)C(O)=O', charge, ('sssr', 'connected_components', 'bonds_count')
+    yield 'CC(N)C(O)=O', stereo, ('sssr', 'connected_components', 'bonds_count', 'atoms_order', 'fingerprint')
+    yield 'C1=CC=CC=C1.O', thiele, ('sssr', 'connected_components', 'ring_atoms')
+    yield 'c1ccccc1.O', kekule, ('sssr', 'connected_components', 'ring_atoms')
+    yield 'CN(=O)=O', standardize, ('sssr', 'connected_components')
+
+
+def test_survived():
+    for s, change, survived in changes():
+        m = warm(smiles(s))
+        change(m)
+        for x in survived:
+            assert x in m.__dict__
+        fresh = warm(m.copy())
+        for x in properties:
+            if x in m.__dict__:
+                assert m.__dict__[x] == getattr(fresh, x), x
+            assert getattr(m, x) == getattr(fresh, x), x
+        assert str(m) == str(fresh)
+
+
+def test_flushed():
+    m = warm(smiles('CCO'))
+    m.flush_cache('coordinates')
+    assert 'fingerprint' in m.__dict__
+    m.flush_cache('bonds')
+    assert 'fingerprint' not in m.__dict__ and 'sssr' in m.__dict__
+    m.flush_cache()
+    assert not any(x in m.__dict__ for x in properties)
+
+    m = warm(smiles('CCO'))
+    m.add_bond(1, 3, 1)
+    assert not any(x in m.__dict__ for x in properties)
+    assert len(m.sssr) == 1
+
+
+def test_declaration():
+    with raises(ValueError):
+        cache_depends('hydrogens')
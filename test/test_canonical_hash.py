@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from os import environ
+from pathlib import Path
+from subprocess import run, PIPE
+from sys import executable
+from CGRtools import smiles
+from CGRtools.containers import ReactionContainer
+from CGRtools.files import SDFRead, RDFRead
+
+
+data = Path(__file__).parent
+root = data.parent
+
+
+def test_atoms_order():
+    for x, y in (('CC(=O)Oc1ccccc1C(=O)O', 'OC(=O)c1ccccc1OC(C)=O'), ('C[C@H](N)O', 'O[C@@H](C)N'),
+                 ('CCO.O', 'O.OCC'), ('[CH2:1]=[O:2]>>[CH3:1][OH:2]', '[O:2]=[CH2:1]>>[OH:2][CH3:1]')):
+        x, y = smiles(x), smiles(y)
+        assert x.canonical_hash == y.canonical_hash
+        assert hash(x) == hash(y)
+        assert x == y
+
+
+def test_equal_strings():
+    molecules = {}
+    for file in ('arenes.sdf', 'stereo.sdf', 'standardize.sdf', 'mcs.sdf'):
+        with SDFRead(str(data / file)) as f:
+            for m in f:
+                molecules.setdefault(str(m), set()).add(m.canonical_hash)
+                c = m.copy()
+                assert c.canonical_hash == m.canonical_hash
+    assert all(len(x) == 1 for x in molecules.values())
+
+
+def test_reactions():
+    with RDFRead(str(data / 'standardize.rdf')) as f:
+        reactions = f.read()
+    for r in reactions:
+        assert r.copy().canonical_hash == r.canonical_hash
+        reverse = ReactionContainer(r.products, r.reactants, r.reagents)
+        assert str(reverse) == str(r) or reverse.canonical_hash != r.canonical_hash
+
+
+def test_sessions():
+    code = "from CGRtools import smiles; print(smiles('CC(=O)Oc1ccccc1C(=O)O').canonical_hash)"
+    values = {run([executable, '-c', code], env={**environ, 'PYTHONHASHSEED': seed, 'PYTHONPATH': str(root)},
+                  stdout=PIPE, check=True).stdout for seed in ('1', '2')}
+    assert values == {f'{smiles("CC(=O)Oc1ccccc1C(=O)O").canonical_hash}\n'.encode()}
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from json import load
+from math import sqrt
+from multiprocessing import get_context
+from pathlib import Path
+from pytest import approx, raises
+from CGRtools import smiles
+from CGRtools.algorithms import calculate2d
+from CGRtools.containers import MoleculeContainer
+
+
+molecules = ('CCO', 'c1ccccc1', 'CC(=O)O', 'O', 'CC1CC1', '[Na+].[Cl-]')
+
+
+def test_many():
+    serial = [smiles(x) for x in molecules]
+    for m in serial:
+        m.clean2d()
+
+    for workers, chunksize in ((1, 100), (2, 2)):
+        structures = [smiles(x) for x in molecules]
+        result = list(MoleculeContainer.clean2d_many(structures, workers=workers, chunksize=chunksize))
+        assert all(x is y for (x, _), y in zip(result, structures))  # same objects in order
+        assert len(result) == len(structures)
+        assert all(t >= 0 for _, t in result)
+        for m, s in zip(structures, serial):
+            assert m._plane == s._plane
+    assert any(x != (0., 0.) for x in serial[0]._plane.values())
+
+
+def test_invalid():
+    with raises(ValueError):
+        list(MoleculeContainer.clean2d_many([smiles('CC')], workers=0))
+    with raises(ValueError):
+        list(MoleculeContainer.clean2d_many([smiles('CC')], chunksize=0))
+
+
+def test_without_numpy(monkeypatch):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name, *args: None if name in ('numpy', 'numba') else
+                        find_spec(name, *args))
+    spec = importlib.util.spec_from_file_location('CGRtools.algorithms._calculate2d_fallback',
+                                                  str(Path(calculate2d.__file__)))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.undo()
+    for stub in (module.Calculate2DMolecule, module.Calculate2DCGR):
+        with raises(NotImplementedError):
+            stub.clean2d_many([])
+        with raises(NotImplementedError):
+            stub().clean2d()
+
+
+def norbornane():
+    m = smiles('C1CC2CCC1C2')
+    xy = {1: (0., 0.), 2: (0., 1.5), 3: (1.2, 2.), 4: (2.4, 1.5), 5: (2.4, 0.), 6: (1.2, -.5), 7: (1.2, .75)}
+    for n, c in xy.items():
+        m._plane[n] = c
+    return m
+
+
+def test_templates(tmp_path):
+    m = smiles('c1ccc2[nH]ccc2c1')  # indole from bundled fused rings systems
+    m.clean2d()
+    assert calculate2d.builtin_templates is True
+    lengths = {round(sqrt((m._plane[n][0] - m._plane[k][0]) ** 2 + (m._plane[n][1] - m._plane[k][1]) ** 2), 3)
+               for n, k, _ in m.bonds()}
+    assert lengths == {.825}
+
+    with calculate2d.builtin_templates_file.open() as f:
+        bundled = load(f)
+    assert MoleculeContainer.load_layout_templates(str(calculate2d.builtin_templates_file)) == 0  # already loaded
+    MoleculeContainer.add_layout_templates([norbornane()])
+    file = str(tmp_path / 'templates.json')
+    MoleculeContainer.save_layout_templates(file)
+    with open(file) as f:
+        saved = load(f)
+    assert len(saved) == len(calculate2d.dump_templates()) >= len(bundled) + 7
+
+
+def test_spawned_workers():
+    MoleculeContainer.add_layout_templates([norbornane()])
+    m = smiles('C1CC2CCC1C2')
+    m.clean2d()
+    with ProcessPoolExecutor(1, mp_context=get_context('spawn')) as executor:
+        (plane, _), = executor.submit(calculate2d.clean2d_chunk, [(MoleculeContainer, m.pack())],
+                                      calculate2d.dump_templates()).result()
+    assert plane.keys() == m._plane.keys()
+    assert all(plane[n] == approx(xy) for n, xy in m._plane.items())
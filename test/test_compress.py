@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from gc import collect
+from gzip import compress
+from io import BytesIO
+from pathlib import Path
+from random import Random
+from CGRtools.files import SDFRead, SDFWrite, RDFRead, RDFWrite, SMILESRead, SMILESWrite
+from CGRtools.files._compress import GzipCheckpoints
+
+
+data = Path(__file__).parent
+
+
+def test_molecules(tmp_path):
+    with SDFRead(str(data / 'arenes.sdf')) as f:
+        molecules = f.read()
+    plain = str(tmp_path / 'arenes.sdf')
+    with SDFWrite(plain) as f:
+        for m in molecules:
+            f.write(m)
+    with SDFRead(plain) as f:
+        expected = [str(m) for m in f]
+
+    for extension, magic in (('.gz', b'\x1f\x8b'), ('.xz', b'\xfd7zXZ'), ('.bz2', b'BZh')):
+        file = str(tmp_path / f'arenes.sdf{extension}')
+        with SDFWrite(file) as f:
+            for m in molecules:
+                f.write(m)
+        assert (tmp_path / f'arenes.sdf{extension}').read_bytes().startswith(magic)
+        with SDFRead(file) as f:
+            assert [str(m) for m in f] == expected
+        with SDFRead(file, indexable=True) as f:
+            assert len(f) == len(expected)
+            for i in (len(expected) - 1, 0, len(expected) // 2):
+                assert str(f[i]) == expected[i]
+
+
+def test_reactions(tmp_path):
+    with RDFRead(str(data / 'standardize.rdf')) as f:
+        reactions = f.read()
+    file = str(tmp_path / 'reactions.rdf.gz')
+    with RDFWrite(file) as f:
+        for r in reactions:
+            f.write(r)
+    with RDFRead(file) as f:
+        assert [str(r) for r in f] == [str(r) for r in reactions]
+
+
+def test_buffer():
+    text = (data / 'smiles.txt').read_bytes()
+    with SMILESRead(BytesIO(compress(text))) as f, SMILESRead(BytesIO(text)) as p:
+        assert [str(m) for m in f] == [str(m) for m in p]
+
+
+def test_buffer_write():
+    with SDFRead(str(data / 'arenes.sdf')) as f:
+        molecules = f.read()[:5]
+    expected = [str(m) for m in molecules]
+    for writer, reader in ((SDFWrite, SDFRead), (SMILESWrite, SMILESRead)):
+        buffer = BytesIO()
+        f = writer(buffer)
+        for m in molecules:
+            f.write(m)
+        f.close()
+        assert not buffer.closed
+        assert buffer.getvalue()
+
+        buffer.seek(0)
+        f = reader(buffer)
+        assert [str(m) for m in f] == expected
+        f.close()
+        del f
+        collect()
+        assert not buffer.closed  # external buffer not closed by garbage collector
+
+        with writer(buffer) as f:
+            f.write(molecules[0])
+        assert not buffer.closed
+        writer(buffer).close(force=True)
+        assert buffer.closed
+
+    buffer = BytesIO(compress((data / 'smiles.txt').read_bytes()))
+    SMILESRead(buffer).close()
+    collect()
+    assert not buffer.closed
+
+
+def test_checkpoints():
+    text = bytes(Random(1).getrandbits(8) for _ in range(100000))
+    stream = GzipCheckpoints(BytesIO(compress(text)), interval=4096)
+    assert stream.read(50000) == text[:50000]
+    for position in (1000, 70000, 4096, 99990, 0, 50000):
+        stream.seek(position)
+        assert stream.tell() == position
+        assert stream.read(100) == text[position: position + 100]
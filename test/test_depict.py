@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from re import compile
+from pytest import raises
+from CGRtools import smiles
+from CGRtools.algorithms.depict import Depict
+
+
+class LRU(MutableMapping):
+    def __init__(self, size):
+        self.size = size
+        self.data = OrderedDict()
+        self.hits = 0
+
+    def __getitem__(self, key):
+        value = self.data[key]
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.size:
+            self.data.popitem(last=False)
+
+    def __delitem__(self, key):
+        del self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+
+uid = compile('[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+
+def strip(svgs):
+    return [uid.sub('', x) for x in svgs]  # masks ids are random
+
+
+def structures():
+    ms = [smiles(x) for x in ('CCO', 'c1ccccc1', 'CC(=O)O', 'CCO', '[CH3:1][OH:2]>>[CH2:1]=[O:2]', 'CCN')]
+    for m in ms:
+        m.clean2d()
+    return ms
+
+
+def test_cache():
+    ms = structures()
+    expected = strip(m.depict() for m in ms)
+    for size in (1, 2, 100):
+        for workers in (1, 2):
+            cache = LRU(size)
+            assert strip(Depict.depict_many(ms, cache=cache, workers=workers, chunksize=4)) == expected
+            assert len(cache) <= size
+    cache = {}
+    assert strip(Depict.depict_many(ms, cache=cache)) == expected
+    assert len(cache) == 5  # equal molecules rendered once
+
+
+def test_cache_key():
+    m = smiles('CCO')
+    m.clean2d()
+    cache = LRU(100)
+    svg = list(Depict.depict_many([m], cache=cache))
+    assert strip(svg) == strip([m.depict()])
+
+    m.meta['name'] = 'ethanol'
+    m.name = 'ethanol'
+    assert list(Depict.depict_many([m], cache=cache)) == svg
+    assert cache.hits == 1  # metadata not depicted
+
+    renumbered = m.remap({1: 5}, copy=True)
+    assert strip(Depict.depict_many([renumbered], cache=cache)) == strip([renumbered.depict()]) != strip(svg)
+    assert len(cache) == 2  # shown mapping depicted
+    unmapped = Depict.depict_settings(mapping=False, set_default=False)
+    assert strip(Depict.depict_many([m, renumbered], cache=cache, settings=unmapped)) == \
+        strip([m.depict(settings=unmapped)]) * 2
+    assert len(cache) == 3  # positions instead of hidden numbers
+
+    m._plane[1] = (m._plane[1][0] + 1., m._plane[1][1])
+    assert strip(Depict.depict_many([m], cache=cache)) == strip([m.depict()])
+    assert len(cache) == 4
+
+
+def test_repr_svg(monkeypatch):
+    monkeypatch.setattr(Depict, '_render_config', Depict._render_config)  # restore default settings
+    m = smiles('[CH3:1][OH:2]')
+    r = smiles('[CH3:1][OH:2]>>[CH2:1]=[O:2]')
+    m.clean2d()
+    for x in (m, r):
+        svg = x._repr_svg_()
+        assert x._repr_svg_() is svg  # cached
+        Depict.depict_settings(mapping=False)
+        unmapped = x._repr_svg_()
+        assert unmapped != svg and '788CFF' in svg and '788CFF' not in unmapped
+        assert x._repr_svg_() is unmapped
+        Depict.depict_settings()
+        assert x._repr_svg_() is not unmapped and '788CFF' in x._repr_svg_()
+
+    svg = m._repr_svg_()
+    m.clean2d()
+    assert m._repr_svg_() is not svg  # coordinates changed
+
+
+def test_settings():
+    with raises(TypeError):
+        Depict._render_config['mapping'] = False  # read-only. use depict_settings
+    settings = Depict.depict_settings(mapping=False, set_default=False)
+    assert not settings['mapping'] and Depict._render_config['mapping']
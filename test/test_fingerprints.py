@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+from CGRtools import smiles
+from CGRtools.files import SDFRead
+
+
+data = Path(__file__).parent
+
+
+def molecules():
+    with SDFRead(str(data / 'arenes.sdf')) as f:
+        return f.read()
+
+
+def test_substructures_subset():
+    for m in molecules():
+        for n in m:
+            for deep in (1, 2, 3):
+                q = m.augmented_substructure([n], deep=deep)
+                assert q.is_fingerprint_subset(m)
+                assert q.is_substructure(m)
+
+
+def test_screened_out():
+    benzene = smiles('c1ccccc1')
+    for m in molecules():
+        q = smiles('C1CCCCCCCCCCCC1')
+        assert not q.is_substructure(m)
+        if not benzene.is_fingerprint_subset(m):
+            assert not benzene.is_substructure(m)
+
+
+def test_stable():
+    m = smiles('CC(=O)Oc1ccccc1C(=O)O')
+    assert m.fingerprint == smiles('OC(=O)c1ccccc1OC(C)=O').fingerprint
+    assert m.fingerprint == m.copy().fingerprint
+    assert 0 < m.fingerprint < 1 << m.fingerprint_length
+
+
+def test_standardized_screening():
+    m = smiles('CN(=O)=O')
+    m.fingerprint  # cached before in-place fixes
+    m.standardize()
+    assert smiles('C[N+](=O)[O-]').is_substructure(m)
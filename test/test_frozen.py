@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+from pickle import dumps, loads
+from pytest import raises
+from CGRtools import smiles
+from CGRtools.containers import FrozenMoleculeContainer, MoleculeContainer
+from CGRtools.files import SDFRead
+
+
+data = Path(__file__).parent
+
+
+def molecules():
+    with SDFRead(str(data / 'stereo.sdf')) as f:
+        return f.read()[:50]
+
+
+def state(m):
+    return (str(m), m.atoms_order, m.sssr, {frozenset(x) for x in m.connected_components}, dict(m._charges),
+            dict(m._radicals), dict(m._hydrogens), dict(m._hybridizations), dict(m._plane), m._atoms_stereo,
+            m.meta, m.name,
+            {n: {m: b.order for m, b in ms.items()} for n, ms in m._bonds.items()})
+
+
+def test_round_trip():
+    for m in molecules():
+        f = m.freeze()
+        assert isinstance(f, FrozenMoleculeContainer)
+        assert state(f) == state(m)
+        t = f.thaw()
+        assert type(t) is MoleculeContainer
+        assert state(t) == state(m)
+        assert state(loads(dumps(f))) == state(m)
+
+
+def test_algorithms():
+    q = smiles('c1ccccc1')
+    for m in molecules():
+        f = m.freeze()
+        assert q.is_substructure(f) == q.is_substructure(m)
+        assert f.fingerprint == m.fingerprint
+        assert f == m
+
+
+def test_immutable():
+    f = smiles('CCO').freeze()
+    for method, args in ((f.add_atom, ('C',)), (f.add_bond, (1, 2, 1)), (f.delete_atom, (1,)),
+                         (f.delete_bond, (1, 2)), (f.standardize, ()), (f.remap, ({1: 4},))):
+        with raises(TypeError):
+            method(*args)
+    c = f.copy()
+    assert type(c) is MoleculeContainer
+    c.add_atom('N')
+    assert len(f) == 3
+    assert type(f.remap({1: 4}, copy=True)) is MoleculeContainer
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from os import stat, utime
+from pathlib import Path
+from CGRtools.files import SDFRead, RDFRead
+
+
+data = Path(__file__).parent
+
+
+def bump(file):
+    s = stat(str(file))
+    utime(str(file), ns=(s.st_atime_ns, s.st_mtime_ns + 10 ** 9))
+
+
+def large(tmp_path):
+    file = tmp_path / 'large.sdf'
+    file.write_bytes((data / 'arenes.sdf').read_bytes() * 20)  # much bigger than hashed head and tail
+    return file
+
+
+def test_offsets(tmp_path):
+    file = large(tmp_path)
+    with SDFRead(str(file)) as f:
+        expected = [str(m) for m in f]
+    with SDFRead(str(file), indexable=True) as f:
+        assert len(f) == len(expected)
+        assert Path(str(file) + '.cgridx').exists()
+        for i in (0, 1, len(expected) // 2, len(expected) - 1):
+            assert str(f[i]) == expected[i]
+    with SDFRead(str(file), indexable=True) as f:  # from sidecar
+        assert len(f) == len(expected)
+        assert str(f[len(expected) - 1]) == expected[-1]
+
+
+def test_same_size_edit(tmp_path):
+    file = large(tmp_path)
+    with SDFRead(str(file), indexable=True) as f:
+        count = len(f)
+
+    content = file.read_bytes()
+    middle = content.index(b'$$$$\n', len(content) // 2)
+    file.write_bytes(content[:middle] + b'    \n' + content[middle + 5:])  # two records merged
+    bump(file)
+    with SDFRead(str(file), indexable=True) as f:
+        assert len(f) == count - 1
+
+
+def test_touched(tmp_path):
+    file = large(tmp_path)
+    with SDFRead(str(file), indexable=True) as f:
+        count = len(f)
+    bump(file)
+    with SDFRead(str(file), indexable=True) as f:
+        assert len(f) == count
+
+
+def test_appended(tmp_path):
+    file = large(tmp_path)
+    with SDFRead(str(file), indexable=True) as f:
+        count = len(f)
+    with open(str(file), 'ab') as f:
+        f.write((data / 'standardize.sdf').read_bytes())
+    with SDFRead(str(data / 'standardize.sdf')) as f:
+        appended = [str(m) for m in f]
+    with SDFRead(str(file), indexable=True) as f:
+        assert len(f) == count + len(appended)
+        assert [str(f[count + i]) for i in range(len(appended))] == appended
+
+
+def test_rdf(tmp_path):
+    file = tmp_path / 'reactions.rdf'
+    file.write_bytes((data / 'standardize.rdf').read_bytes())
+    with RDFRead(str(file)) as f:
+        expected = [str(r) for r in f]
+    with RDFRead(str(file), indexable=True) as f:
+        assert len(f) == len(expected)
+        assert [str(f[i]) for i in range(len(expected))] == expected
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+from CGRtools import smiles
+from CGRtools.algorithms.isomorphism import QueryMatcher
+from CGRtools.containers import MoleculeContainer
+from CGRtools.files import SDFRead
+
+
+data = Path(__file__).parent
+
+
+def separate(matcher, queries, target):
+    expected = sorted((i, tuple(sorted(m.items()))) for i, q in enumerate(queries) for m in q.get_mapping(target))
+    found = sorted((i, tuple(sorted(m.items()))) for i, m in matcher.get_mapping(target))
+    return expected, found
+
+
+def test_molecules():
+    queries = [smiles(x) for x in ('c1ccccc1', 'c1ccccc1C', 'c1ccccc1CC', 'c1ccccc1O', 'CC', 'C.C', 'CO',
+                                   'c1ccc2ccccc2c1', 'N')]
+    matcher = QueryMatcher(queries)
+    assert len(matcher) == len(queries)
+    with SDFRead(str(data / 'arenes.sdf')) as f:
+        for m in f:
+            expected, found = separate(matcher, queries, m)
+            assert expected == found
+            assert matcher.get_matched(m) == sorted({i for i, _ in expected})
+
+
+def test_standardize_rules():
+    molecule = MoleculeContainer()
+    rules = [q for q, *_ in molecule._standardize_compiled_rules]
+    matcher = molecule._standardize_matcher
+    with SDFRead(str(data / 'standardize.sdf')) as f:
+        for m in f:
+            expected, found = separate(matcher, rules, m)
+            assert expected == found
+
+
+def test_empty():
+    matcher = QueryMatcher([smiles('C1CCCCCCCCCCCC1')])
+    m = smiles('CCO')
+    assert matcher.get_matched(m) == []
+    assert list(matcher.get_mapping(m)) == []
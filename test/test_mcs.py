@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from itertools import combinations, permutations
+from CGRtools import smiles
+
+
+pairs = (('CCO', 'CCN'), ('c1ccccc1O', 'Oc1ccncc1'), ('CC(C)CC(=O)O', 'OC(=O)CCCC'), ('C1CCCC1', 'C1CCCCC1'),
+         ('CC(=O)NC', 'NC(C)=O'), ('CCOCC', 'CCSCC'), ('ClCCl', 'CCC'))
+
+
+def is_induced(x, y, mapping):
+    if len(set(mapping.values())) != len(mapping):
+        return False
+    for n, m in mapping.items():
+        if x.atom(n) != y.atom(m):
+            return False
+    for n, k in combinations(mapping, 2):
+        b = x._bonds[n].get(k)
+        o_b = y._bonds[mapping[n]].get(mapping[k])
+        if b is None or o_b is None:
+            if b is not o_b:
+                return False
+        elif b != o_b:
+            return False
+    return True
+
+
+def is_connected(x, atoms):
+    return len(x.substructure(atoms).connected_components) == 1
+
+
+def brute_force(x, y, connected):
+    for size in range(len(x), 0, -1):
+        for atoms in combinations(x, size):
+            if connected and not is_connected(x, atoms):
+                continue
+            if any(is_induced(x, y, dict(zip(atoms, other))) for other in permutations(y, size)):
+                return size
+    return 0
+
+
+def test_maximum():
+    for x, y in pairs:
+        x, y = smiles(x), smiles(y)
+        for connected in (True, False):
+            mapping, complete = x.get_mcs_clique_mapping(y, connected=connected)
+            assert complete
+            assert is_induced(x, y, mapping)
+            if connected:
+                assert is_connected(x, mapping)
+            assert len(mapping) == brute_force(x, y, connected)
+
+
+def test_timeout():
+    x = smiles('NCC(=O)NC(C)C(=O)NC(CO)C(=O)NC(CC(=O)O)C(=O)NCC(=O)O')
+    y = smiles('NC(C)C(=O)NCC(=O)NC(CO)C(=O)NC(CCC(=O)O)C(=O)NC(C)C(=O)O')
+    for timeout in (1e-9, 0):
+        mapping, complete = x.get_mcs_clique_mapping(y, timeout=timeout)
+        assert not complete
+        assert is_induced(x, y, mapping)
+
+
+def test_disjoint():
+    assert smiles('CCC').get_mcs_clique_mapping(smiles('O=O')) == ({}, True)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+from pytest import fixture, mark
+from CGRtools import smiles
+from CGRtools.algorithms.morgan import Morgan, morgan_array_available
+from CGRtools.files import SDFRead
+
+
+data = Path(__file__).parent
+pytestmark = mark.skipif(not morgan_array_available, reason='array-backed refinement not available')
+
+
+@fixture
+def threshold():
+    default = Morgan.morgan_array_threshold
+    yield
+    Morgan.morgan_array_threshold = default
+
+
+def both(molecule):
+    results = []
+    for threshold in (None, 0):
+        Morgan.morgan_array_threshold = threshold
+        copy = molecule.copy()
+        results.append((copy.atoms_order, str(copy)))
+    return results
+
+
+def test_large(threshold):
+    for x in (''.join('C(O)C(N)CC(=O)' for _ in range(25)) + 'C', 'C' * 300, 'C1CCCCC1' * 20,
+              ''.join('NC(CO)C(=O)' for _ in range(40)) + 'O.[Na+].[Cl-]'):
+        hashed, array = both(smiles(x))
+        assert hashed == array
+
+
+def test_files(threshold):
+    for file in ('cycle.sdf', 'stereo.sdf', 'backy.sdf'):
+        with SDFRead(str(data / file)) as f:
+            for m in f:
+                hashed, array = both(m)
+                assert hashed == array
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+from pickle import dumps, loads
+from CGRtools.files import SDFRead, RDFRead
+
+
+data = Path(__file__).parent
+
+
+def structures():
+    with SDFRead(str(data / 'stereo.sdf')) as f:
+        molecules = f.read()[:50]
+    with RDFRead(str(data / 'standardize.rdf')) as f:
+        reactions = f.read()
+    cgrs = [~r for r in reactions]
+    queries = [m.substructure(list(m)[:5], as_query=True) for m in molecules[:10]]
+    cgr_queries = [c.substructure(list(c)[:5], as_query=True) for c in cgrs]
+    molecules[0].meta['values'] = [1, 2]  # pickled meta
+    return molecules + reactions + cgrs + queries + cgr_queries
+
+
+def state(x):
+    if hasattr(x, 'molecules'):
+        return str(x), x.meta, x.name, [state(m) for m in x.molecules()]
+    return (type(x), str(x), x.meta, x.name, dict(x._plane), x._parsed_mapping, dict(x._charges),
+            dict(x._radicals), {n: (a.atomic_number, a.isotope) for n, a in x.atoms()},
+            {(n, m): str(b) for n, m, b in x.bonds()}, getattr(x, '_atoms_stereo', None),
+            getattr(x, '_hydrogens', None), getattr(x, '_conformers', None))
+
+
+def test_round_trip():
+    for x in structures():
+        data = x.pack()
+        assert isinstance(data, bytes)
+        assert state(type(x).unpack(data)) == state(x)
+        assert state(loads(dumps(x))) == state(x)
+
+
+def test_shared_bonds():
+    for x in structures():
+        if hasattr(x, 'molecules'):
+            continue
+        y = type(x).unpack(x.pack())
+        for n, m, b in y.bonds():
+            assert y._bonds[m][n] is b
+
+
+def test_old_state():
+    for x in structures():
+        y = object.__new__(type(x))
+        y.__setstate__(loads(dumps(x.__getstate__())))  # pickles of previous versions
+        assert state(y) == state(x)
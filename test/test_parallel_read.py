@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+from pytest import raises
+from CGRtools.files import SDFRead, RDFRead
+
+
+data = Path(__file__).parent
+
+
+def test_sdf():
+    for file in ('stereo.sdf', 'arenes.sdf', 'standardize.sdf'):  # stereo.sdf has invalid records
+        with SDFRead(str(data / file)) as f:
+            expected = [(str(m), m.meta) for m in f]
+        with SDFRead(str(data / file), workers=2, chunksize=7) as f:
+            assert [(str(m), m.meta) for m in f] == expected
+
+
+def test_rdf():
+    for file in ('standardize.rdf', 'MR.rdf', 'template.rdf'):
+        with RDFRead(str(data / file)) as f:
+            expected = [(str(r), r.meta) for r in f]
+        with RDFRead(str(data / file), workers=2, chunksize=1) as f:
+            assert [(str(r), r.meta) for r in f] == expected
+
+
+def test_indexable():
+    with raises(ValueError):
+        SDFRead(str(data / 'arenes.sdf'), indexable=True, workers=2)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+from pytest import raises
+from CGRtools import smiles, CGRPreparer
+from CGRtools.containers import CGRContainer
+from CGRtools.files import RDFRead
+
+
+data = Path(__file__).parent
+
+
+def reactions():
+    with RDFRead(str(data / 'standardize.rdf')) as f:
+        rs = f.read()
+    return rs + [smiles('CCO'), smiles('[CH3:1][OH:2]>>[CH2:1]=[O:2]')]
+
+
+def test_compose_many():
+    rs = reactions()
+    preparer = CGRPreparer()
+    expected = [str(preparer.compose(r)) for r in rs[:-2]] + [None, str(preparer.compose(rs[-1]))]
+    assert [x and str(x) for x in preparer.compose_many(rs)] == expected
+    assert [x and str(x) for x in preparer.compose_many(rs, workers=2, chunksize=3)] == expected
+
+    packed = list(preparer.compose_many(rs, workers=2, chunksize=3, packed=True))
+    assert [x and str(CGRContainer.unpack(x)) for x in packed] == expected
+
+
+def test_invalid():
+    with raises(ValueError):
+        list(CGRPreparer().compose_many(reactions(), workers=0))
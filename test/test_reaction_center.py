@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+from CGRtools import smiles
+from CGRtools.containers import ReactionContainer
+from CGRtools.files import RDFRead
+
+
+data = Path(__file__).parent
+
+
+def test_augmented_substructure():
+    checked = 0
+    for file in ('standardize.rdf', 'MR.rdf', 'reaction_centerslist.rdf', 'cgr_check.rdf', 'depict.rdf'):
+        with RDFRead(str(data / file)) as f:
+            for r in f:
+                if not isinstance(r, ReactionContainer):
+                    continue
+                try:
+                    cgr = r.compose()
+                except (TypeError, ValueError):  # queries or invalid mapping
+                    continue
+                center = cgr.center_atoms
+                for deep in (0, 1, 2):
+                    rc = r.reaction_center(deep)
+                    if center:
+                        expected = cgr.augmented_substructure(center, deep)
+                        assert set(rc) == set(expected)
+                        assert str(rc) == str(expected)
+                        assert rc.canonical_hash == expected.canonical_hash
+                    else:
+                        assert not len(rc)
+                checked += 1
+    assert checked > 10
+
+
+def test_unchanged():
+    r = smiles('[CH3:1][OH:2]>>[CH3:1][OH:2]')
+    assert not len(r.reaction_center())
+    r = smiles('[CH3:1][OH:2].[Na+:3]>>[CH3:1][O-:2].[Na+:3]')
+    assert set(r.reaction_center()) == {2}
+    assert set(r.reaction_center(1)) == {1, 2}
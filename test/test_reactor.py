@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pytest import raises
+from CGRtools import smiles
+from CGRtools.containers import QueryContainer, ReactionContainer
+from CGRtools.reactor import Reactor, BatchReactor
+
+
+def query(atoms, bonds):
+    q = QueryContainer()
+    for n, a in atoms:
+        q.add_atom(a, n)
+    for n, m, b in bonds:
+        q.add_bond(n, m, b)
+    return q
+
+
+def templates():
+    return [ReactionContainer([query([(1, 'C'), (2, 'O')], [(1, 2, 1)])],
+                              [query([(1, 'C'), (2, 'Cl')], [(1, 2, 1)])]),
+            # same pattern numbered differently
+            ReactionContainer([query([(5, 'O'), (3, 'C')], [(3, 5, 1)])],
+                              [query([(5, 'O'), (3, 'C')], [(3, 5, 2)])]),
+            ReactionContainer([query([(1, 'C'), (2, 'O')], [(1, 2, 2)])],
+                              [query([(1, 'C'), (2, 'O')], [(1, 2, 1)])]),
+            ReactionContainer([query([(1, 'C'), (2, 'N')], [(1, 2, 1)])],
+                              [query([(1, 'C')], [])])]
+
+
+molecules = ('CCO', 'CC=O', 'OCCO', 'c1ccccc1O', 'CC(=O)OC', 'CCN', 'CCCC')
+
+
+def expected(ts, ms):
+    return sorted((i, j, str(r)) for i, m in enumerate(ms) for j, t in enumerate(ts)
+                  for r in Reactor(t, delete_atoms=True)([m]))
+
+
+def test_batch():
+    ts = templates()
+    ms = [smiles(x) for x in molecules]
+    reactor = BatchReactor(ts, delete_atoms=True)
+    result = [(i, j, str(r)) for i, j, r in reactor(ms)]
+    assert [x[:2] for x in result] == sorted(x[:2] for x in result)
+    assert sorted(result) == expected(ts, ms)
+    assert sorted((i, j, str(r)) for i, j, r in reactor(ms, workers=2, chunksize=2)) == sorted(result)
+
+
+def test_invalid():
+    t = smiles('[C:1]=[O:2].[O:3]>>[C:1]([O:3])[O:2]')
+    with raises(ValueError):
+        BatchReactor([t])
+    with raises(ValueError):
+        list(BatchReactor(templates())([smiles('CC')], workers=0))
+    with raises(TypeError):
+        list(BatchReactor(templates())([smiles('CC>>CC')]))
+
+
+def test_direct_patch(monkeypatch):
+    ts = templates()
+    ms = [smiles(x) for x in molecules + ('[H]OC([H])([H])C=C', 'C=CC(O)C#N', 'OC1=CC=CC=C1CN', '[O-]C(=O)CCO')]
+    direct = [r for t in ts for m in ms for r in Reactor(t, delete_atoms=True)([m])]
+    monkeypatch.setattr(Reactor, 'direct_patch', False)
+    api = [r for t in ts for m in ms for r in Reactor(t, delete_atoms=True)([m])]
+    assert len(direct) == len(api) > 20
+    for x, y in zip(direct, api):
+        assert str(x) == str(y)
+        for p, q in zip(x.products, y.products):
+            assert p._atoms.keys() == q._atoms.keys()
+            assert {n: {m: b.order for m, b in mb.items()} for n, mb in p._bonds.items()} == \
+                {n: {m: b.order for m, b in mb.items()} for n, mb in q._bonds.items()}
+            assert p._hydrogens == q._hydrogens
+            assert p._hybridizations == q._hybridizations
+            assert p._neighbors == q._neighbors
+            assert p.connected_components == q.connected_components
+
+
+def test_symmetric():
+    ts = [ReactionContainer([query([(1, 'C'), (2, 'C')], [(1, 2, 1)])],
+                            [query([(1, 'C'), (2, 'O')], [(1, 2, 1)])]),
+          # same pattern numbered differently
+          ReactionContainer([query([(5, 'C'), (3, 'C')], [(3, 5, 1)])],
+                            [query([(5, 'C'), (3, 'O')], [(3, 5, 1)])]),
+          # other end changed
+          ReactionContainer([query([(1, 'C'), (2, 'C')], [(1, 2, 1)])],
+                            [query([(1, 'O'), (2, 'C')], [(1, 2, 1)])]),
+          ReactionContainer([query([(2, 'C'), (1, 'C'), (3, 'C')], [(1, 2, 1), (1, 3, 1)])],
+                            [query([(2, 'C'), (1, 'C'), (3, 'N')], [(1, 2, 1), (1, 3, 1)])]),
+          ReactionContainer([query([(3, 'C'), (1, 'C'), (2, 'C')], [(1, 2, 1), (1, 3, 1)])],
+                            [query([(3, 'C'), (1, 'C'), (2, 'N')], [(1, 2, 1), (1, 3, 1)])])]
+    ms = [smiles(x) for x in ('NCC', 'CCC', 'OCCN', 'CC(C)C', 'CCCCC')]
+    reactor = BatchReactor(ts)
+    for i, m in enumerate(ms):
+        expected = [(j, str(r)) for j, t in enumerate(ts) for r in Reactor(t)([m])]
+        assert [(j, str(r)) for _, j, r in reactor([m])] == expected  # same order as Reactor
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from os import stat
+from pathlib import Path
+from shutil import copy
+from CGRtools import smiles, SubstructureIndex
+from CGRtools.files import SDFRead, SDFWrite, RDFRead
+
+
+data = Path(__file__).parent
+
+
+def test_molecules(tmp_path):
+    file = str(tmp_path / 'arenes.sdf')
+    copy(str(data / 'arenes.sdf'), file)
+    with SDFRead(file) as f:
+        molecules = f.read()
+
+    for q in ('c1ccccc1', 'c1ccc2ccccc2c1', 'CC', 'C1CCCCCCCCCCCC1'):
+        q = smiles(q)
+        expected = [n for n, m in enumerate(molecules) if q.is_substructure(m)]
+        with SDFRead(file, indexable=True) as f, SubstructureIndex(f) as index:
+            assert len(index) == len(molecules)
+            assert [n for n, _ in index.search(q)] == expected
+            assert set(expected).issubset(index.screen(q))
+
+
+def test_reactions(tmp_path):
+    file = str(tmp_path / 'standardize.rdf')
+    copy(str(data / 'standardize.rdf'), file)
+    q = smiles('C=O')
+    with RDFRead(file) as f:
+        expected = [n for n, r in enumerate(f) if any(q.is_substructure(m) for m in r.molecules())]
+    with RDFRead(file, indexable=True) as f, SubstructureIndex(f) as index:
+        assert [n for n, _ in index.search(q)] == expected
+
+
+def test_rebuild(tmp_path):
+    file = str(tmp_path / 'arenes.sdf')
+    copy(str(data / 'arenes.sdf'), file)
+    with SDFRead(file, indexable=True) as f, SubstructureIndex(f):
+        pass
+    index_file = Path(file + '.cgrfp')
+    assert index_file.exists()
+    built = stat(str(index_file)).st_mtime_ns
+
+    with SDFRead(file, indexable=True) as f, SubstructureIndex(f):  # reused
+        pass
+    assert stat(str(index_file)).st_mtime_ns == built
+
+    with SDFRead(file) as f:
+        half = f.read()[:35]
+    with SDFWrite(file) as f:
+        for m in half:
+            f.write(m)
+    with SDFRead(file, indexable=True) as f, SubstructureIndex(f) as index:
+        assert len(index) == 35
+        q = smiles('c1ccccc1')
+        assert [n for n, _ in index.search(q)] == [n for n, m in enumerate(half) if q.is_substructure(m)]
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+from CGRtools.files import SDFRead, SMILESRead
+
+
+data = Path(__file__).parent
+
+
+def lines():
+    with open(str(data / 'smiles.txt')) as f:
+        strings = [x for x in f if x.strip()]
+    with open(str(data / 'incorrect_smiles_test.txt')) as f:
+        strings.extend(x for x in f if x.strip())
+    with SDFRead(str(data / 'stereo.sdf')) as f:
+        strings.extend(format(m) for m in f)
+    strings.extend(('C1CC1 id:1 name=x', '[13CH3:7][NH3+].[Cl-]', 'c1ccccc1/C=C/C', 'C%12CC%12', 'CC(C)(C)(C)(C)C',
+                    '[C@@H](F)(Cl)Br', 'c1cc1', 'C1CC', 'C((C))', '[Zz]C', 'B1=CC=CC=C1'))
+    return strings
+
+
+def state(x):
+    if x is None:
+        return
+    if hasattr(x, 'molecules'):
+        return str(x), x.meta, [state(m) for m in x.molecules()]
+    return (type(x), str(x), x.meta, list(x), dict(x._charges), dict(x._radicals), x._parsed_mapping,
+            {(n, m): str(b) for n, m, b in x.bonds()}, getattr(x, '_hydrogens', None),
+            getattr(x, '_atoms_stereo', None))
+
+
+def test_fast_path():
+    for kwargs in ({}, {'ignore': True}, {'remap': True}):
+        fast = SMILESRead.create_parser(**kwargs)
+        generic = SMILESRead.create_parser(**kwargs)
+        generic.__self__._SMILESRead__fast_parse = lambda _: None
+        assert fast.__self__._SMILESRead__fast_parse('c1ccccc1C(=O)[O-]') is not None
+        for line in lines():
+            assert state(fast(line)) == state(generic(line)), line
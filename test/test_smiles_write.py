@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from io import StringIO
+from pathlib import Path
+from pytest import raises
+from CGRtools import smiles
+from CGRtools.files import SDFRead, RDFRead, SMILESRead, SMILESWrite
+
+
+data = Path(__file__).parent
+
+
+def write(records, **kwargs):
+    buffer = StringIO()
+    with SMILESWrite(buffer, **kwargs) as f:
+        for x in records:
+            f.write(x)
+    return buffer.getvalue().splitlines()
+
+
+def test_cached_equal_uncached():
+    with SDFRead(str(data / 'stereo.sdf')) as f:
+        molecules = f.read()
+    with SDFRead(str(data / 'arenes.sdf')) as f:
+        molecules.extend(f.read())
+    with RDFRead(str(data / 'standardize.rdf')) as f:
+        reactions = f.read()
+
+    for records in (molecules, reactions):
+        for x in records:
+            x.meta.clear()
+        expected = write(records, cache_size=0)
+        copies = [x.copy() for x in records]
+        # copies take SMILES of originals. Kekule forms with equal atoms ranks can differ in uncached SMILES of copy.
+        assert write(records + copies) == expected * 2
+        assert write(records + copies, cache_size=3)[:len(records)] == expected
+
+
+def test_renumbered():
+    m = smiles('CC(N)C(=O)O')
+    m.add_atom_stereo(2, (1, 3, 4), True)
+    r = m.copy()
+    r.remap({n: n + 10 for n in m})
+    s = m.copy()
+    s.remap({n: len(m) - n + 1 for n in m})  # reversed numbers
+    assert write([m, r, s]) == [str(m)] * 3
+    assert SMILESWrite._SMILESWrite__key(m) == SMILESWrite._SMILESWrite__key(r) == SMILESWrite._SMILESWrite__key(s)
+    s = m.copy()
+    s.remap({n: len(m) - n + 1 for n in m})
+    s._atoms_stereo[len(m) - 1] = not s._atoms_stereo[len(m) - 1]  # enantiomer
+    assert SMILESWrite._SMILESWrite__key(m) != SMILESWrite._SMILESWrite__key(s)
+    assert str(m) != str(s)
+    assert write([m, s]) == [str(m), str(s)]
+
+    rxn = smiles('CC=O.[Na+].[OH-]>O>CC(O)=O')
+    other = rxn.copy()
+    for x in other.molecules():
+        x.remap({n: n + 100 for n in x})
+    assert write([rxn, other]) == [str(rxn)] * 2
+
+
+def test_header():
+    m = smiles('CCO')
+    m.meta.update(id=1, name='ethanol')
+    n = smiles('CO')
+    n.meta.update(id=2, name='methanol')
+    lines = write([m, n], header=['id', 'name'])
+    assert lines == ['smiles id name', f'{m} 1 ethanol', f'{n} 2 methanol']
+    assert write([m]) == [f'{m} id:1 name:ethanol']
+
+    with SMILESRead(StringIO('\n'.join(lines)), header=True) as f:
+        assert [(str(x), x.meta) for x in f] == [(str(m), {'id': '1', 'name': 'ethanol'}),
+                                                  (str(n), {'id': '2', 'name': 'methanol'})]
+
+    del n.meta['id']  # missing column would shift next columns on reading
+    with raises(ValueError):
+        write([n], header=['id', 'name'])
+    n.meta['id'] = ''
+    with raises(ValueError):
+        write([n], header=['id', 'name'])
+
+    m.meta['name'] = 'ethyl alcohol'
+    with raises(ValueError):
+        write([m], header=['id', 'name'])
+    with raises(ValueError):
+        write([m])
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+from CGRtools import smiles
+from CGRtools.containers import MoleculeContainer
+from CGRtools.files import SDFRead
+
+
+data = Path(__file__).parent
+
+
+def molecules():
+    for file in ('cycle.sdf', 'spheroids.sdf', 'backy.sdf', 'arenes.sdf'):
+        with SDFRead(str(data / file)) as f:
+            yield from f
+
+
+def rings_bits(molecule, rings):
+    """
+    rings as bonds bitsets. rings should be simple cycles of molecule.
+    """
+    edges = {}
+    bits = []
+    for ring in rings:
+        assert len(ring) == len(set(ring)) >= 3
+        value = 0
+        for n, m in zip(ring, ring[1:] + ring[:1]):
+            assert m in molecule._bonds[n]
+            value |= edges.setdefault(frozenset((n, m)), 1 << len(edges))
+        bits.append(value)
+    return bits
+
+
+def rank(bits):
+    basis = {}
+    for value in bits:
+        while value:
+            top = value.bit_length()
+            if top not in basis:
+                basis[top] = value
+                break
+            value ^= basis[top]
+    return len(basis)
+
+
+def cyclomatic(molecule):
+    return molecule.bonds_count - len(molecule) + len(molecule.connected_components)
+
+
+def test_basis(monkeypatch):
+    monkeypatch.setattr(MoleculeContainer, 'sssr_bitset_threshold', 1)
+    for m in molecules():
+        rings = MoleculeContainer._sssr(m._bonds)
+        assert len(rings) == rank(rings_bits(m, rings)) == cyclomatic(m)
+
+        monkeypatch.setattr(MoleculeContainer, 'sssr_bitset_threshold', None)
+        old = MoleculeContainer._sssr(m._bonds)
+        monkeypatch.setattr(MoleculeContainer, 'sssr_bitset_threshold', 1)
+        if rank(rings_bits(m, old)) == len(old):
+            assert sorted(len(x) for x in rings) == sorted(len(x) for x in old)
+        else:  # old engine can return dependent rings. minimal basis is not worse than any independent rings set
+            old = sorted(old, key=len)
+            independent = [len(x) for i, x in enumerate(old) if rank(rings_bits(m, old[:i + 1])) ==
+                           rank(rings_bits(m, old[:i])) + 1]
+            assert all(x <= y for x, y in zip(sorted(len(x) for x in rings), independent))
+
+
+def test_relevant_cycles():
+    cubane = smiles('C12C3C4C1C5C2C3C45')
+    assert len(cubane.sssr) == 5
+    assert len(cubane.relevant_cycles) == 6
+    assert all(len(x) == 4 for x in cubane.relevant_cycles)
+    rings_bits(cubane, cubane.relevant_cycles)
+
+    naphthalene = smiles('c1ccc2ccccc2c1')
+    assert sorted(len(x) for x in naphthalene.relevant_cycles) == [6, 6]
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright 2020 Ramil Nugmanov <nougmanoff@protonmail.com>
+#  This file is part of CGRtools.
+#
+#  CGRtools is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+import importlib.util
+from itertools import combinations
+from math import sqrt
+from pathlib import Path
+from random import Random
+from pytest import approx
+from CGRtools.files import XYZRead
+from CGRtools.files.XYZrw import get_possible_bonds
+from CGRtools.periodictable import Element
+
+
+data = Path(__file__).parent
+
+
+def all_pairs(atoms, conformer, multiplier):
+    possible_bonds = {n: {} for n in atoms}
+    radii = {n: a.atomic_radius for n, a in atoms.items()}
+    for (n, (nx, ny, nz)), (m, (mx, my, mz)) in combinations(conformer.items(), 2):
+        d = sqrt((nx - mx) ** 2 + (ny - my) ** 2 + (nz - mz) ** 2)
+        if d <= (radii[n] + radii[m]) * multiplier:
+            possible_bonds[n][m] = possible_bonds[m][n] = d
+    return possible_bonds
+
+
+def fallback(monkeypatch):
+    """
+    module compiled without numpy
+    """
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name, *args: None if name == 'numpy' else
+                        find_spec(name, *args))
+    spec = importlib.util.spec_from_file_location('CGRtools.files._xyz_fallback',
+                                                  str(data.parent / 'CGRtools' / 'files' / 'XYZrw.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.undo()
+    assert not hasattr(module, 'v_sqrt')
+    return module.get_possible_bonds
+
+
+def structures():
+    random = Random(1)
+    elements = ('C', 'H', 'O', 'N', 'S', 'Li', 'Fe')
+    for size in (0, 1, 2, 50, 500):
+        atoms = {}
+        conformer = {}
+        for n in random.sample(range(1, size * 3 + 2), size):  # not ordered numbers
+            atoms[n] = Element.from_symbol(random.choice(elements))()
+            conformer[n] = (random.uniform(-10, 10), random.uniform(-10, 10), random.uniform(-5, 5))
+        yield atoms, conformer
+
+
+def test_grid(monkeypatch):
+    for function in (get_possible_bonds, fallback(monkeypatch)):
+        for atoms, conformer in structures():
+            for multiplier in (1., 1.25, 2.):
+                expected = all_pairs(atoms, conformer, multiplier)
+                found = function(atoms, conformer, multiplier)
+                assert list(found) == list(expected)
+                for n, ms in expected.items():
+                    assert list(found[n]) == list(ms)  # same bonds order
+                    assert list(found[n].values()) == approx(list(ms.values()))
+
+
+def test_read():
+    with XYZRead(str(data / 'ch.xyz')) as f:
+        molecule = next(f)
+    assert molecule.bonds_count
+    assert len(molecule.connected_components) == 1